@@ -0,0 +1,3 @@
+from pyarinc424.dataset import Dataset, Table, load
+
+__all__ = ["Dataset", "Table", "load"]
@@ -0,0 +1,325 @@
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+import heapq
+import math
+from operator import itemgetter
+from pyarinc424.decoders import decode_latitude, decode_longitude
+from pyarinc424.record_maps import record_maps
+from pyarinc424.spatial import chord_to_nm, unit_vector
+
+AIRWAY_TABLE = "enroute_airways"
+
+# Tables of the fixes an airway can pass through, keyed on the section and
+# subsection codes stored with each airway fix, with their identifier and ICAO
+# code columns.
+AIRWAY_FIX_TABLES = {
+    ("E", "A"): ("enroute_waypoint", "Waypoint_Identifier", "ICAO_Code_2"),
+    ("D", ""): ("vhf_navaid", "VOR_Identifier", "ICAO_Code_2"),
+    ("D", "B"): ("ndb_navaid", "NDB_Identifier", "ICAO_Code_2"),
+}
+
+
+def position_columns(maps: list[dict]) -> dict[str, list[str]]:
+    # (latitude, longitude) columns of each table that has a position.
+    return {m["name"]: m["position"] for m in maps if m.get("position")}
+
+
+POSITIONS = position_columns(record_maps)
+
+# A fix is identified by (identifier, ICAO code, table).
+Fix = tuple[str, str, str]
+
+# An edge is (airway, from fix, to fix, sequence number of the from fix).
+Edge = tuple[str, Fix, Fix, object]
+
+# Columns of the airway_edge table, with one row per direction an airway
+# segment can be flown in.
+EDGE_COLUMNS = [
+    ("Route_Identifier", "text"),
+    ("Sequence_Number", "integer"),
+    ("From_Identifier", "text"),
+    ("From_ICAO_Code", "text"),
+    ("From_Table", "text"),
+    ("From_Latitude", "latitude"),
+    ("From_Longitude", "longitude"),
+    ("To_Identifier", "text"),
+    ("To_ICAO_Code", "text"),
+    ("To_Table", "text"),
+    ("To_Latitude", "latitude"),
+    ("To_Longitude", "longitude"),
+    ("Distance", "real"),
+]
+
+
+def text(value):
+    return value.rstrip() if isinstance(value, str) else value
+
+
+def fix_positions(
+    tables: dict[str, tuple[list[str], Iterable[Sequence]]],
+) -> dict[Fix, tuple[float, float]]:
+    # Decoded (latitude, longitude) of every fix an airway can reference.
+    # Values are decoded here when the tables were loaded without typed.
+    positions: dict[Fix, tuple[float, float]] = {}
+    for name, ident_column, icao_column in AIRWAY_FIX_TABLES.values():
+        if name not in tables:
+            continue
+        columns, rows = tables[name]
+        latitude, longitude = POSITIONS[name]
+        get = itemgetter(
+            *(
+                columns.index(c)
+                for c in [ident_column, icao_column, latitude, longitude]
+            )
+        )
+        for row in rows:
+            ident, icao, lat, lon = get(row)
+            if isinstance(lat, str):
+                lat = decode_latitude(lat)
+            if isinstance(lon, str):
+                lon = decode_longitude(lon)
+            if lat is not None and lon is not None:
+                positions.setdefault((text(ident), text(icao), name), (lat, lon))
+    return positions
+
+
+def airway_edges(columns: list[str], rows: Iterable[Sequence]) -> Iterator[Edge]:
+    # Walks the fixes of each airway in sequence order and yields an edge for
+    # every direction each segment can be flown in. A "E" in the second
+    # character of the waypoint description code ends a continuous part of an
+    # airway, and the direction restriction of a fix limits the segment
+    # starting at it to forward (F) or backward (B) flight.
+    get = itemgetter(
+        *(
+            columns.index(c)
+            for c in [
+                "Route_Identifier",
+                "Sixth_Character",
+                "Sequence_Number",
+                "Fix_Identifier",
+                "ICAO_Code",
+                "Section_Code_2",
+                "Subsection_Code_2",
+                "Waypoint_Description_Code",
+                "Direction_Restriction",
+            ]
+        )
+    )
+    fixes = sorted(
+        (get(row) for row in rows),
+        key=lambda f: (f[0], f[1], f[2] is None, f[2]),
+    )
+
+    previous = None
+    for fix in fixes:
+        route, sixth, sequence, ident, icao, section, subsection, code, direction = fix
+        table = AIRWAY_FIX_TABLES.get((text(section) or "", text(subsection) or ""))
+        current = (text(ident), text(icao), table[0]) if table else None
+        if previous is not None and previous[0] == (route, sixth):
+            _, last, last_sequence, last_direction, ended = previous
+            if last is not None and current is not None and not ended:
+                airway = text(route)
+                if last_direction != "B":
+                    yield airway, last, current, last_sequence
+                if last_direction != "F":
+                    yield airway, current, last, last_sequence
+        ended = len(code or "") > 1 and code[1] == "E"
+        previous = ((route, sixth), current, sequence, text(direction), ended)
+
+
+def distance(a: tuple[float, float], b: tuple[float, float]) -> float:
+    # Great-circle distance in NM.
+    return chord_to_nm(math.dist(unit_vector(*a), unit_vector(*b)))
+
+
+class AirwayGraph:
+    # A directed graph of the enroute airways in compressed sparse row form:
+    # the edges leaving node n are offsets[n] to offsets[n + 1] of targets,
+    # distances and edge_airways. Distances are great-circle NM between the
+    # fixes, so shortest paths are found with A* over the distance to the
+    # destination.
+    def __init__(
+        self, edges: Iterable[Edge], positions: dict[Fix, tuple[float, float]]
+    ) -> None:
+        self.fixes: list[Fix] = []
+        self.nodes: dict[Fix, int] = {}
+        self.names: dict[str, list[int]] = {}
+        self.airways: list[str] = []
+        airway_ids: dict[str, int] = {}
+        sources, targets, distances, airways = [], [], [], []
+        self.unresolved = 0
+        for airway, start, end, _ in edges:
+            if start not in positions or end not in positions:
+                self.unresolved += 1
+                continue
+            if airway not in airway_ids:
+                airway_ids[airway] = len(self.airways)
+                self.airways.append(airway)
+            sources.append(self.node(start))
+            targets.append(self.node(end))
+            distances.append(distance(positions[start], positions[end]))
+            airways.append(airway_ids[airway])
+
+        self.positions = [positions[fix] for fix in self.fixes]
+        self.vectors = [unit_vector(*position) for position in self.positions]
+
+        order = sorted(range(len(sources)), key=sources.__getitem__)
+        counts = [0] * (len(self.fixes) + 1)
+        for source in sources:
+            counts[source + 1] += 1
+        for i in range(len(self.fixes)):
+            counts[i + 1] += counts[i]
+        self.offsets = array("l", counts)
+        self.targets = array("l", (targets[i] for i in order))
+        self.distances = array("d", (distances[i] for i in order))
+        self.edge_airways = array("l", (airways[i] for i in order))
+
+        # Airways each fix is on, including the last fix of one-way airways.
+        self.fix_airways: list[set[int]] = [set() for _ in self.fixes]
+        for source, target, airway_id in zip(sources, targets, airways):
+            self.fix_airways[source].add(airway_id)
+            self.fix_airways[target].add(airway_id)
+
+    def __len__(self) -> int:
+        return len(self.fixes)
+
+    def node(self, fix: Fix) -> int:
+        if fix not in self.nodes:
+            self.nodes[fix] = len(self.fixes)
+            self.fixes.append(fix)
+            self.names.setdefault(fix[0], []).append(self.nodes[fix])
+        return self.nodes[fix]
+
+    def find(self, identifier: str, icao_code: str | None = None) -> list[int]:
+        # Nodes of every fix with the identifier, in any table.
+        return [
+            node
+            for node in self.names.get(identifier, [])
+            if icao_code is None or self.fixes[node][1] == icao_code
+        ]
+
+    def edges(self, node: int) -> Iterator[tuple[int, float, str]]:
+        # (target node, distance in NM, airway) for each edge leaving a node.
+        for edge in range(self.offsets[node], self.offsets[node + 1]):
+            yield (
+                self.targets[edge],
+                self.distances[edge],
+                self.airways[self.edge_airways[edge]],
+            )
+
+    def airways_through(
+        self, identifier: str, icao_code: str | None = None
+    ) -> list[str]:
+        found = {
+            airway
+            for node in self.find(identifier, icao_code)
+            for airway in self.fix_airways[node]
+        }
+        return sorted(self.airways[airway] for airway in found)
+
+    def shortest_path(
+        self,
+        origin: str,
+        destination: str,
+        origin_icao: str | None = None,
+        destination_icao: str | None = None,
+    ) -> tuple[float, list[tuple[Fix, str | None]]] | None:
+        # Returns the distance in NM and the fixes of the shortest route along
+        # airways, each with the airway flown to reach it, or None when the
+        # fixes are not connected.
+        sources = self.find(origin, origin_icao)
+        goals = set(self.find(destination, destination_icao))
+        if not sources or not goals:
+            return None
+        goal_vectors = [self.vectors[goal] for goal in goals]
+
+        def remaining(node: int) -> float:
+            vector = self.vectors[node]
+            return chord_to_nm(min(math.dist(vector, goal) for goal in goal_vectors))
+
+        best = {source: 0.0 for source in sources}
+        previous: dict[int, tuple[int, int]] = {}
+        queue = [(remaining(source), 0.0, source) for source in sources]
+        heapq.heapify(queue)
+        offsets, targets, distances = self.offsets, self.targets, self.distances
+        while queue:
+            _, cost, node = heapq.heappop(queue)
+            if cost > best[node]:
+                continue
+            if node in goals:
+                return cost, self.path(node, previous)
+            for edge in range(offsets[node], offsets[node + 1]):
+                target = targets[edge]
+                target_cost = cost + distances[edge]
+                if target_cost < best.get(target, math.inf):
+                    best[target] = target_cost
+                    previous[target] = (node, edge)
+                    heapq.heappush(
+                        queue, (target_cost + remaining(target), target_cost, target)
+                    )
+        return None
+
+    def path(
+        self, node: int, previous: dict[int, tuple[int, int]]
+    ) -> list[tuple[Fix, str | None]]:
+        steps: list[tuple[Fix, str | None]] = []
+        while node in previous:
+            source, edge = previous[node]
+            steps.append((self.fixes[node], self.airways[self.edge_airways[edge]]))
+            node = source
+        steps.append((self.fixes[node], None))
+        return steps[::-1]
+
+
+def build_graph(
+    tables: dict[str, tuple[list[str], Iterable[Sequence]]],
+) -> AirwayGraph:
+    # Builds the graph from the (columns, rows) of enroute_airways and the
+    # fix tables.
+    columns, rows = tables[AIRWAY_TABLE]
+    return AirwayGraph(airway_edges(columns, rows), fix_positions(tables))
+
+
+def airway_tables(
+    tables: dict[str, tuple[list[str], list[str], list]], typed: bool = False
+) -> list[tuple[dict, list[list]]]:
+    # Builds the airway_edge table from the parsed (columns, column types,
+    # rows) of enroute_airways and the fix tables, as a record map in the form
+    # used by record_maps.py with its rows.
+    if AIRWAY_TABLE not in tables:
+        return []
+    positions = fix_positions(
+        {name: (columns, rows) for name, (columns, _, rows) in tables.items()}
+    )
+    columns, _, airway_rows = tables[AIRWAY_TABLE]
+
+    def value(number):
+        return number if typed else str(number)
+
+    rows = []
+    for airway, start, end, sequence in airway_edges(columns, airway_rows):
+        if start not in positions or end not in positions:
+            continue
+        rows.append(
+            [
+                airway,
+                sequence,
+                *start,
+                *(value(v) for v in positions[start]),
+                *end,
+                *(value(v) for v in positions[end]),
+                value(distance(positions[start], positions[end])),
+            ]
+        )
+
+    record_map = {
+        "name": "airway_edge",
+        "columns": [{"name": c, "type": t} for c, t in EDGE_COLUMNS],
+        "key": ["Route_Identifier", "Sequence_Number", "From_Identifier"],
+        "indexes": [
+            ["From_Identifier", "From_ICAO_Code"],
+            ["To_Identifier", "To_ICAO_Code"],
+        ],
+        "position": ["From_Latitude", "From_Longitude"],
+    }
+    return [(record_map, rows)]
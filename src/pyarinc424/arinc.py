@@ -1,6 +1,35 @@
-from rich.progress import track
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+import mmap
+from operator import itemgetter
+import os
+from pyarinc424.cache import ParseCache, cache_key
+from pyarinc424.config import DEFAULT_BATCH_SIZE
 from pyarinc424.database import DbConfig
-from pyarinc424.record_maps import record_maps
+from pyarinc424.decoders import (
+    DECODERS,
+    STORAGE_TYPES,
+    BBox,
+    decode_latitude,
+    decode_longitude,
+    in_bbox,
+)
+from pyarinc424.delta import diff_rows, identity_columns
+from pyarinc424.metrics import LoadMetrics
+from pyarinc424.airways import AIRWAY_FIX_TABLES, AIRWAY_TABLE, airway_tables
+from pyarinc424.procedures import PROCEDURE_TABLES, procedure_tables
+from pyarinc424.progress import ProgressReporter
+from pyarinc424.record_maps import column_types, record_maps
+from pyarinc424.regions import PARENT_TABLES, RegionFilter
+
+# Memory-mapped files are decoded and split into lines in blocks of about
+# this many bytes.
+SPLIT_BLOCK_BYTES = 1 << 16
+
+# Lines are read in chunks of this size so reading and parsing can be timed
+# separately.
+READ_CHUNK_LINES = 10000
 
 
 class ArincRecord:
@@ -10,56 +39,594 @@ class ArincRecord:
         self.section_pos: int | None = record_map.get("section_pos")
         self.subsection_pos: int | None = record_map.get("subsection_pos")
         self.cont_rec_pos: int | None = record_map.get("cont_rec_pos")
-        self.cont_rec_vals: list[str] = record_map.get("cont_rec_vals", [])
+        self.cont_rec_vals: list[str] = record_map.get("cont_rec_vals") or []
         self.name: str = record_map.get("name", "")
+        self.key: list[str] = record_map.get("key", [])
+        self.indexes: list[list[str]] = record_map.get("indexes", [])
+        self.position: list[str] = record_map.get("position", [])
         self.columns: list[dict] = record_map.get("columns", [])
         self.column_names: list[str] = [c["name"] for c in record_map["columns"]]
+        self.column_types: list[str] = [
+            c.get("type") or column_types.get(c["name"], "text") for c in self.columns
+        ]
+        self.storage_types: list[str] = [STORAGE_TYPES[t] for t in self.column_types]
+        self.slices: list[slice] = [
+            slice(c.get("start"), c.get("end")) for c in self.columns
+        ]
+        self.position_index: list[int] = [
+            self.column_names.index(c) for c in self.position
+        ]
+        self.extract: Callable[[str], list] = self.compile()
+
+    def within(self, values: list, bbox: BBox) -> bool:
+        # Records without a position column are always kept.
+        if not self.position_index:
+            return True
+        latitude, longitude = (values[i] for i in self.position_index)
+        if isinstance(latitude, str):
+            latitude = decode_latitude(latitude)
+        if isinstance(longitude, str):
+            longitude = decode_longitude(longitude)
+        return in_bbox(bbox, latitude, longitude)
+
+    def compile(self, typed: bool = False) -> Callable[[str], list]:
+        # Column layouts are turned into a single itemgetter over precomputed
+        # slices so the hot loop does no per-column dict lookups.
+        slices = self.slices
+        if not slices:
+            return lambda line: []
+        getter: Callable[[str], tuple]
+        if len(slices) > 1:
+            getter = itemgetter(*slices)
+        else:
+            column = slices[0]
+
+            def single(line: str) -> tuple:
+                return (line[column],)
+
+            getter = single
+
+        if typed:
+            decoders = [DECODERS[t] for t in self.column_types]
+            return lambda line: [
+                decode(value) for decode, value in zip(decoders, getter(line))
+            ]
+
+        return lambda line: list(getter(line))
+
+
+# Lines are routed by the characters found at each distinct (section_pos,
+# subsection_pos) layout, so every line is only looked at once no matter how
+# many record types are defined in record_maps. Each route carries the
+# record's continuation position and accepted values.
+Route = tuple[ArincRecord, int | None, set]
+Dispatch = dict[tuple[int, int], dict[tuple, list[Route]]]
 
 
 class ArincParser:
-    def __init__(self, db: DbConfig, file: str):
+    def __init__(
+        self,
+        db: DbConfig,
+        file: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        reader: str = "text",
+        workers: int = 1,
+        typed: bool = False,
+        indexes: bool = True,
+        delta: bool = False,
+        schema: str | None = None,
+        cache_dir: str | None = None,
+        bbox: BBox | None = None,
+        metrics: LoadMetrics | None = None,
+        progress: bool | None = None,
+        procedures: bool = False,
+        airways: bool = False,
+    ):
         self.db = db
         self.file = file
-        self.lines = self.read_file()
+        self.batch_size = batch_size
+        self.reader = reader
+        self.workers = workers
+        self.typed = typed
+        self.indexes = indexes
+        self.delta = delta
+        self.cache_dir = cache_dir
+        self.bbox = bbox
+        self.region: RegionFilter | None = None
+        self.cache: ParseCache | None = None
+        self.delta_report: dict[str, dict[str, int]] = {}
+        self.buffers: dict[str, list[list]] = {}
         self.cycle = self.get_cycle()
-        self.schema = f"cycle{self.cycle}"
+        self.schema = schema or f"cycle{self.cycle}"
+        self.metrics = metrics or LoadMetrics()
+        self.metrics.cycle = self.cycle
+        self.progress = ProgressReporter(progress)
+        self.procedures = procedures
+        self.airways = airways
+        # Rows of the tables that procedures and airway edges are built from
+        # are kept as they are written, so that the derived tables can be
+        # built once every table has been parsed.
+        self.retained: dict[str, list[list]] = {}
+        if procedures:
+            for name, (_, cont_table) in PROCEDURE_TABLES.items():
+                self.retained[name] = []
+                if cont_table:
+                    self.retained[cont_table] = []
+        if airways:
+            self.retained[AIRWAY_TABLE] = []
+            for name, _, _ in AIRWAY_FIX_TABLES.values():
+                self.retained[name] = []
+        self.derived: list[ArincRecord] = []
 
-    def read_file(self) -> list[str]:
+    def read_file(self) -> Iterator[str]:
+        # Lines are streamed so memory use does not grow with the file size.
         with open(self.file) as file:
-            return file.readlines()
+            yield from file
+
+    def read_mmap(self) -> Iterator[str]:
+        # Lines are decoded and split off the mapped file a block at a time,
+        # without the line by line decoding of a text file.
+        with open(self.file, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if not size:
+                return
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # The mapping is closed once iteration ends, including when the
+        # generator is closed early.
+        with mapped:
+            yield from iter_lines(mapped, 0, size)
+
+    def split_ranges(self, parts: int) -> list[tuple[int, int]]:
+        # Splits the file into up to `parts` byte ranges that start and end on
+        # line boundaries.
+        with open(self.file, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            bounds = [0]
+            for part in range(1, parts):
+                file.seek(max(size * part // parts, bounds[-1]))
+                file.readline()
+                if file.tell() >= size:
+                    break
+                bounds.append(file.tell())
+        bounds.append(size)
+        return [(s, e) for s, e in zip(bounds, bounds[1:]) if e > s]
 
     def parse(self) -> None:
-        self.create_schema()
-        for record in record_maps:
-            self.create_arinc_record(record)
+        with self.metrics.phase("setup"):
+            self.create_schema()
+
+            records = [ArincRecord(record_map) for record_map in record_maps]
+            for record in records:
+                self.create_table(record)
+
+            cache = self.get_cache()
+
+        if cache is not None and cache.exists():
+            self.read_cache(cache)
+            self.load_rows(records)
+        else:
+            # Rows are written to the cache as they are flushed and the entry
+            # is only kept once the whole load has succeeded.
+            self.cache = cache
+            if cache is not None:
+                cache.open()
+            if self.bbox is not None:
+                self.region = RegionFilter(
+                    {record.name: record.column_names for record in records}
+                )
+            try:
+                self.parse_file(records)
+                self.load_rows(records)
+            except BaseException:
+                if cache is not None:
+                    cache.close(commit=False)
+                raise
+            if cache is not None:
+                cache.close()
+            self.cache = None
+
+        if self.indexes:
+            with self.metrics.phase("index"):
+                for record in records + self.derived:
+                    self.create_indexes(record)
+
+        with self.metrics.phase("commit"):
+            self.db.publish(self.schema)
+        self.metrics.finish()
+
+    def parse_file(self, records: list[ArincRecord]) -> None:
+        if self.reader == "numpy":
+            self.parse_array(records)
+        elif self.workers > 1:
+            self.parse_parallel()
+        else:
+            self.parse_lines(records)
+
+    def load_rows(self, records: list[ArincRecord]) -> None:
+        if self.delta:
+            for record in records:
+                self.apply_delta(record)
+        else:
+            self.flush_all()
+        if self.retained:
+            self.load_derived(records)
+        with self.metrics.phase("insert"):
+            self.db.finish_load(self.schema)
+
+    def load_derived(self, records: list[ArincRecord]) -> None:
+        # Builds the procedure, procedure_leg and airway_edge tables from the
+        # parsed rows. They are derived from the other tables, so they are
+        # rebuilt and replaced on every load and never cached or compared for
+        # deltas.
+        tables = {
+            record.name: (
+                record.column_names,
+                record.column_types,
+                self.retained.pop(record.name),
+            )
+            for record in records
+            if record.name in self.retained
+        }
+        built = []
+        if self.procedures:
+            with self.metrics.phase("procedures"):
+                built.extend(procedure_tables(tables, self.typed))
+        if self.airways:
+            with self.metrics.phase("airways"):
+                built.extend(airway_tables(tables, self.typed))
+
+        for record_map, rows in built:
+            record = ArincRecord(record_map)
+            self.derived.append(record)
+            self.db.create_table(
+                self.schema,
+                record.name,
+                record.column_names,
+                column_types=record.storage_types if self.typed else None,
+                replace=True,
+            )
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start : start + self.batch_size]
+                with self.metrics.writing(record.name, len(batch)):
+                    self.db.add_rows(self.schema, record.name, batch)
+
+    def get_cache(self) -> ParseCache | None:
+        if not self.cache_dir:
+            return None
+        # Lines read from a text file keep their line endings while lines
+        # split off the raw bytes do not, so the two can produce different
+        # values for a column at the end of a line.
+        binary = self.reader in ("mmap", "numpy") or self.workers > 1
+        options = {
+            "record_maps": record_maps,
+            "column_types": column_types,
+            "typed": self.typed,
+            "binary": binary,
+            "bbox": self.bbox,
+        }
+        return ParseCache(self.cache_dir, cache_key(self.file, options))
+
+    def read_cache(self, cache: ParseCache) -> None:
+        # A cache hit replays the stored batches without parsing the file.
+        with self.metrics.phase("read"), self.progress.task("loading cache") as advance:
+            for name, rows in cache.read():
+                self.add_rows(name, rows)
+                advance(1)
+
+    def parse_lines(self, records: list[ArincRecord]) -> None:
+        mapped = self.reader == "mmap"
+        if self.typed:
+            for record in records:
+                record.extract = record.compile(typed=self.typed)
+
+        dispatch = self.build_dispatch(records)
+        lines: Iterator[str] = self.read_mmap() if mapped else self.read_file()
+        bbox = self.bbox
+        region = self.region
+        # Mapped lines are counted with the newline that text lines include.
+        ending = 1 if mapped else 0
+        matched: dict[str, list[int]] = {}
+        count = 0
+        size = os.path.getsize(self.file)
+        with self.progress.task("parsing", size) as advance:
+            while True:
+                with self.metrics.phase("read"):
+                    chunk = list(islice(lines, READ_CHUNK_LINES))
+                if not chunk:
+                    break
+                count += len(chunk)
+                with self.metrics.phase("parse"):
+                    for line in chunk:
+                        for record in self.route_line(dispatch, line):
+                            counts = matched.setdefault(record.name, [0, 0])
+                            counts[0] += 1
+                            counts[1] += len(line) + ending
+                            values = record.extract(line)
+                            if bbox is not None and not record.within(values, bbox):
+                                continue
+                            if region is None or region.keep(record.name, values):
+                                self.add_row(record.name, values, self.cycle)
+                # Progress is only reported once per chunk of lines.
+                advance(sum(len(line) + ending for line in chunk))
+
+        self.metrics.scanned(count, size)
+        for name, (rows, table_size) in matched.items():
+            self.metrics.matched(name, rows, table_size)
+
+    def parse_array(self, records: list[ArincRecord]) -> None:
+        # The file is read as a (lines, width) byte array and each record type
+        # is selected and sliced column by column instead of line by line.
+        try:
+            from pyarinc424 import vectorized
+        except ImportError:
+            raise ImportError(
+                "The numpy reader requires numpy: pip install pyarinc424[numpy]"
+            )
+
+        with self.metrics.phase("read"):
+            lines = vectorized.read_array(self.file)
+        self.metrics.scanned(len(lines), os.path.getsize(self.file))
+        with (
+            self.metrics.phase("parse"),
+            self.progress.task("parsing", len(records)) as advance,
+        ):
+            # Parent records are parsed first so the region filter knows
+            # which of them were kept.
+            for record in sorted(records, key=lambda r: r.name not in PARENT_TABLES):
+                self.parse_array_record(vectorized, lines, record)
+                advance(1)
+
+    def parse_array_record(self, vectorized, lines, record: ArincRecord) -> None:
+        # Selects, filters and extracts the lines of one record type.
+        if record.section_pos is None or record.subsection_pos is None:
+            return
+        mask = vectorized.record_mask(
+            lines,
+            record.section_pos,
+            record.subsection_pos,
+            record.section,
+            record.subsection,
+            record.cont_rec_pos,
+            record.cont_rec_vals,
+        )
+        selected = lines[mask]
+        self.metrics.matched(record.name, len(selected), selected.size + len(selected))
+        if self.bbox is not None and record.position_index:
+            latitude, longitude = (record.slices[i] for i in record.position_index)
+            selected = selected[
+                vectorized.bbox_mask(
+                    vectorized.coordinates(selected[:, latitude], 2),
+                    vectorized.coordinates(selected[:, longitude], 3),
+                    self.bbox,
+                )
+            ]
+        if not len(selected):
+            return
+
+        if not self.typed:
+            # Each selected line is decoded once and cut up by the same
+            # itemgetter the text reader uses.
+            rows = list(map(record.compile(), vectorized.decode_lines(selected)))
+        else:
+            # Typed columns are extracted one at a time so coordinates can be
+            # decoded in a single vectorized pass.
+            columns = vectorized.extract_columns(
+                selected, record.slices, record.column_types
+            )
+            if columns:
+                rows = list(map(list, zip(*columns)))
+            else:
+                rows = [[] for _ in range(len(selected))]
+        if self.region is not None:
+            rows = self.region.filter(record.name, rows)
+        self.add_rows(record.name, rows)
+
+    def parse_parallel(self) -> None:
+        # Ranges are parsed in worker processes and merged back in range order,
+        # so rows reach the database in the same order as the file.
+        ranges = self.split_ranges(self.workers * 4)
+        starts, ends = zip(*ranges) if ranges else ((), ())
+        with ProcessPoolExecutor(self.workers) as executor:
+            results = executor.map(
+                parse_range,
+                repeat(self.file),
+                starts,
+                ends,
+                repeat(record_maps),
+                repeat(self.typed),
+                repeat(self.bbox),
+            )
+            with (
+                self.metrics.phase("parse"),
+                self.progress.task("parsing", len(ranges)) as advance,
+            ):
+                for tables, lines, matched in results:
+                    # Parent records go first so the region filter knows
+                    # which of them were kept.
+                    for name, rows in sorted(
+                        tables.items(), key=lambda item: item[0] not in PARENT_TABLES
+                    ):
+                        if self.region is not None:
+                            rows = self.region.filter(name, rows)
+                        self.add_rows(name, rows)
+                    self.metrics.scanned(lines, 0)
+                    for name, (count, size) in matched.items():
+                        self.metrics.matched(name, count, size)
+                    advance(1)
+        self.metrics.scanned(0, os.path.getsize(self.file))
 
     def get_cycle(self) -> str:
-        return self.lines[0][35:39]
+        with open(self.file) as file:
+            return file.readline()[35:39]
 
     def create_schema(self) -> None:
-        self.db.create_schema(self.schema)
+        self.db.create_schema(self.schema, replace=not self.delta, cycle=self.cycle)
 
     def create_table(self, record: ArincRecord) -> None:
-        self.db.create_table(self.schema, record.name, record.column_names)
+        self.db.create_table(
+            self.schema,
+            record.name,
+            record.column_names,
+            column_types=record.storage_types if self.typed else None,
+            replace=not self.delta,
+        )
+
+    def create_indexes(self, record: ArincRecord) -> None:
+        # Indexes are only built after the bulk load so inserts stay fast.
+        if record.key:
+            self.db.create_index(
+                self.schema, record.name, f"{record.name}_key", record.key
+            )
+        for columns in record.indexes:
+            index_name = f"{record.name}_{'_'.join(columns)}".lower()
+            self.db.create_index(self.schema, record.name, index_name, columns)
+        # Spatial indexes need the coordinates decoded into numeric columns.
+        if self.typed and record.position:
+            latitude, longitude = record.position
+            self.db.create_spatial_index(
+                self.schema, record.name, f"{record.name}_position", latitude, longitude
+            )
 
     def add_row(self, name: str, values: list, cycle: str) -> None:
-        self.db.add_row(self.schema, name, values)
+        buffer = self.buffers.setdefault(name, [])
+        buffer.append(values)
+        # Delta loads need every row of a table before it can be compared.
+        if not self.delta and len(buffer) >= self.batch_size:
+            self.flush(name)
 
-    def create_arinc_record(self, record_map) -> None:
-        record = ArincRecord(record_map)
+    def add_rows(self, name: str, rows: list[list]) -> None:
+        # Rows that arrive together, such as a record type from the numpy
+        # reader or a range from a worker, are buffered with one extend and
+        # written in whole batches.
+        buffer = self.buffers.setdefault(name, [])
+        buffer.extend(rows)
+        if self.delta or len(buffer) < self.batch_size:
+            return
+        full = len(buffer) - len(buffer) % self.batch_size
+        for start in range(0, full, self.batch_size):
+            self.write(name, buffer[start : start + self.batch_size])
+        del buffer[:full]
 
-        self.create_table(record)
+    def flush(self, name: str) -> None:
+        rows = self.buffers.pop(name, None)
+        if rows:
+            self.write(name, rows)
 
-        for line in track(self.lines, description=f"{record.name.rjust(26)}"):
-            if (
-                record.section_pos is not None
-                and record.subsection_pos is not None
-                and line[record.section_pos] == record.section
-                and line[record.subsection_pos] == record.subsection
-            ):
-                if (
-                    not record.cont_rec_pos
-                    or line[record.cont_rec_pos] in record.cont_rec_vals
-                ):
-                    row = [f"{line[i['start']:i['end']]}" for i in record.columns]
-                    self.add_row(record.name, row, self.cycle)
+    def write(self, name: str, rows: list[list]) -> None:
+        if self.cache is not None:
+            self.cache.write(name, rows)
+        if name in self.retained:
+            self.retained[name].extend(rows)
+        with self.metrics.writing(name, len(rows)):
+            self.db.add_rows(self.schema, name, rows)
+
+    def flush_all(self) -> None:
+        for name in list(self.buffers):
+            self.flush(name)
+
+    def apply_delta(self, record: ArincRecord) -> None:
+        # Compares the parsed rows with what is already loaded and only writes
+        # the differences.
+        rows = self.buffers.pop(record.name, [])
+        if self.cache is not None and rows:
+            self.cache.write(record.name, rows)
+        if record.name in self.retained:
+            self.retained[record.name].extend(rows)
+        with self.metrics.phase("delta"):
+            existing = self.db.fetch_rows(self.schema, record.name, record.column_names)
+            delta = diff_rows(record.column_names, record.key, existing, rows)
+
+        if delta.deletes:
+            key_columns = identity_columns(record.column_names, record.key)
+            with self.metrics.phase("insert"):
+                self.db.delete_rows(
+                    self.schema, record.name, key_columns, delta.deletes
+                )
+        for start in range(0, len(delta.inserts), self.batch_size):
+            batch = delta.inserts[start : start + self.batch_size]
+            with self.metrics.writing(record.name, len(batch)):
+                self.db.add_rows(self.schema, record.name, batch)
+
+        self.delta_report[record.name] = delta.summary()
+
+    @staticmethod
+    def build_dispatch(records: list[ArincRecord]) -> Dispatch:
+        dispatch: Dispatch = {}
+        for record in records:
+            if record.section_pos is None or record.subsection_pos is None:
+                continue
+            layout = dispatch.setdefault(
+                (record.section_pos, record.subsection_pos), {}
+            )
+            key = (record.section, record.subsection)
+            cont_vals = set(record.cont_rec_vals)
+            layout.setdefault(key, []).append((record, record.cont_rec_pos, cont_vals))
+        return dispatch
+
+    @staticmethod
+    def route_line(dispatch: Dispatch, line: str) -> list[ArincRecord]:
+        matched: list[ArincRecord] = []
+        for (section_pos, subsection_pos), layout in dispatch.items():
+            routes = layout.get((line[section_pos], line[subsection_pos]))
+            if routes:
+                matched.extend(
+                    record
+                    for record, cont_pos, cont_vals in routes
+                    if not cont_pos or line[cont_pos] in cont_vals
+                )
+        return matched
+
+
+def iter_lines(data, start: int, end: int) -> Iterator[str]:
+    # Yields each line of `data` between two byte offsets, without its line
+    # ending. Each block is decoded and split in two calls that run in C
+    # instead of searching for every newline from Python.
+    while start < end:
+        stop = end
+        if start + SPLIT_BLOCK_BYTES < end:
+            stop = data.rfind(b"\n", start, start + SPLIT_BLOCK_BYTES)
+            if stop == -1:
+                # A single line is longer than the block.
+                stop = data.find(b"\n", start + SPLIT_BLOCK_BYTES, end)
+                if stop == -1:
+                    stop = end
+        elif data[end - 1 : end] == b"\n":
+            stop = end - 1
+        yield from str(data[start:stop], "latin-1").split("\n")
+        start = stop + 1
+
+
+def parse_range(
+    file: str,
+    start: int,
+    end: int,
+    maps: list[dict],
+    typed: bool = False,
+    bbox: BBox | None = None,
+) -> tuple[dict[str, list[list]], int, dict[str, list[int]]]:
+    # Runs in a worker process: parses one line-aligned byte range of the file
+    # and returns its rows grouped by table, the number of lines in the range
+    # and the rows and bytes matched by each table.
+    records = [ArincRecord(record_map) for record_map in maps]
+    for record in records:
+        record.extract = record.compile(typed=typed)
+    dispatch = ArincParser.build_dispatch(records)
+
+    with open(file, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    tables: dict[str, list[list]] = {}
+    matched: dict[str, list[int]] = {}
+    count = 0
+    for line in iter_lines(data, 0, len(data)):
+        count += 1
+        for record in ArincParser.route_line(dispatch, line):
+            counts = matched.setdefault(record.name, [0, 0])
+            counts[0] += 1
+            counts[1] += len(line) + 1
+            values = record.extract(line)
+            if bbox is None or record.within(values, bbox):
+                tables.setdefault(record.name, []).append(values)
+    return tables, count, matched
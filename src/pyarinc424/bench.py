@@ -0,0 +1,426 @@
+from pyarinc424.arinc import ArincParser
+from pyarinc424.config import UserConfigs
+from pyarinc424.database import DbConfig, MemoryDb, SqliteDb, get_db
+from pyarinc424.metrics import LoadMetrics
+from pyarinc424.procedures import PROCEDURE_TABLES
+from pyarinc424.record_maps import column_types, record_maps
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+LINE_LENGTH = 132
+
+# Approximate number of records of each table in one FAA CIFP cycle, used as
+# the 1x scale of generated files.
+CIFP_COUNTS = {
+    "airport": 13500,
+    "approach": 135000,
+    "approach_cont": 2000,
+    "controlled_airspace": 11000,
+    "enroute_airways": 30000,
+    "enroute_waypoint": 68000,
+    "grid_mora": 1300,
+    "heli_approach": 1500,
+    "heli_approach_cont": 50,
+    "heli_msa": 50,
+    "heli_terminal_waypoint": 800,
+    "heliport": 7000,
+    "localizer": 1600,
+    "msa": 6000,
+    "ndb_navaid": 1000,
+    "pathpoint": 4500,
+    "pathpoint_cont": 4500,
+    "restrictive_airspace": 22000,
+    "restrictive_airspace_cont": 1200,
+    "runway": 14000,
+    "sid": 42000,
+    "star": 36000,
+    "terminal_navaid": 300,
+    "terminal_waypoint": 45000,
+    "vhf_navaid": 1500,
+}
+
+IDENTIFIER_CHARS = string.ascii_uppercase + string.digits
+
+# Approximate number of legs per procedure and fixes per airway, used to size
+# the pools of procedure and airway identifiers.
+LEGS_PER_PROCEDURE = 10
+FIXES_PER_AIRWAY = 20
+
+
+def leg_references(name: str, airport_column: str) -> list[tuple[str, list[str]]]:
+    # The legs of a procedure table share its pool of (airport, ICAO code,
+    # procedure) identifiers, with transitions and fixes from shared pools.
+    return [
+        (name, [airport_column, "ICAO_Code", "Procedure_Identifier"]),
+        ("transition", ["Route_Type", "Transition_Identifier"]),
+        ("fix", ["Fix_Identifier", "ICAO_Code_2"]),
+        ("fix_section", ["Section_Code_2", "Subsection_Code_2"]),
+    ]
+
+
+# Columns that name another record are filled from pools of identifiers
+# shared by every table, so airway fixes resolve to waypoints and procedure
+# legs group into procedures as they do in a real file. Each reference fills
+# a group of columns from one entry of a pool.
+REFERENCES: dict[str, list[tuple[str, list[str]]]] = {
+    "airport": [("airport", ["Airport_Identifier", "ICAO_Code"])],
+    "heliport": [("heliport", ["Heliport_Identifier", "ICAO_Code"])],
+    "enroute_waypoint": [("fix", ["Waypoint_Identifier", "ICAO_Code_2"])],
+    "enroute_airways": [
+        ("route", ["Route_Identifier", "Sixth_Character"]),
+        ("fix", ["Fix_Identifier", "ICAO_Code"]),
+        ("fix_section", ["Section_Code_2", "Subsection_Code_2"]),
+    ],
+    **{
+        name: [("airport", ["Airport_Identifier", "ICAO_Code"])]
+        for name in [
+            "localizer",
+            "msa",
+            "ndb_navaid",
+            "pathpoint",
+            "pathpoint_cont",
+            "runway",
+            "terminal_navaid",
+            "terminal_waypoint",
+            "vhf_navaid",
+        ]
+    },
+    **{
+        name: [("heliport", ["Heliport_Identifier", "ICAO_Code"])]
+        for name in ["heli_msa", "heli_terminal_waypoint"]
+    },
+    **{
+        table: leg_references(name, airport_column)
+        for name, (airport_column, cont_table) in PROCEDURE_TABLES.items()
+        for table in [name, cont_table]
+        if table
+    },
+}
+
+# Tables whose records each take the next entry of a pool instead of a
+# random one, so every airport, heliport and waypoint is defined once.
+POOL_TABLES = {"airport": "airport", "heliport": "heliport", "enroute_waypoint": "fix"}
+
+
+def generate_value(column_type: str, width: int, rng: random.Random) -> str:
+    # Returns a plausible fixed-width value for a column of the given type.
+    if column_type == "latitude":
+        digits = f"{rng.randint(0, 89):02}" + "".join(rng.choices(string.digits, k=8))
+        value = rng.choice("NS") + digits
+    elif column_type == "longitude":
+        digits = f"{rng.randint(0, 179):03}" + "".join(rng.choices(string.digits, k=8))
+        value = rng.choice("EW") + digits
+    elif column_type == "altitude":
+        if rng.random() < 0.1:
+            value = f"FL{rng.randint(180, 450):03}"
+        else:
+            value = f"{rng.randint(0, 180) * 100:05}"
+    elif column_type == "magnetic_variation":
+        value = f"{rng.choice('EW')}{rng.randint(0, 200):04}"
+    elif column_type == "vhf_frequency":
+        value = f"{rng.randint(10800, 11795):05}"
+    elif column_type == "ndb_frequency":
+        value = f"{rng.randint(1900, 5350):05}"
+    elif column_type == "integer":
+        value = "".join(rng.choices(string.digits, k=width))
+    else:
+        length = rng.randint(1, width) if width > 5 else width
+        value = "".join(rng.choices(IDENTIFIER_CHARS, k=length))
+    return value[:width].ljust(width)
+
+
+def identifiers(count: int, width: int, rng: random.Random) -> list[str]:
+    # Returns `count` distinct random identifiers of `width` characters.
+    unique: dict[str, None] = {}
+    while len(unique) < count:
+        unique["".join(rng.choices(IDENTIFIER_CHARS, k=width))] = None
+    return list(unique)
+
+
+def generate_pools(
+    counts: dict[str, int], rng: random.Random
+) -> dict[str, list[tuple[str, ...]]]:
+    # Builds the pools of identifiers named in REFERENCES, sized on the
+    # number of records of the tables they identify.
+    icao_codes = [f"K{n}" for n in range(1, 8)]
+
+    def places(count: int, width: int) -> list[tuple[str, ...]]:
+        return [(i, rng.choice(icao_codes)) for i in identifiers(count, width, rng)]
+
+    pools: dict[str, list[tuple[str, ...]]] = {
+        "airport": places(counts.get("airport", 1), 4),
+        "heliport": places(counts.get("heliport", 1), 4),
+        "fix": places(counts.get("enroute_waypoint", 1), 5),
+        "route": [
+            (i, " ")
+            for i in identifiers(
+                max(1, counts.get("enroute_airways", 0) // FIXES_PER_AIRWAY), 5, rng
+            )
+        ],
+        "transition": [(rng.choice("123456"), i) for i in identifiers(20, 5, rng)],
+        "fix_section": [("E", "A")],
+    }
+    for name, (airport_column, _) in PROCEDURE_TABLES.items():
+        parents = pools[
+            "heliport" if airport_column == "Heliport_Identifier" else "airport"
+        ]
+        count = max(1, counts.get(name, 0) // LEGS_PER_PROCEDURE)
+        pools[name] = [(*rng.choice(parents), i) for i in identifiers(count, 6, rng)]
+    return pools
+
+
+def reference_values(
+    name: str, index: int, pools: dict[str, list[tuple[str, ...]]], rng: random.Random
+) -> dict[str, str]:
+    # Values of the columns of the `index`th record of table `name` that are
+    # drawn from the shared pools.
+    values: dict[str, str] = {}
+    for pool, columns in REFERENCES.get(name, []):
+        entries = pools[pool]
+        if POOL_TABLES.get(name) == pool:
+            entry = entries[index % len(entries)]
+        else:
+            entry = rng.choice(entries)
+        values.update(zip(columns, entry))
+    return values
+
+
+def generate_line(
+    record_map: dict,
+    number: int,
+    cycle: str,
+    rng: random.Random,
+    values: dict[str, str] | None = None,
+) -> str:
+    # Builds one 132 character line that routes to `record_map`, with the
+    # given values for some of its columns.
+    values = values or {}
+    line = [" "] * LINE_LENGTH
+    for column in record_map["columns"]:
+        start = column.get("start") or 0
+        end = column.get("end") or LINE_LENGTH
+        name = column["name"]
+        if name == "File_Record_Number":
+            value = f"{number % 100000:05}"
+        elif name == "Cycle":
+            value = cycle
+        elif name in values:
+            value = values[name].ljust(end - start)
+        else:
+            value = generate_value(
+                column.get("type") or column_types.get(name, "text"), end - start, rng
+            )
+        line[start:end] = value[: end - start]
+
+    line[record_map["section_pos"]] = record_map["section_code"]
+    line[record_map["subsection_pos"]] = record_map["subsection_code"]
+    if record_map.get("cont_rec_pos"):
+        line[record_map["cont_rec_pos"]] = record_map["cont_rec_vals"][0]
+    return "".join(line)
+
+
+def generate_file(
+    path: str, scale: float = 1.0, cycle: str = "2301", seed: int = 424
+) -> dict[str, int]:
+    # Writes a synthetic file of every table in record_maps at `scale` times
+    # the size of a CIFP cycle and returns the number of lines per table.
+    rng = random.Random(seed)
+    names = [str(record_map["name"]) for record_map in record_maps]
+    counts = {
+        name: max(1, round(CIFP_COUNTS.get(name, 1000) * scale)) for name in names
+    }
+    pools = generate_pools(counts, rng)
+    header = ("HDR01" + " " * 30 + cycle).ljust(LINE_LENGTH)
+    number = 0
+    with open(path, "w") as file:
+        file.write(header + "\n")
+        for name, record_map in zip(names, record_maps):
+            for index in range(counts[name]):
+                number += 1
+                values = reference_values(name, index, pools, rng)
+                line = generate_line(record_map, number, cycle, rng, values)
+                file.write(line + "\n")
+    return counts
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def run(
+    file: str,
+    db: DbConfig,
+    reader: str = "text",
+    workers: int = 1,
+    typed: bool = False,
+) -> dict:
+    # Parses and loads `file` into `db` and returns throughput and timings.
+    metrics = LoadMetrics()
+    start = time.perf_counter()
+    with db.connect():
+        parser = ArincParser(
+            db, file, reader=reader, workers=workers, typed=typed, metrics=metrics
+        )
+        parser.parse()
+    total = time.perf_counter() - start
+
+    phases = dict(metrics.phases)
+    phases["total"] = total
+    tables = {
+        name: {
+            "rows": int(table["rows_written"]),
+            "insert_seconds": table["insert_seconds"],
+            "rows_per_sec": (
+                table["rows_written"] / table["insert_seconds"]
+                if table["insert_seconds"]
+                else None
+            ),
+        }
+        for name, table in sorted(metrics.tables.items())
+    }
+    lines = metrics.lines
+    rows = sum(int(table["rows_written"]) for table in metrics.tables.values())
+    return {
+        "file": file,
+        "bytes": os.path.getsize(file),
+        "lines": lines,
+        "rows": rows,
+        "reader": reader,
+        "workers": workers,
+        "typed": typed,
+        "lines_per_sec": lines / total if total else None,
+        "rows_per_sec": rows / total if total else None,
+        "phases": phases,
+        "tables": tables,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{report['lines']} lines, {report['rows']} rows, "
+        f"{report['bytes'] / 1024 / 1024:.1f} MB "
+        f"(reader={report['reader']}, workers={report['workers']}, "
+        f"typed={report['typed']})"
+    )
+    print(f"{'lines/sec':>26}  {report['lines_per_sec']:,.0f}")
+    print(f"{'rows/sec':>26}  {report['rows_per_sec']:,.0f}")
+    if report["peak_rss_mb"] is not None:
+        print(f"{'peak RSS (MB)':>26}  {report['peak_rss_mb']:,.1f}")
+    print()
+    for phase, seconds in report["phases"].items():
+        print(f"{phase:>26}  {seconds:8.3f} s")
+    print()
+    print(f"{'table':>26}  {'rows':>8}  {'insert rows/sec':>15}")
+    for name, table in report["tables"].items():
+        rate = table["rows_per_sec"]
+        rate_text = f"{rate:,.0f}" if rate is not None else "-"
+        print(f"{name:>26}  {table['rows']:>8}  {rate_text:>15}")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(
+        prog="pyarinc424-bench",
+        description="Measure parse and load throughput on a synthetic CIFP file.",
+    )
+    arg_parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="size of the generated file relative to one CIFP cycle (default 1)",
+    )
+    arg_parser.add_argument(
+        "--file", help="benchmark an existing ARINC file instead of generating one"
+    )
+    arg_parser.add_argument(
+        "--backend",
+        choices=["memory", "sqlite"],
+        default="sqlite",
+        help="database to load into (default sqlite, in a temporary file)",
+    )
+    arg_parser.add_argument(
+        "--config", help="load into the database of a config file instead"
+    )
+    arg_parser.add_argument(
+        "--reader", choices=["text", "mmap", "numpy"], default="text"
+    )
+    arg_parser.add_argument("--workers", type=int, default=1)
+    arg_parser.add_argument("--typed", action="store_true")
+    arg_parser.add_argument("--seed", type=int, default=424)
+    arg_parser.add_argument("--json", help="also write the report to a JSON file")
+    args = arg_parser.parse_args(argv)
+
+    if args.scale <= 0:
+        arg_parser.error("--scale must be positive")
+    if args.workers < 1:
+        arg_parser.error("--workers must be a positive integer")
+
+    return args
+
+
+class SqliteBenchConfigs:
+    def __init__(self, dbname: str) -> None:
+        self.dbname = dbname
+        self.fast_load = False
+
+
+def benchmark(argv: list[str]) -> dict:
+    # Runs the benchmark described by the command line arguments, prints the
+    # report and returns it.
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        generate_seconds = 0.0
+        file = args.file
+        if not file:
+            file = os.path.join(directory, "synthetic.dat")
+            start = time.perf_counter()
+            generate_file(file, scale=args.scale, seed=args.seed)
+            generate_seconds = time.perf_counter() - start
+
+        if args.config:
+            db: DbConfig = get_db(UserConfigs(args.config))
+        elif args.backend == "memory":
+            db = MemoryDb()
+        else:
+            db = SqliteDb(SqliteBenchConfigs(os.path.join(directory, "bench.db")))
+
+        report = run(
+            file,
+            db,
+            reader=args.reader,
+            workers=args.workers,
+            typed=args.typed,
+        )
+        report["phases"] = {"generate": generate_seconds, **report["phases"]}
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    # The console script exits with main's return value, so the report is not
+    # returned here.
+    benchmark(sys.argv[1:] if argv is None else argv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
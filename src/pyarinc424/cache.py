@@ -0,0 +1,60 @@
+from collections.abc import Iterator
+import hashlib
+import json
+import os
+import pickle
+from typing import IO
+
+
+def file_digest(file: str) -> str:
+    digest = hashlib.sha256()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(file: str, options: object) -> str:
+    # Parsed rows depend on the file contents and on everything that shapes
+    # the rows (the record maps and parse options), so all of them are hashed.
+    options_json = json.dumps(options, sort_keys=True, default=str)
+    options_digest = hashlib.sha256(options_json.encode()).hexdigest()
+    return f"{file_digest(file)[:32]}-{options_digest[:16]}"
+
+
+class ParseCache:
+    # Parsed rows are stored as a stream of pickled (table, rows) batches in a
+    # single file per cache key.
+    def __init__(self, cache_dir: str, key: str) -> None:
+        self.path = os.path.join(cache_dir, f"{key}.pickle")
+        self.file: IO[bytes] | None = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def read(self) -> Iterator[tuple[str, list[list]]]:
+        with open(self.path, "rb") as file:
+            while True:
+                try:
+                    yield pickle.load(file)
+                except EOFError:
+                    return
+
+    def open(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.file = open(f"{self.path}.tmp", "wb")
+
+    def write(self, table: str, rows: list[list]) -> None:
+        if self.file is not None:
+            pickle.dump((table, rows), self.file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def close(self, commit: bool = True) -> None:
+        # The cache entry only appears once it has been completely written.
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+        if commit:
+            os.replace(f"{self.path}.tmp", self.path)
+        else:
+            os.remove(f"{self.path}.tmp")
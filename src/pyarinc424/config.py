@@ -1,5 +1,11 @@
 import configparser
 import os
+from pyarinc424.metrics import METRICS_FORMATS
+
+DEFAULT_BATCH_SIZE = 5000
+LOAD_METHODS = ["copy", "insert"]
+READERS = ["text", "mmap", "numpy"]
+BACKENDS = ["postgres", "sqlite", "parquet"]
 
 
 class UserConfigs:
@@ -19,25 +25,81 @@ class UserConfigs:
             self.password = parser["postgres"]["password"]
             self.host = parser["postgres"]["host"]
             self.port = parser["postgres"]["port"]
+            self.load_method = parser["postgres"].get("load_method", "copy")
+            self.parallel_tables = parser.getint(
+                "postgres", "parallel_tables", fallback=1
+            )
+            self.atomic_swap = parser.getboolean(
+                "postgres", "atomic_swap", fallback=False
+            )
 
         if parser.has_section("sqlite"):
             self.dbtype = "sqlite"
             self.dbname = parser["sqlite"]["dbname"]
+            self.fast_load = parser.getboolean("sqlite", "fast_load", fallback=False)
+
+        if parser.has_section("parquet"):
+            self.dbtype = "parquet"
+            self.directory = parser["parquet"]["directory"]
+            if not self.directory.startswith("/"):
+                self.directory = os.path.abspath(
+                    os.path.join(os.path.dirname(config_file), self.directory)
+                )
 
         self.file_loc = parser["cifp_file"]["file_loc"]
 
+        self.batch_size = parser.getint(
+            "loader", "batch_size", fallback=DEFAULT_BATCH_SIZE
+        )
+        self.reader = parser.get("loader", "reader", fallback="text")
+        self.workers = parser.getint("loader", "workers", fallback=1)
+        self.typed = parser.getboolean("loader", "typed", fallback=False)
+        self.indexes = parser.getboolean("loader", "indexes", fallback=True)
+        self.delta = parser.getboolean("loader", "delta", fallback=False)
+        self.delta_report = parser.get("loader", "delta_report", fallback=None)
+        self.schema = parser.get("loader", "schema", fallback=None)
+        self.cache_dir = parser.get("loader", "cache_dir", fallback=None)
+        self.procedures = parser.getboolean("loader", "procedures", fallback=False)
+        self.airways = parser.getboolean("loader", "airways", fallback=False)
+        self.bbox = parse_bbox(parser.get("loader", "bbox", fallback=""))
+        self.metrics_file = parser.get("loader", "metrics_file", fallback=None)
+        self.metrics_format = parser.get("loader", "metrics_format", fallback="json")
+
         # if the file_loc path is not absolute, make it absolute and relative to the config file
         if not self.file_loc.startswith("/"):
             self.file_loc = os.path.abspath(
                 os.path.join(os.path.dirname(config_file), self.file_loc)
             )
 
+        if self.cache_dir and not self.cache_dir.startswith("/"):
+            self.cache_dir = os.path.abspath(
+                os.path.join(os.path.dirname(config_file), self.cache_dir)
+            )
+
+
+def parse_bbox(value: str) -> tuple[float, float, float, float] | None:
+    # "west, south, east, north" in decimal degrees; empty means no filter.
+    if not value.strip():
+        return None
+    try:
+        west, south, east, north = (float(v) for v in value.split(","))
+    except ValueError:
+        raise ValueError("Loader bbox must be four numbers: west, south, east, north")
+    if not (-90 <= south <= north <= 90):
+        raise ValueError(
+            "Loader bbox latitudes must be ordered -90 <= south <= north <= 90"
+        )
+    if not (-180 <= west <= 180 and -180 <= east <= 180):
+        raise ValueError("Loader bbox longitudes must be between -180 and 180")
+    return west, south, east, north
+
 
 def validate(parser: configparser.ConfigParser) -> None:
-    if not parser.has_section("postgres") and not parser.has_section("sqlite"):
+    backends = [b for b in BACKENDS if parser.has_section(b)]
+    if not backends:
         raise ValueError("No database configuration found in config.ini")
 
-    if parser.has_section("postgres") and parser.has_section("sqlite"):
+    if len(backends) > 1:
         raise ValueError("Only one database configuration allowed in config.ini")
 
     if parser.has_section("postgres"):
@@ -47,12 +109,71 @@ def validate(parser: configparser.ConfigParser) -> None:
         ):
             raise ValueError("Missing required PostgreSQL configuration keys")
 
+        if parser["postgres"].get("load_method", "copy") not in LOAD_METHODS:
+            raise ValueError(
+                f"PostgreSQL load_method must be one of: {', '.join(LOAD_METHODS)}"
+            )
+
+        parallel_tables = parser["postgres"].get("parallel_tables", "1")
+        if not parallel_tables.isdigit() or int(parallel_tables) < 1:
+            raise ValueError("PostgreSQL parallel_tables must be a positive integer")
+
+        if (
+            int(parallel_tables) > 1
+            and parser["postgres"].get("load_method", "copy") != "copy"
+        ):
+            raise ValueError("PostgreSQL parallel_tables requires load_method = copy")
+
+        if int(parallel_tables) > 1 and parser.getboolean(
+            "loader", "delta", fallback=False
+        ):
+            raise ValueError("PostgreSQL parallel_tables cannot be used with delta")
+
+        if parser.getboolean("postgres", "atomic_swap", fallback=False) and (
+            parser.getboolean("loader", "delta", fallback=False)
+        ):
+            raise ValueError("PostgreSQL atomic_swap cannot be used with delta")
+
+        # Each cycle is loaded into a new cycleXXXX schema by default, which
+        # would leave a delta load nothing to compare with.
+        if parser.getboolean("loader", "delta", fallback=False) and not parser.get(
+            "loader", "schema", fallback=""
+        ):
+            raise ValueError("PostgreSQL delta loads require a [loader] schema")
+
     if parser.has_section("sqlite"):
         if "dbname" not in parser["sqlite"]:
             raise ValueError("Missing required SQLite configuration key: dbname")
 
+    if parser.has_section("parquet"):
+        if "directory" not in parser["parquet"]:
+            raise ValueError("Missing required Parquet configuration key: directory")
+
+        if parser.getboolean("loader", "delta", fallback=False):
+            raise ValueError("Parquet output cannot be used with delta")
+
     if not parser.has_section("cifp_file"):
         raise ValueError("Missing required cifp_file configuration key: file_loc")
 
     if not parser.has_option("cifp_file", "file_loc"):
         raise ValueError("File location cannot be empty")
+
+    if parser.has_option("loader", "batch_size"):
+        batch_size = parser["loader"]["batch_size"]
+        if not batch_size.isdigit() or int(batch_size) < 1:
+            raise ValueError("Batch size must be a positive integer")
+
+    if parser.has_option("loader", "workers"):
+        workers = parser["loader"]["workers"]
+        if not workers.isdigit() or int(workers) < 1:
+            raise ValueError("Workers must be a positive integer")
+
+    parse_bbox(parser.get("loader", "bbox", fallback=""))
+
+    if parser.get("loader", "reader", fallback="text") not in READERS:
+        raise ValueError(f"Loader reader must be one of: {', '.join(READERS)}")
+
+    if parser.get("loader", "metrics_format", fallback="json") not in METRICS_FORMATS:
+        raise ValueError(
+            f"Loader metrics_format must be one of: {', '.join(METRICS_FORMATS)}"
+        )
@@ -1,25 +1,101 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from functools import lru_cache
 import psycopg2  # type: ignore
+import psycopg2.extras  # type: ignore
+import psycopg2.pool  # type: ignore
+import os
 import sqlite3
-from typing import Protocol, Generator
+import sys
+import tempfile
+from typing import IO, Any, Protocol, Generator
 from pyarinc424.config import UserConfigs
 
+# Pragmas applied while loading with [sqlite] fast_load = yes; the previous
+# values are restored once the load has been committed.
+FAST_LOAD_PRAGMAS = {
+    "journal_mode": "OFF",
+    "synchronous": "OFF",
+    "cache_size": "-262144",
+    "temp_store": "MEMORY",
+}
+
+# Column types for each storage type declared in decoders.STORAGE_TYPES.
+POSTGRES_TYPES = {"text": "varchar", "integer": "integer", "real": "double precision"}
+SQLITE_TYPES = {"text": "TEXT", "integer": "INTEGER", "real": "REAL"}
+
+# Arrow types for each storage type, looked up by name so pyarrow is only
+# imported when the Parquet backend is used.
+ARROW_TYPES = {"text": "string", "integer": "int64", "real": "float64"}
+
+# COPY data is kept in memory up to this size per table before spilling to disk.
+COPY_SPOOL_SIZE = 32 * 1024 * 1024
+
 
 class DbConfig(Protocol):  # pragma: no cover
     def connect(self):
         pass
 
-    def create_schema(self, schema_name: str) -> None:
+    def create_schema(
+        self, schema_name: str, replace: bool = True, cycle: str | None = None
+    ) -> None:
         pass
 
     def create_table(
-        self, schema_name: str, table_name: str, columns: list[str]
+        self,
+        schema_name: str,
+        table_name: str,
+        columns: list[str],
+        column_types: list[str] | None = None,
+        replace: bool = True,
     ) -> None:
         pass
 
     def add_row(self, schema_name: str, table_name: str, values: list[str]) -> None:
         pass
 
+    def add_rows(self, schema_name: str, table_name: str, rows: list[list]) -> None:
+        pass
+
+    def finish_load(self, schema_name: str) -> None:
+        pass
+
+    def create_index(
+        self, schema_name: str, table_name: str, index_name: str, columns: list[str]
+    ) -> None:
+        pass
+
+    def create_spatial_index(
+        self,
+        schema_name: str,
+        table_name: str,
+        index_name: str,
+        latitude: str,
+        longitude: str,
+    ) -> None:
+        pass
+
+    def publish(self, schema_name: str) -> None:
+        pass
+
+    def rollback(self, schema_name: str) -> None:
+        pass
+
+    def fetch_rows(
+        self, schema_name: str, table_name: str, columns: list[str]
+    ) -> list[tuple]:
+        pass
+
+    def delete_rows(
+        self,
+        schema_name: str,
+        table_name: str,
+        key_columns: list[str],
+        keys: list[tuple],
+    ) -> None:
+        pass
+
 
 class PostgresDb:
     def __init__(self, configs) -> None:
@@ -30,12 +106,30 @@ class PostgresDb:
             "host": configs.host,
             "port": configs.port,
         }
+        self.load_method = configs.load_method
+        self.parallel_tables = configs.parallel_tables
+        self.atomic_swap = configs.atomic_swap
+        self.spools: dict[str, IO[str]] = {}
+        # Storage type of each column of the tables created, by table.
+        self.column_types: dict[str, dict[str, str]] = {}
+
+        # Tables loaded over several connections, or swapped in atomically,
+        # are written to a staging schema that is only renamed into place once
+        # every table is loaded.
+        self.staged = self.parallel_tables > 1 or self.atomic_swap
+
+        # With COPY, a schema that is replaced in place is only dropped and
+        # recreated, along with its tables, right before the spooled rows are
+        # copied in, so readers are not locked out of it while the file is
+        # parsed.
+        self.deferred: list[str] = []
 
         self.schema = ""
 
     @contextmanager
     def connect(self) -> Generator[psycopg2.extensions.cursor, None, None]:
         conn = psycopg2.connect(**self.params)
+        self.conn = conn
         self.cursor = conn.cursor()
         try:
             yield self.cursor
@@ -44,30 +138,215 @@ class PostgresDb:
             conn.commit()
             conn.close()
 
-    def create_schema(self, schema_name: str) -> None:
+    def load_schema(self, schema_name: str) -> str:
+        return f"{schema_name}_staging" if self.staged else schema_name
+
+    def create_schema(
+        self, schema_name: str, replace: bool = True, cycle: str | None = None
+    ) -> None:
         self.schema = schema_name
-        sql = (
-            f"DROP SCHEMA IF EXISTS {schema_name} CASCADE; CREATE SCHEMA {schema_name};"
-        )
+        schema_name = self.load_schema(schema_name)
+        if replace:
+            sql = f"DROP SCHEMA IF EXISTS {schema_name} CASCADE; CREATE SCHEMA {schema_name};"
+            if self.load_method == "copy" and not self.staged:
+                self.deferred = [sql]
+                return
+        else:
+            sql = f"CREATE SCHEMA IF NOT EXISTS {schema_name};"
         self.cursor.execute(sql)
 
     def create_table(
+        self,
+        schema_name: str,
+        table_name: str,
+        columns: list[str],
+        column_types: list[str] | None = None,
+        replace: bool = True,
+    ) -> None:
+        schema_name = self.load_schema(schema_name)
+        column_types = column_types or ["text"] * len(columns)
+        self.column_types[f"{schema_name}.{table_name}"] = dict(
+            zip(columns, column_types)
+        )
+        column_defs = ", ".join(
+            [f"{col} {POSTGRES_TYPES[t]}" for col, t in zip(columns, column_types)]
+        )
+        if replace:
+            sql = f"DROP TABLE IF EXISTS {schema_name}.{table_name}; CREATE TABLE {schema_name}.{table_name} ({column_defs});"
+        else:
+            sql = f"CREATE TABLE IF NOT EXISTS {schema_name}.{table_name} ({column_defs});"
+        if self.deferred:
+            self.deferred.append(sql)
+        else:
+            self.cursor.execute(sql)
+
+    def add_row(self, schema_name: str, table_name: str, values: list) -> None:
+        self.add_rows(schema_name, table_name, [values])
+
+    def add_rows(self, schema_name: str, table_name: str, rows: list[list]) -> None:
+        schema_name = self.load_schema(schema_name)
+        if self.load_method == "copy":
+            self.spool_rows(f"{schema_name}.{table_name}", rows)
+            return
+
+        values = [[clean_value(v) for v in row] for row in rows]
+        sql = f"INSERT INTO {schema_name}.{table_name} VALUES %s;"
+        psycopg2.extras.execute_values(self.cursor, sql, values, page_size=1000)
+
+    def spool_rows(self, table: str, rows: list[list]) -> None:
+        if table not in self.spools:
+            self.spools[table] = tempfile.SpooledTemporaryFile(
+                max_size=COPY_SPOOL_SIZE, mode="w+", encoding="utf-8"
+            )
+        self.spools[table].writelines(
+            "\t".join(copy_value(v) for v in row) + "\n" for row in rows
+        )
+
+    def finish_load(self, schema_name: str) -> None:
+        if self.parallel_tables > 1:
+            self.copy_parallel()
+            return
+
+        if self.deferred:
+            self.cursor.execute(" ".join(self.deferred))
+            self.deferred = []
+        for table, spool in self.spools.items():
+            spool.seek(0)
+            self.cursor.copy_expert(f"COPY {table} FROM STDIN;", spool)
+            spool.close()
+        self.spools = {}
+
+    def copy_parallel(self) -> None:
+        # The staging schema and its tables must be committed before other
+        # connections can load into them.
+        self.conn.commit()
+        pool = psycopg2.pool.ThreadedConnectionPool(
+            1, self.parallel_tables, **self.params
+        )
+
+        def copy_table(table: str) -> None:
+            conn = pool.getconn()
+            try:
+                with conn.cursor() as cursor:
+                    spool = self.spools[table]
+                    spool.seek(0)
+                    cursor.copy_expert(f"COPY {table} FROM STDIN;", spool)
+                    spool.close()
+                conn.commit()
+            finally:
+                pool.putconn(conn)
+
+        try:
+            with ThreadPoolExecutor(self.parallel_tables) as executor:
+                list(executor.map(copy_table, self.spools))
+        finally:
+            pool.closeall()
+        self.spools = {}
+
+    def create_index(
+        self, schema_name: str, table_name: str, index_name: str, columns: list[str]
+    ) -> None:
+        schema_name = self.load_schema(schema_name)
+        sql = f"CREATE INDEX IF NOT EXISTS {index_name} ON {schema_name}.{table_name} ({', '.join(columns)});"
+        self.cursor.execute(sql)
+
+    def create_spatial_index(
+        self,
+        schema_name: str,
+        table_name: str,
+        index_name: str,
+        latitude: str,
+        longitude: str,
+    ) -> None:
+        # A GiST index over point(longitude, latitude) serves bounding box
+        # (<@ box) and nearest neighbour (ORDER BY <->) queries.
+        schema_name = self.load_schema(schema_name)
+        sql = f"CREATE INDEX IF NOT EXISTS {index_name} ON {schema_name}.{table_name} USING gist (point({longitude}, {latitude}));"
+        self.cursor.execute(sql)
+
+    def fetch_rows(
         self, schema_name: str, table_name: str, columns: list[str]
+    ) -> list[tuple]:
+        schema_name = self.load_schema(schema_name)
+        sql = f"SELECT {', '.join(columns)} FROM {schema_name}.{table_name};"
+        self.cursor.execute(sql)
+        return self.cursor.fetchall()
+
+    def delete_rows(
+        self,
+        schema_name: str,
+        table_name: str,
+        key_columns: list[str],
+        keys: list[tuple],
     ) -> None:
-        column_defs = ", ".join([f"{col} varchar" for col in columns])
-        sql = f"DROP TABLE IF EXISTS {schema_name}.{table_name}; CREATE TABLE {schema_name}.{table_name} ({column_defs});"
+        # The keys are joined in as a VALUES list in one statement per page, so
+        # the key index can be used. Text columns are stored as "" rather than
+        # NULL, which leaves NULL-safe comparison to the typed columns.
+        table = f"{self.load_schema(schema_name)}.{table_name}"
+        types = self.column_types.get(table, {})
+        key_types = [types.get(c, "text") for c in key_columns]
+        template = ", ".join(f"%s::{POSTGRES_TYPES[t]}" for t in key_types)
+        conditions = " AND ".join(
+            f"t.{c} = k.{c}" if t == "text" else f"t.{c} IS NOT DISTINCT FROM k.{c}"
+            for c, t in zip(key_columns, key_types)
+        )
+        sql = (
+            f"DELETE FROM {table} AS t USING (VALUES %s) AS k "
+            f"({', '.join(key_columns)}) WHERE {conditions};"
+        )
+        psycopg2.extras.execute_values(
+            self.cursor, sql, keys, template=f"({template})", page_size=1000
+        )
+
+    def publish(self, schema_name: str) -> None:
+        if not self.staged:
+            return
+
+        # Swapping the staging schema in happens in a single transaction, so
+        # readers see either the previous cycle or the complete new one. With
+        # atomic_swap the replaced schema is kept as {schema}_previous.
+        staging = self.load_schema(schema_name)
+        previous = f"{schema_name}_previous"
+        if not self.atomic_swap:
+            sql = f"DROP SCHEMA IF EXISTS {schema_name} CASCADE; "
+        elif self.schema_exists(schema_name):
+            sql = (
+                f"DROP SCHEMA IF EXISTS {previous} CASCADE; "
+                f"ALTER SCHEMA {schema_name} RENAME TO {previous}; "
+            )
+        else:
+            sql = ""
+        sql += f"ALTER SCHEMA {staging} RENAME TO {schema_name};"
         self.cursor.execute(sql)
+        self.conn.commit()
 
-    def add_row(self, schema_name: str, table_name: str, values: list[str]) -> None:
-        values = [v.replace("'", "''") for v in values]
-        values_joined = ", ".join([f"'{v.rstrip()}'" for v in values])
-        sql = f"INSERT INTO {schema_name}.{table_name} VALUES ({values_joined});"
+    def rollback(self, schema_name: str) -> None:
+        # Swaps the previous schema back in; rolling back twice restores the
+        # schema that was rolled back.
+        previous = f"{schema_name}_previous"
+        if not self.schema_exists(previous):
+            raise ValueError(f"No previous schema {previous} to roll back to")
+
+        swap = f"{schema_name}_rollback"
+        sql = (
+            f"ALTER SCHEMA {schema_name} RENAME TO {swap}; "
+            f"ALTER SCHEMA {previous} RENAME TO {schema_name}; "
+            f"ALTER SCHEMA {swap} RENAME TO {previous};"
+        )
         self.cursor.execute(sql)
+        self.conn.commit()
+
+    def schema_exists(self, schema_name: str) -> bool:
+        sql = "SELECT 1 FROM information_schema.schemata WHERE schema_name = %s;"
+        self.cursor.execute(sql, (schema_name,))
+        return self.cursor.fetchone() is not None
 
 
 class SqliteDb:
     def __init__(self, configs) -> None:
         self.dbname = configs.dbname
+        self.fast_load = configs.fast_load
+        self.saved_pragmas: dict[str, str] = {}
         self.schema = ""
 
     @contextmanager
@@ -81,21 +360,313 @@ class SqliteDb:
             conn.commit()
             conn.close()
 
-    def create_schema(self, _) -> None:  # pragma: no cover
-        # SQLite does not support schemas in the same way as PostgreSQL.
-        # This method is intentionally a no-op.
+    def create_schema(self, _, replace: bool = True, cycle: str | None = None) -> None:
+        # SQLite does not support schemas in the same way as PostgreSQL, so
+        # this is only used to switch to load-time pragmas when requested.
+        if not self.fast_load:
+            return
+        for pragma, value in FAST_LOAD_PRAGMAS.items():
+            self.saved_pragmas[pragma] = self.cursor.execute(
+                f"PRAGMA {pragma};"
+            ).fetchone()[0]
+            self.cursor.execute(f"PRAGMA {pragma} = {value};")
+
+    def create_table(
+        self,
+        _,
+        table_name: str,
+        columns: list[str],
+        column_types: list[str] | None = None,
+        replace: bool = True,
+    ) -> None:
+        column_types = column_types or ["text"] * len(columns)
+        column_defs = ", ".join(
+            [f"{col} {SQLITE_TYPES[t]}" for col, t in zip(columns, column_types)]
+        )
+        # executescript would commit the open load transaction, so the
+        # statements are run one at a time.
+        if replace:
+            self.cursor.execute(f"DROP TABLE IF EXISTS {table_name};")
+            self.cursor.execute(f"CREATE TABLE {table_name} ({column_defs});")
+        else:
+            self.cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {table_name} ({column_defs});"
+            )
+
+    def add_row(self, schema_name: str, table_name: str, values: list) -> None:
+        self.add_rows(schema_name, table_name, [values])
+
+    def add_rows(self, _, table_name: str, rows: list[list]) -> None:
+        values = [[clean_value(v) for v in row] for row in rows]
+        if not values:
+            return
+        # All batches share one explicit transaction that publish commits.
+        if not self.cursor.connection.in_transaction:
+            self.cursor.execute("BEGIN;")
+        placeholders = ", ".join("?" * len(values[0]))
+        sql = f"INSERT INTO {table_name} VALUES ({placeholders});"
+        self.cursor.executemany(sql, values)
+
+    def finish_load(self, _) -> None:
         pass
 
-    def create_table(self, _, table_name: str, columns: list[str]) -> None:
-        column_defs = ", ".join([f"{col} TEXT" for col in columns])
-        sql = f"DROP TABLE IF EXISTS {table_name}; CREATE TABLE {table_name} ({column_defs});"
-        self.cursor.executescript(sql)
+    def create_index(
+        self, _, table_name: str, index_name: str, columns: list[str]
+    ) -> None:
+        sql = f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(columns)});"
+        self.cursor.execute(sql)
+
+    def create_spatial_index(
+        self, _, table_name: str, index_name: str, latitude: str, longitude: str
+    ) -> None:
+        # An R*Tree virtual table keyed on the rowid of each record, rebuilt on
+        # every load so it always matches the table.
+        self.cursor.execute(f"DROP TABLE IF EXISTS {index_name};")
+        self.cursor.execute(
+            f"CREATE VIRTUAL TABLE {index_name} USING rtree(id, min_latitude, "
+            "max_latitude, min_longitude, max_longitude);"
+        )
+        self.cursor.execute(
+            f"INSERT INTO {index_name} SELECT rowid, {latitude}, {latitude}, "
+            f"{longitude}, {longitude} FROM {table_name} "
+            f"WHERE {latitude} IS NOT NULL AND {longitude} IS NOT NULL;"
+        )
+
+    def fetch_rows(self, _, table_name: str, columns: list[str]) -> list[tuple]:
+        sql = f"SELECT {', '.join(columns)} FROM {table_name};"
+        return self.cursor.execute(sql).fetchall()
+
+    def delete_rows(
+        self, _, table_name: str, key_columns: list[str], keys: list[tuple]
+    ) -> None:
+        if not self.cursor.connection.in_transaction:
+            self.cursor.execute("BEGIN;")
+        conditions = " AND ".join(f"{c} IS ?" for c in key_columns)
+        sql = f"DELETE FROM {table_name} WHERE {conditions};"
+        self.cursor.executemany(sql, keys)
+
+    def publish(self, _) -> None:
+        self.cursor.connection.commit()
+        for pragma, value in self.saved_pragmas.items():
+            self.cursor.execute(f"PRAGMA {pragma} = {value};")
+        self.saved_pragmas = {}
+
+    def rollback(self, _) -> None:
+        raise ValueError("Rollback is only supported for PostgreSQL")
+
+
+class ParquetDb:
+    def __init__(self, configs) -> None:
+        self.directory = configs.directory
+        self.cycle: str | None = None
+        # pyarrow schemas and ParquetWriters, by file path.
+        self.schemas: dict[str, Any] = {}
+        self.writers: dict[str, Any] = {}
+
+    @contextmanager
+    def connect(self) -> Generator["ParquetDb", None, None]:
+        try:
+            import pyarrow  # type: ignore # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "The Parquet backend requires pyarrow: pip install pyarinc424[parquet]"
+            )
+        try:
+            yield self
+        finally:
+            # Writers still open here belong to a load that did not finish.
+            for path in list(self.writers):
+                self.writers.pop(path).close()
+                os.remove(f"{path}.tmp")
+
+    def table_path(self, schema_name: str, table_name: str) -> str:
+        return os.path.join(self.directory, schema_name, f"{table_name}.parquet")
+
+    def create_schema(
+        self, schema_name: str, replace: bool = True, cycle: str | None = None
+    ) -> None:
+        self.cycle = cycle
+        os.makedirs(os.path.join(self.directory, schema_name), exist_ok=True)
+
+    def create_table(
+        self,
+        schema_name: str,
+        table_name: str,
+        columns: list[str],
+        column_types: list[str] | None = None,
+        replace: bool = True,
+    ) -> None:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+
+        column_types = column_types or ["text"] * len(columns)
+        metadata = {"table": table_name}
+        if self.cycle:
+            metadata["cycle"] = self.cycle
+        schema = pa.schema(
+            [(col, ARROW_TYPES[t]) for col, t in zip(columns, column_types)],
+            metadata=metadata,
+        )
+
+        # Each table is written to a temporary file that only replaces the
+        # previous one once the load has finished.
+        path = self.table_path(schema_name, table_name)
+        self.schemas[path] = schema
+        self.writers[path] = pq.ParquetWriter(f"{path}.tmp", schema)
+
+    def add_row(self, schema_name: str, table_name: str, values: list[str]) -> None:
+        self.add_rows(schema_name, table_name, [values])
+
+    def add_rows(self, schema_name: str, table_name: str, rows: list[list]) -> None:
+        import pyarrow as pa  # type: ignore
+
+        if not rows:
+            return
+        path = self.table_path(schema_name, table_name)
+        schema = self.schemas[path]
+        columns = zip(*([clean_value(v) for v in row] for row in rows))
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(col, type=f.type) for col, f in zip(columns, schema)],
+            schema=schema,
+        )
+        self.writers[path].write_batch(batch)
+
+    def finish_load(self, _) -> None:
+        for path in list(self.writers):
+            self.writers.pop(path).close()
+            os.replace(f"{path}.tmp", path)
+
+    def create_index(self, *_) -> None:
+        # Parquet files have no indexes; row group statistics serve lookups.
+        pass
+
+    def create_spatial_index(self, *_) -> None:
+        pass
+
+    def publish(self, _) -> None:
+        pass
+
+    def rollback(self, _) -> None:
+        raise ValueError("Rollback is only supported for PostgreSQL")
+
+    def fetch_rows(self, *_) -> list[tuple]:
+        raise ValueError("Delta loads are not supported for Parquet")
+
+    def delete_rows(self, *_) -> None:
+        raise ValueError("Delta loads are not supported for Parquet")
+
+
+class MemoryDb:
+    # Keeps every table as a list of record tuples for the in-memory dataset
+    # API. Each table gets a generated namedtuple class, so rows cost no more
+    # than a plain tuple while still allowing attribute access by column name.
+    def __init__(self, configs=None) -> None:
+        self.cycle: str | None = None
+        self.columns: dict[str, list[str]] = {}
+        # Generated namedtuple class of each table.
+        self.record_types: dict[str, Any] = {}
+        self.positions: dict[str, tuple[str, str]] = {}
+        self.tables: dict[str, list[tuple]] = {}
+
+    @contextmanager
+    def connect(self) -> Generator["MemoryDb", None, None]:
+        yield self
+
+    def create_schema(
+        self, schema_name: str, replace: bool = True, cycle: str | None = None
+    ) -> None:
+        self.cycle = cycle
+
+    def create_table(
+        self,
+        schema_name: str,
+        table_name: str,
+        columns: list[str],
+        column_types: list[str] | None = None,
+        replace: bool = True,
+    ) -> None:
+        self.columns[table_name] = columns
+        self.record_types[table_name] = record_class(table_name, tuple(columns))
+        if replace or table_name not in self.tables:
+            self.tables[table_name] = []
+
+    def add_row(self, schema_name: str, table_name: str, values: list[str]) -> None:
+        self.add_rows(schema_name, table_name, [values])
+
+    def add_rows(self, schema_name: str, table_name: str, rows: list[list]) -> None:
+        make = self.record_types[table_name]._make
+        self.tables[table_name].extend(
+            make(memory_value(v) for v in row) for row in rows
+        )
+
+    def finish_load(self, _) -> None:
+        pass
+
+    def create_index(self, *_) -> None:
+        # Lookup indexes are built lazily by the dataset when first queried.
+        pass
+
+    def create_spatial_index(
+        self, _, table_name: str, index_name: str, latitude: str, longitude: str
+    ) -> None:
+        # Only the position columns are recorded; the dataset builds its
+        # spatial index the first time a table is queried by position.
+        self.positions[table_name] = (latitude, longitude)
+
+    def publish(self, _) -> None:
+        pass
+
+    def rollback(self, _) -> None:
+        raise ValueError("Rollback is only supported for PostgreSQL")
+
+    def fetch_rows(self, _, table_name: str, columns: list[str]) -> list[tuple]:
+        positions = [self.columns[table_name].index(c) for c in columns]
+        return [tuple(row[i] for i in positions) for row in self.tables[table_name]]
+
+    def delete_rows(
+        self, _, table_name: str, key_columns: list[str], keys: list[tuple]
+    ) -> None:
+        positions = [self.columns[table_name].index(c) for c in key_columns]
+        deleted = set(keys)
+        self.tables[table_name] = [
+            row
+            for row in self.tables[table_name]
+            if tuple(row[i] for i in positions) not in deleted
+        ]
+
+
+def clean_value(value):
+    return value.rstrip() if isinstance(value, str) else value
+
+
+def memory_value(value):
+    # Strings are interned so repeated values such as identifiers and codes are
+    # stored once, including across several datasets kept in memory.
+    return sys.intern(value.rstrip()) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=None)
+def record_class(table_name: str, columns: tuple[str, ...]) -> type:
+    # One class per table layout, shared by every dataset that loads it, e.g.
+    # "enroute_waypoint" becomes EnrouteWaypoint. Column names that are not
+    # valid field names are renamed to _0, _1, etc.
+    class_name = "".join(part.capitalize() for part in table_name.split("_"))
+    return namedtuple(class_name or "Record", columns, rename=True)
+
 
-    def add_row(self, _, table_name: str, values: list[str]) -> None:
-        values = [v.replace("'", "''") for v in values]
-        values_joined = ", ".join([f"'{v.rstrip()}'" for v in values])
-        sql = f"INSERT INTO {table_name} VALUES ({values_joined});"
-        self.cursor.executescript(sql)
+def copy_value(value) -> str:
+    # Escapes a value for PostgreSQL's COPY text format.
+    if value is None:
+        return "\\N"
+    if not isinstance(value, str):
+        return str(value)
+    return (
+        value.rstrip()
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
 
 
 def get_db(configs: UserConfigs) -> DbConfig:
@@ -103,5 +674,7 @@ def get_db(configs: UserConfigs) -> DbConfig:
         return PostgresDb(configs)
     elif configs.dbtype == "sqlite":
         return SqliteDb(configs)
+    elif configs.dbtype == "parquet":
+        return ParquetDb(configs)
     else:
         raise ValueError(f"Unsupported database type: {configs.dbtype}")
@@ -0,0 +1,258 @@
+from collections.abc import Iterator
+import heapq
+from pyarinc424.airways import (
+    AIRWAY_FIX_TABLES,
+    AIRWAY_TABLE,
+    AirwayGraph,
+    build_graph,
+)
+from pyarinc424.arinc import ArincParser
+from pyarinc424.database import MemoryDb
+from pyarinc424.procedures import PROCEDURE_TABLES, Procedure, assemble
+from pyarinc424.spatial import SpatialIndex
+
+# Identifier and ICAO code columns of the tables that hold fixes, used to look
+# up a fix by name across all of them.
+FIX_TABLES = {
+    "airport": ("Airport_Identifier", "ICAO_Code"),
+    "enroute_waypoint": ("Waypoint_Identifier", "ICAO_Code_2"),
+    "terminal_waypoint": ("Waypoint_Identifier", "ICAO_Code_2"),
+    "vhf_navaid": ("VOR_Identifier", "ICAO_Code_2"),
+    "ndb_navaid": ("NDB_Identifier", "ICAO_Code_2"),
+    "terminal_navaid": ("NDB_Identifier", "ICAO_Code_2"),
+}
+
+
+class Table:
+    def __init__(
+        self,
+        name: str,
+        columns: list[str],
+        rows: list[tuple],
+        record_type: type | None = None,
+        position: tuple[str, str] | None = None,
+    ) -> None:
+        self.name = name
+        self.columns = columns
+        self.rows = rows
+        # Generated namedtuple class of the rows, if they were built with one.
+        self.record_type = record_type
+        # Decoded latitude and longitude columns, if the table has a position.
+        self.position = position
+        self.positions = {c: i for i, c in enumerate(columns)}
+        self.lookups: dict[tuple[str, ...], dict[tuple, list[tuple]]] = {}
+        self.spatial: SpatialIndex | None = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self.rows)
+
+    def lookup(self, columns: tuple[str, ...]) -> dict[tuple, list[tuple]]:
+        # Hash indexes are built the first time a combination of columns is
+        # queried and reused afterwards.
+        if columns not in self.lookups:
+            positions = [self.positions[c] for c in columns]
+            lookup: dict[tuple, list[tuple]] = {}
+            for row in self.rows:
+                lookup.setdefault(tuple(row[i] for i in positions), []).append(row)
+            self.lookups[columns] = lookup
+        return self.lookups[columns]
+
+    def find(self, **criteria) -> list[tuple]:
+        columns = tuple(sorted(criteria))
+        return self.lookup(columns).get(tuple(criteria[c] for c in columns), [])
+
+    def get(self, **criteria) -> tuple | None:
+        rows = self.find(**criteria)
+        return rows[0] if rows else None
+
+    def spatial_index(self) -> SpatialIndex:
+        # Like lookups, the spatial index is built on the first query.
+        if self.position is None:
+            raise ValueError(
+                f"Table {self.name} has no decoded position; load with typed=True"
+            )
+        if self.spatial is None:
+            lat, lon = (self.positions[c] for c in self.position)
+            self.spatial = SpatialIndex(
+                (row[lat], row[lon], row)
+                for row in self.rows
+                if row[lat] is not None and row[lon] is not None
+            )
+        return self.spatial
+
+    def nearest(
+        self, latitude: float, longitude: float, count: int = 1
+    ) -> list[tuple[float, tuple]]:
+        # Returns (distance in NM, row) for the closest rows, nearest first.
+        return self.spatial_index().nearest(latitude, longitude, count)
+
+    def within(
+        self, latitude: float, longitude: float, radius: float
+    ) -> list[tuple[float, tuple]]:
+        # Returns (distance in NM, row) for rows within `radius` NM.
+        return self.spatial_index().within(latitude, longitude, radius)
+
+    def value(self, row: tuple, column: str):
+        return row[self.positions[column]]
+
+    def as_dict(self, row: tuple) -> dict:
+        return dict(zip(self.columns, row))
+
+
+class Dataset:
+    def __init__(self, cycle: str | None, tables: dict[str, Table]) -> None:
+        self.cycle = cycle
+        self.tables = tables
+        self.assembled: dict[str, dict[tuple, Procedure]] = {}
+        self.airport_index: dict[str, dict[str, dict[str, Procedure]]] = {}
+        self.graph: AirwayGraph | None = None
+
+    def __getitem__(self, name: str) -> Table:
+        return self.tables[name]
+
+    def __getattr__(self, name: str) -> Table:
+        try:
+            return self.__dict__["tables"][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def fixes(
+        self, identifier: str, icao_code: str | None = None
+    ) -> list[tuple[str, tuple]]:
+        # Returns (table name, row) for every fix with the identifier.
+        matches: list[tuple[str, tuple]] = []
+        for name, (ident_column, icao_column) in FIX_TABLES.items():
+            if name not in self.tables:
+                continue
+            criteria = {ident_column: identifier}
+            if icao_code is not None:
+                criteria[icao_column] = icao_code
+            matches.extend((name, row) for row in self.tables[name].find(**criteria))
+        return matches
+
+    def nearest_fixes(
+        self, latitude: float, longitude: float, count: int = 10
+    ) -> list[tuple[float, str, tuple]]:
+        # Returns (distance in NM, table name, row) for the closest fixes
+        # across all fix tables, nearest first.
+        matches = [
+            (distance, name, row)
+            for name, table in self.fix_tables()
+            for distance, row in table.nearest(latitude, longitude, count)
+        ]
+        return heapq.nsmallest(count, matches, key=lambda match: match[0])
+
+    def fixes_within(
+        self, latitude: float, longitude: float, radius: float
+    ) -> list[tuple[float, str, tuple]]:
+        # Returns (distance in NM, table name, row) for every fix within
+        # `radius` NM, nearest first.
+        matches = [
+            (distance, name, row)
+            for name, table in self.fix_tables()
+            for distance, row in table.within(latitude, longitude, radius)
+        ]
+        return sorted(matches, key=lambda match: match[0])
+
+    def fix_tables(self) -> list[tuple[str, Table]]:
+        return [(name, self.tables[name]) for name in FIX_TABLES if name in self.tables]
+
+    def procedures(self, kind: str = "approach") -> dict[tuple, Procedure]:
+        # Returns the procedures of one procedure table ("sid", "star",
+        # "approach" or "heli_approach") keyed on (airport, ICAO code,
+        # procedure identifier). They are assembled the first time a table is
+        # queried and reused afterwards.
+        if kind not in PROCEDURE_TABLES:
+            raise ValueError(
+                f"Procedure kind must be one of: {', '.join(PROCEDURE_TABLES)}"
+            )
+        if kind not in self.assembled:
+            table = self.tables[kind]
+            cont_table = self.tables.get(PROCEDURE_TABLES[kind][1] or "")
+            self.assembled[kind] = assemble(
+                kind,
+                table.columns,
+                table.rows,
+                cont_table.columns if cont_table else None,
+                cont_table.rows if cont_table else (),
+            )
+            by_airport: dict[str, dict[str, Procedure]] = {}
+            for procedure in self.assembled[kind].values():
+                airport = by_airport.setdefault(procedure.airport, {})
+                airport[procedure.identifier] = procedure
+            self.airport_index[kind] = by_airport
+        return self.assembled[kind]
+
+    def procedure(
+        self, airport: str, identifier: str, kind: str = "approach"
+    ) -> Procedure | None:
+        # Returns one procedure of an airport or heliport by identifier.
+        return self.airport_procedures(airport, kind).get(identifier)
+
+    def airport_procedures(
+        self, airport: str, kind: str = "approach"
+    ) -> dict[str, Procedure]:
+        # Returns an airport's procedures keyed on procedure identifier.
+        self.procedures(kind)
+        return self.airport_index[kind].get(airport, {})
+
+    def airway_graph(self) -> AirwayGraph:
+        # The graph of enroute airways, built the first time it is used.
+        if self.graph is None:
+            names = [AIRWAY_TABLE] + [name for name, _, _ in AIRWAY_FIX_TABLES.values()]
+            self.graph = build_graph(
+                {
+                    name: (self.tables[name].columns, self.tables[name].rows)
+                    for name in names
+                    if name in self.tables
+                }
+            )
+        return self.graph
+
+    def airport_records(self, identifier: str, table: str = "airport") -> list[tuple]:
+        # Returns the rows of an airport table belonging to one airport.
+        return self.tables[table].find(Airport_Identifier=identifier)
+
+
+def load(
+    file: str,
+    typed: bool = False,
+    reader: str = "text",
+    workers: int = 1,
+    cache_dir: str | None = None,
+    bbox: tuple[float, float, float, float] | None = None,
+    progress: bool | None = None,
+    procedures: bool = False,
+    airways: bool = False,
+) -> Dataset:
+    db = MemoryDb()
+    with db.connect():
+        parser = ArincParser(
+            db,
+            file,
+            reader=reader,
+            workers=workers,
+            typed=typed,
+            indexes=True,
+            cache_dir=cache_dir,
+            bbox=bbox,
+            progress=progress,
+            procedures=procedures,
+            airways=airways,
+        )
+        parser.parse()
+
+    tables = {
+        name: Table(
+            name,
+            db.columns[name],
+            rows,
+            db.record_types[name],
+            db.positions.get(name),
+        )
+        for name, rows in db.tables.items()
+    }
+    return Dataset(db.cycle, tables)
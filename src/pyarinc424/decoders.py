@@ -0,0 +1,134 @@
+# Decoders for the typed column values declared in record_maps.
+#
+# Every decoder takes the raw fixed-width field and returns None when the field
+# is blank or cannot be decoded.
+
+from collections.abc import Callable
+
+
+def decode_text(value: str) -> str:
+    return value.rstrip()
+
+
+def decode_integer(value: str) -> int | None:
+    value = value.strip()
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def decode_real(value: str) -> float | None:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def decode_altitude(value: str) -> int | None:
+    # Altitudes are in feet, or hundreds of feet when given as a flight level.
+    value = value.strip()
+    if value.startswith("FL"):
+        level = decode_integer(value[2:])
+        return level * 100 if level is not None else None
+    if value == "GND":
+        return 0
+    return decode_integer(value)
+
+
+def decode_coordinate(value: str, degree_digits: int) -> float | None:
+    # Coordinates are a hemisphere letter followed by degrees, minutes and
+    # seconds, e.g. N39513881 (N 39° 51' 38.81"). Fields may be truncated to
+    # whole degrees or extended with more decimal places of seconds.
+    value = value.strip()
+    if len(value) < degree_digits + 1 or value[0] not in "NSEW":
+        return None
+    digits = value[1:]
+    if not digits.isdigit():
+        return None
+
+    degrees = int(digits[:degree_digits])
+    minutes = int(digits[degree_digits : degree_digits + 2] or 0)
+    seconds = digits[degree_digits + 2 :]
+    if seconds:
+        seconds_value = float(f"{seconds[:2]}.{seconds[2:] or 0}")
+    else:
+        seconds_value = 0.0
+
+    result = degrees + minutes / 60 + seconds_value / 3600
+    return -result if value[0] in "SW" else result
+
+
+def decode_latitude(value: str) -> float | None:
+    return decode_coordinate(value, 2)
+
+
+def decode_longitude(value: str) -> float | None:
+    return decode_coordinate(value, 3)
+
+
+# Bounding boxes are (west, south, east, north) in decimal degrees.
+BBox = tuple[float, float, float, float]
+
+
+def in_bbox(bbox: BBox, latitude: float | None, longitude: float | None) -> bool:
+    # Points without a decodable position are kept. A box whose west edge is
+    # east of its east edge crosses the antimeridian.
+    if latitude is None or longitude is None:
+        return True
+    west, south, east, north = bbox
+    if not south <= latitude <= north:
+        return False
+    if west <= east:
+        return west <= longitude <= east
+    return longitude >= west or longitude <= east
+
+
+def decode_magnetic_variation(value: str) -> float | None:
+    # E0080 is 8.0 degrees east; west variation is negative.
+    value = value.strip()
+    tenths = decode_integer(value[1:])
+    if not value or tenths is None:
+        return None
+    return -tenths / 10 if value[0] == "W" else tenths / 10
+
+
+def decode_vhf_frequency(value: str) -> float | None:
+    # VHF frequencies are in tens of kHz, e.g. 11630 is 116.30 MHz.
+    hundredths = decode_integer(value)
+    return hundredths / 100 if hundredths is not None else None
+
+
+def decode_ndb_frequency(value: str) -> float | None:
+    # NDB frequencies are in tenths of kHz, e.g. 03620 is 362.0 kHz.
+    tenths = decode_integer(value)
+    return tenths / 10 if tenths is not None else None
+
+
+# Number of degree digits of each coordinate column type.
+COORDINATE_DIGITS: dict[str, int] = {"latitude": 2, "longitude": 3}
+
+DECODERS: dict[str, Callable[[str], str | int | float | None]] = {
+    "text": decode_text,
+    "integer": decode_integer,
+    "real": decode_real,
+    "altitude": decode_altitude,
+    "latitude": decode_latitude,
+    "longitude": decode_longitude,
+    "magnetic_variation": decode_magnetic_variation,
+    "vhf_frequency": decode_vhf_frequency,
+    "ndb_frequency": decode_ndb_frequency,
+}
+
+# Storage class for each column type, mapped to a concrete type by each backend.
+STORAGE_TYPES: dict[str, str] = {
+    "text": "text",
+    "integer": "integer",
+    "real": "real",
+    "altitude": "integer",
+    "latitude": "real",
+    "longitude": "real",
+    "magnetic_variation": "real",
+    "vhf_frequency": "real",
+    "ndb_frequency": "real",
+}
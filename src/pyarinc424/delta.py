@@ -0,0 +1,90 @@
+import json
+from pyarinc424.database import clean_value
+
+# Columns that do not take part in a record's identity or content, as they
+# change whenever records are added or removed elsewhere in the file.
+IGNORED_COLUMNS = ["File_Record_Number"]
+
+
+class TableDelta:
+    def __init__(self) -> None:
+        self.inserts: list[list] = []
+        self.deletes: list[tuple] = []
+        self.inserted = 0
+        self.updated = 0
+        self.deleted = 0
+        self.unchanged = 0
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "deleted": self.deleted,
+            "unchanged": self.unchanged,
+        }
+
+
+def identity_columns(columns: list[str], key: list[str]) -> list[str]:
+    # Records are identified by their key columns or, without a key, by their
+    # whole content.
+    return key or [c for c in columns if c not in IGNORED_COLUMNS]
+
+
+def diff_rows(
+    columns: list[str], key: list[str], old_rows: list, new_rows: list
+) -> TableDelta:
+    # Keys are not guaranteed to be unique, so all rows sharing a key are
+    # compared as a group and replaced together when any of them differ.
+    compared = [i for i, c in enumerate(columns) if c not in IGNORED_COLUMNS]
+    key_idx = [columns.index(c) for c in identity_columns(columns, key)]
+
+    def group(rows) -> dict[tuple, list]:
+        groups: dict[tuple, list] = {}
+        for row in rows:
+            row = [clean_value(v) for v in row]
+            groups.setdefault(tuple(row[i] for i in key_idx), []).append(row)
+        return groups
+
+    def content(rows) -> list:
+        return sorted((tuple(row[i] for i in compared) for row in rows), key=repr)
+
+    old_groups = group(old_rows)
+    new_groups = group(new_rows)
+
+    delta = TableDelta()
+    for row_key, rows in new_groups.items():
+        old = old_groups.get(row_key)
+        if old is None:
+            delta.inserts.extend(rows)
+            delta.inserted += len(rows)
+        elif content(old) != content(rows):
+            delta.deletes.append(row_key)
+            delta.inserts.extend(rows)
+            delta.updated += len(rows)
+        else:
+            delta.unchanged += len(rows)
+
+    for row_key, rows in old_groups.items():
+        if row_key not in new_groups:
+            delta.deletes.append(row_key)
+            delta.deleted += len(rows)
+
+    return delta
+
+
+def write_report(report: dict[str, dict[str, int]], path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+
+
+def print_report(report: dict[str, dict[str, int]]) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Changes since the previous load")
+    table.add_column("table")
+    for column in ["inserted", "updated", "deleted", "unchanged"]:
+        table.add_column(column, justify="right")
+    for name, counts in report.items():
+        table.add_row(name, *(str(v) for v in counts.values()))
+    Console().print(table)
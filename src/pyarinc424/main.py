@@ -1,12 +1,45 @@
 from pyarinc424.arinc import ArincParser
 from pyarinc424.config import UserConfigs
 from pyarinc424.database import DbConfig, get_db
+from pyarinc424.delta import print_report, write_report
+from pyarinc424.metrics import write_metrics
+import argparse
 import sys
 
 
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(
+        prog="pyarinc424", description="Parse an ARINC-424 file into a database."
+    )
+    arg_parser.add_argument("config_file", nargs="?", help="path to the config file")
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        help="number of processes used to parse the file (overrides the config)",
+    )
+    arg_parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="swap the previous PostgreSQL schema back in instead of loading",
+    )
+    arg_parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="do not show progress bars (the default when stdout is not a terminal)",
+    )
+    args = arg_parser.parse_args(argv)
+
+    if args.workers is not None and args.workers < 1:
+        arg_parser.error("--workers must be a positive integer")
+
+    return args
+
+
 def main() -> None:
-    if len(sys.argv) > 1:
-        kwargs = {"config_file": sys.argv[1]}
+    args = parse_args(sys.argv[1:])
+
+    if args.config_file:
+        kwargs = {"config_file": args.config_file}
     else:
         kwargs = {}
 
@@ -15,9 +48,35 @@ def main() -> None:
     db: DbConfig = get_db(configs)
 
     with db.connect():
-        parser = ArincParser(db, configs.file_loc)
+        parser = ArincParser(
+            db,
+            configs.file_loc,
+            batch_size=configs.batch_size,
+            reader=configs.reader,
+            workers=args.workers or configs.workers,
+            typed=configs.typed,
+            indexes=configs.indexes,
+            delta=configs.delta,
+            schema=configs.schema,
+            cache_dir=configs.cache_dir,
+            bbox=configs.bbox,
+            procedures=configs.procedures,
+            airways=configs.airways,
+            progress=False if args.quiet else None,
+        )
+        if args.rollback:
+            db.rollback(parser.schema)
+            return
         parser.parse()
 
+    if configs.delta:
+        print_report(parser.delta_report)
+        if configs.delta_report:
+            write_report(parser.delta_report, configs.delta_report)
+
+    if configs.metrics_file:
+        write_metrics(parser.metrics, configs.metrics_file, configs.metrics_format)
+
 
 if __name__ == "__main__":  # pragma: no cover
     main()
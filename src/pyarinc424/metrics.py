@@ -0,0 +1,139 @@
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+import json
+import os
+import time
+
+# Hooks are called with an event name and its data: "flush" after each batch
+# of rows is written to a table and "finish" with the final metrics once the
+# load has been published.
+Hook = Callable[[str, dict], None]
+
+METRICS_FORMATS = ["json", "prometheus"]
+
+TABLE_COUNTERS = {
+    "rows_matched": "Records routed to the table while parsing.",
+    "rows_written": "Rows written to the table.",
+    "bytes": "Bytes of the lines routed to the table.",
+    "insert_seconds": "Time spent writing rows to the table.",
+}
+
+
+class LoadMetrics:
+    def __init__(self, hooks: list[Hook] | None = None) -> None:
+        self.hooks = list(hooks or [])
+        self.cycle: str | None = None
+        self.lines = 0
+        self.bytes = 0
+        self.started = time.time()
+        self.seconds = 0.0
+        self.phases: dict[str, float] = {}
+        self.tables: dict[str, dict[str, float]] = {}
+        # Time spent in phases nested inside each running phase, so that every
+        # phase only counts its own time.
+        self.nested: list[float] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        start = time.perf_counter()
+        self.nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            own = elapsed - self.nested.pop()
+            self.phases[name] = self.phases.get(name, 0.0) + own
+            if self.nested:
+                self.nested[-1] += elapsed
+
+    def table(self, name: str) -> dict[str, float]:
+        if name not in self.tables:
+            self.tables[name] = {counter: 0 for counter in TABLE_COUNTERS}
+        return self.tables[name]
+
+    def scanned(self, lines: int, size: int) -> None:
+        self.lines += lines
+        self.bytes += size
+
+    def matched(self, name: str, rows: int, size: int) -> None:
+        table = self.table(name)
+        table["rows_matched"] += rows
+        table["bytes"] += size
+
+    @contextmanager
+    def writing(self, name: str, rows: int) -> Generator[None, None, None]:
+        # Times one batch of rows written to a table.
+        start = time.perf_counter()
+        with self.phase("insert"):
+            yield
+        table = self.table(name)
+        table["rows_written"] += rows
+        table["insert_seconds"] += time.perf_counter() - start
+        self.emit("flush", {"table": name, "rows": rows})
+
+    def finish(self) -> None:
+        self.seconds = time.time() - self.started
+        self.emit("finish", self.as_dict())
+
+    def emit(self, event: str, data: dict) -> None:
+        for hook in self.hooks:
+            hook(event, data)
+
+    def as_dict(self) -> dict:
+        return {
+            "cycle": self.cycle,
+            "started": self.started,
+            "seconds": self.seconds,
+            "lines": self.lines,
+            "bytes": self.bytes,
+            "phases": dict(self.phases),
+            "tables": {name: dict(counters) for name, counters in self.tables.items()},
+        }
+
+
+def write_metrics(metrics: LoadMetrics, path: str, format: str = "json") -> None:
+    # Files are replaced atomically so a collector never reads a partial file.
+    if format == "prometheus":
+        content = prometheus_text(metrics)
+    else:
+        content = json.dumps(metrics.as_dict(), indent=2)
+    with open(f"{path}.tmp", "w") as file:
+        file.write(content)
+    os.replace(f"{path}.tmp", path)
+
+
+def prometheus_text(metrics: LoadMetrics) -> str:
+    # Prometheus text exposition format, for the node exporter textfile
+    # collector.
+    cycle = f'cycle="{metrics.cycle or ""}"'
+    lines = []
+
+    def gauge(name: str, help: str, samples: list[tuple[str, float]]) -> None:
+        lines.append(f"# HELP pyarinc424_{name} {help}")
+        lines.append(f"# TYPE pyarinc424_{name} gauge")
+        for labels, value in samples:
+            lines.append(f"pyarinc424_{name}{{{labels}}} {value}")
+
+    gauge(
+        "load_started_timestamp_seconds",
+        "Start of the load.",
+        [(cycle, metrics.started)],
+    )
+    gauge("load_duration_seconds", "Duration of the load.", [(cycle, metrics.seconds)])
+    gauge("lines_scanned", "Lines read from the file.", [(cycle, metrics.lines)])
+    gauge("bytes_scanned", "Bytes read from the file.", [(cycle, metrics.bytes)])
+    gauge(
+        "phase_seconds",
+        "Time spent in each load phase.",
+        [(f'{cycle},phase="{name}"', value) for name, value in metrics.phases.items()],
+    )
+    for counter, help in TABLE_COUNTERS.items():
+        gauge(
+            f"table_{counter}",
+            help,
+            [
+                (f'{cycle},table="{name}"', counters[counter])
+                for name, counters in metrics.tables.items()
+            ],
+        )
+    return "\n".join(lines) + "\n"
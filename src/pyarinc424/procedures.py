@@ -0,0 +1,263 @@
+from collections.abc import Iterable, Sequence
+from operator import itemgetter
+
+# Tables holding the legs of terminal procedures, with the column identifying
+# the airport or heliport and the table holding their continuation records.
+PROCEDURE_TABLES = {
+    "sid": ("Airport_Identifier", None),
+    "star": ("Airport_Identifier", None),
+    "approach": ("Airport_Identifier", "approach_cont"),
+    "heli_approach": ("Heliport_Identifier", "heli_approach_cont"),
+}
+
+# Columns identifying one leg after the airport or heliport identifier.
+LEG_KEY = [
+    "ICAO_Code",
+    "Procedure_Identifier",
+    "Route_Type",
+    "Transition_Identifier",
+    "Sequence_Number",
+]
+
+# Columns of the leg tables that only describe the ARINC record itself and are
+# left out of the assembled procedure_leg table.
+RECORD_COLUMNS = {
+    "Record_Type",
+    "Customer_Area_Code",
+    "Section_Code",
+    "Subsection_Code",
+    "Continuation_Record",
+}
+
+
+# Columns of the procedure table, with one row per assembled procedure.
+PROCEDURE_COLUMNS = [
+    ("Procedure_Type", "text"),
+    ("Airport_Identifier", "text"),
+    ("ICAO_Code", "text"),
+    ("Procedure_Identifier", "text"),
+    ("Transition_Count", "integer"),
+    ("Leg_Count", "integer"),
+    ("Cycle", "text"),
+]
+
+PROCEDURE_KEY = [
+    "Procedure_Type",
+    "Airport_Identifier",
+    "ICAO_Code",
+    "Procedure_Identifier",
+]
+
+
+class Leg:
+    __slots__ = ("row", "continuation")
+
+    def __init__(self, row: Sequence, continuation: Sequence | None = None) -> None:
+        self.row = row
+        # Continuation record of the leg (approach_cont), if it has one.
+        self.continuation = continuation
+
+
+class Transition:
+    def __init__(self, route_type, identifier) -> None:
+        self.route_type = route_type
+        self.identifier = identifier
+        self.legs: list[Leg] = []
+
+    def __len__(self) -> int:
+        return len(self.legs)
+
+
+class Procedure:
+    def __init__(self, kind: str, airport, icao_code, identifier) -> None:
+        self.kind = kind
+        self.airport = airport
+        self.icao_code = icao_code
+        self.identifier = identifier
+        # Transitions in the order they first appear in the file, which for
+        # CIFP is ARINC route type order.
+        self.transitions: list[Transition] = []
+        self.transition_index: dict[tuple, Transition] = {}
+
+    def transition(self, identifier, route_type=None) -> Transition | None:
+        for transition in self.transitions:
+            if transition.identifier == identifier and (
+                route_type is None or transition.route_type == route_type
+            ):
+                return transition
+        return None
+
+    @property
+    def legs(self) -> list[Leg]:
+        return [leg for transition in self.transitions for leg in transition.legs]
+
+
+def key_getter(columns: list[str], airport_column: str) -> itemgetter:
+    return itemgetter(*(columns.index(c) for c in [airport_column, *LEG_KEY]))
+
+
+def sequence_key(position: int):
+    # Blank sequence numbers (None when typed, spaces when not) sort last.
+    def key(leg: Leg) -> tuple:
+        value = leg.row[position]
+        if value is None or isinstance(value, str) and not value.strip():
+            return True, 0
+        return False, value
+
+    return key
+
+
+def assemble(
+    kind: str,
+    columns: list[str],
+    rows: Iterable[Sequence],
+    cont_columns: list[str] | None = None,
+    cont_rows: Iterable[Sequence] = (),
+) -> dict[tuple, Procedure]:
+    # Groups the legs of one procedure table into procedures keyed on
+    # (airport, ICAO code, procedure identifier) in a single pass, joining in
+    # continuation records on the full leg key. Legs are ordered by sequence
+    # number within each transition.
+    airport_column = PROCEDURE_TABLES[kind][0]
+    key = key_getter(columns, airport_column)
+    continuations = {}
+    if cont_columns:
+        cont_key = key_getter(cont_columns, airport_column)
+        continuations = {cont_key(row): row for row in cont_rows}
+
+    procedures: dict[tuple, Procedure] = {}
+    for row in rows:
+        leg_key = key(row)
+        procedure = procedures.get(leg_key[:3])
+        if procedure is None:
+            procedure = Procedure(kind, *leg_key[:3])
+            procedures[leg_key[:3]] = procedure
+        transition = procedure.transition_index.get(leg_key[3:5])
+        if transition is None:
+            transition = Transition(*leg_key[3:5])
+            procedure.transition_index[leg_key[3:5]] = transition
+            procedure.transitions.append(transition)
+        transition.legs.append(Leg(row, continuations.get(leg_key)))
+
+    # Files are normally in sequence order already, which the sort detects in
+    # a single pass.
+    by_sequence = sequence_key(columns.index("Sequence_Number"))
+    for procedure in procedures.values():
+        for transition in procedure.transitions:
+            transition.legs.sort(key=by_sequence)
+    return procedures
+
+
+def leg_columns(columns: list[str], cont_columns: list[str]) -> list[str]:
+    # procedure_leg columns: the procedure type, the leg columns with the
+    # heliport identifier stored as Airport_Identifier, the leg's position in
+    # its transition and the continuation columns not already on the leg.
+    legs = [
+        "Airport_Identifier" if c == "Heliport_Identifier" else c
+        for c in columns
+        if c not in RECORD_COLUMNS
+    ]
+    legs.insert(legs.index("Sequence_Number") + 1, "Leg_Number")
+    extra = [c for c in cont_columns if c not in RECORD_COLUMNS and c not in legs]
+    return ["Procedure_Type", *legs, *extra]
+
+
+def continuation_table(
+    tables: dict[str, tuple[list[str], list[str], list]], kind: str
+) -> tuple[list[str], list[str], list]:
+    # (columns, column types, rows) of the continuation records of a procedure
+    # table, empty when it has none or none were parsed.
+    cont_table = PROCEDURE_TABLES[kind][1]
+    if cont_table is None or cont_table not in tables:
+        return [], [], []
+    return tables[cont_table]
+
+
+def procedure_tables(
+    tables: dict[str, tuple[list[str], list[str], list]], typed: bool = False
+) -> list[tuple[dict, list[list]]]:
+    # Builds the procedure and procedure_leg tables from the parsed (columns,
+    # column types, rows) of the procedure tables and their continuation
+    # tables. Each table is returned as a record map, in the form used by
+    # record_maps.py, with its rows.
+    kinds = [kind for kind in PROCEDURE_TABLES if kind in tables]
+    if not kinds:
+        return []
+    types: dict[str, str] = {"Leg_Number": "integer"}
+    leg_table: list[str] = ["Procedure_Type"]
+    for kind in kinds:
+        columns, column_types, _ = tables[kind]
+        cont_columns, cont_types, _ = continuation_table(tables, kind)
+        types.update(zip(cont_columns, cont_types))
+        types.update(zip(columns, column_types))
+        for column in leg_columns(columns, cont_columns):
+            if column not in leg_table:
+                leg_table.append(column)
+    types["Airport_Identifier"] = "text"
+
+    def number(value: int) -> int | str:
+        return value if typed else str(value)
+
+    procedure_rows = []
+    leg_rows = []
+    for kind in kinds:
+        columns, _, rows = tables[kind]
+        cont_columns, _, cont_rows = continuation_table(tables, kind)
+        procedures = assemble(kind, columns, rows, cont_columns, cont_rows)
+
+        # Each leg is read through one itemgetter over the leg's values, its
+        # continuation values (or blanks) and the values added here.
+        airport_column = PROCEDURE_TABLES[kind][0]
+        positions = {c: i for i, c in enumerate(columns)}
+        positions["Airport_Identifier"] = positions[airport_column]
+        offset = len(columns)
+        for i, column in enumerate(cont_columns):
+            positions.setdefault(column, offset + i)
+        offset += len(cont_columns)
+        positions.update(Procedure_Type=offset, Leg_Number=offset + 1)
+        get = itemgetter(*(positions.get(c, offset + 2) for c in leg_table))
+        blank = (None,) * len(cont_columns)
+        cycle = columns.index("Cycle") if "Cycle" in columns else None
+
+        for procedure in procedures.values():
+            legs = 0
+            for transition in procedure.transitions:
+                for leg_number, leg in enumerate(transition.legs, 1):
+                    values = (
+                        *leg.row,
+                        *(leg.continuation or blank),
+                        kind,
+                        number(leg_number),
+                        None,
+                    )
+                    leg_rows.append(list(get(values)))
+                legs += len(transition)
+            first = procedure.transitions[0].legs[0].row
+            procedure_rows.append(
+                [
+                    kind,
+                    procedure.airport,
+                    procedure.icao_code,
+                    procedure.identifier,
+                    number(len(procedure.transitions)),
+                    number(legs),
+                    first[cycle] if cycle is not None else None,
+                ]
+            )
+
+    procedure_map = {
+        "name": "procedure",
+        "columns": [{"name": c, "type": t} for c, t in PROCEDURE_COLUMNS],
+        "key": PROCEDURE_KEY,
+        "indexes": [["Airport_Identifier", "Procedure_Identifier"]],
+    }
+    leg_map = {
+        "name": "procedure_leg",
+        "columns": [{"name": c, "type": types.get(c, "text")} for c in leg_table],
+        "key": [*PROCEDURE_KEY, "Route_Type", "Transition_Identifier", "Leg_Number"],
+        "indexes": [
+            ["Airport_Identifier", "Procedure_Identifier"],
+            ["Fix_Identifier", "ICAO_Code_2"],
+        ],
+    }
+    return [(procedure_map, procedure_rows), (leg_map, leg_rows)]
@@ -0,0 +1,27 @@
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+import sys
+
+
+class ProgressReporter:
+    # Progress bars are only drawn when enabled, which by default means when
+    # stdout is a terminal. rich is imported the first time a bar is shown, so
+    # headless runs never load it.
+    def __init__(self, enabled: bool | None = None) -> None:
+        self.enabled = sys.stdout.isatty() if enabled is None else enabled
+
+    @contextmanager
+    def task(
+        self, description: str, total: float | None = None
+    ) -> Generator[Callable[[float], None], None, None]:
+        # Yields a function that advances the bar by the given amount. Callers
+        # advance it once per chunk or batch rather than once per line.
+        if not self.enabled:
+            yield lambda advance: None
+            return
+
+        from rich.progress import Progress
+
+        with Progress() as progress:
+            task = progress.add_task(description.rjust(26), total=total)
+            yield lambda advance: progress.update(task, advance=advance)
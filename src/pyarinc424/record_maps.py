@@ -1,4 +1,9 @@
 # Store of mappings of each ARINC-424 record in FAA CIFP output.
+#
+# "key" lists the columns that identify a record (its natural key) and
+# "indexes" lists additional lookup indexes. Both are built once a table has
+# been loaded. "position" names the latitude and longitude columns of records
+# that describe a single point, used to filter records by [loader] bbox.
 
 record_maps = [  # pragma: no cover
     {
@@ -9,6 +14,9 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 21,
         "cont_rec_vals": ["0", "1"],
+        "key": ["Airport_Identifier", "ICAO_Code"],
+        "indexes": [["ATA__IATA_Designator"]],
+        "position": ["Latitude", "Longitude"],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -49,6 +57,18 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 38,
         "cont_rec_vals": ["0", "1"],
+        "key": [
+            "Airport_Identifier",
+            "ICAO_Code",
+            "Procedure_Identifier",
+            "Route_Type",
+            "Transition_Identifier",
+            "Sequence_Number",
+        ],
+        "indexes": [
+            ["Airport_Identifier", "Procedure_Identifier"],
+            ["Fix_Identifier", "ICAO_Code_2"],
+        ],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -107,6 +127,15 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 38,
         "cont_rec_vals": ["2"],
+        "key": [
+            "Airport_Identifier",
+            "ICAO_Code",
+            "Procedure_Identifier",
+            "Route_Type",
+            "Transition_Identifier",
+            "Sequence_Number",
+        ],
+        "indexes": [["Airport_Identifier", "Procedure_Identifier"]],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -144,6 +173,14 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 5,
         "cont_rec_pos": 24,
         "cont_rec_vals": ["0", "1"],
+        "key": [
+            "ICAO_Code",
+            "Airspace_Type",
+            "Airspace_Center",
+            "Multiple_Code",
+            "Sequence_Number",
+        ],
+        "indexes": [["Airspace_Center"]],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -186,6 +223,8 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 5,
         "cont_rec_pos": 38,
         "cont_rec_vals": ["0", "1"],
+        "key": ["Route_Identifier", "Sixth_Character", "Sequence_Number"],
+        "indexes": [["Fix_Identifier", "ICAO_Code"]],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -229,6 +268,9 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 5,
         "cont_rec_pos": 21,
         "cont_rec_vals": ["0", "1"],
+        "key": ["Waypoint_Identifier", "ICAO_Code_2", "Region_Code"],
+        "indexes": [],
+        "position": ["Latitude", "Longitude"],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -261,6 +303,8 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 5,
         "cont_rec_pos": None,
         "cont_rec_vals": None,
+        "key": ["Start_Latitude", "Start_Longitude"],
+        "indexes": [],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 4, "end": 5, "name": "Section_Code"},
@@ -309,6 +353,18 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 38,
         "cont_rec_vals": ["0", "1"],
+        "key": [
+            "Heliport_Identifier",
+            "ICAO_Code",
+            "Procedure_Identifier",
+            "Route_Type",
+            "Transition_Identifier",
+            "Sequence_Number",
+        ],
+        "indexes": [
+            ["Heliport_Identifier", "Procedure_Identifier"],
+            ["Fix_Identifier", "ICAO_Code_2"],
+        ],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -367,6 +423,15 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 38,
         "cont_rec_vals": ["2"],
+        "key": [
+            "Heliport_Identifier",
+            "ICAO_Code",
+            "Procedure_Identifier",
+            "Route_Type",
+            "Transition_Identifier",
+            "Sequence_Number",
+        ],
+        "indexes": [["Heliport_Identifier", "Procedure_Identifier"]],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -404,6 +469,8 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 38,
         "cont_rec_vals": ["0", "1"],
+        "key": ["Heliport_Identifier", "ICAO_Code", "MSA_Center", "Multiple_Code"],
+        "indexes": [],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -451,6 +518,14 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 21,
         "cont_rec_vals": ["0", "1"],
+        "key": [
+            "Heliport_Identifier",
+            "ICAO_Code",
+            "Waypoint_Identifier",
+            "ICAO_Code_2",
+        ],
+        "indexes": [["Waypoint_Identifier", "ICAO_Code_2"]],
+        "position": ["Latitude", "Longitude"],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -482,6 +557,9 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 21,
         "cont_rec_vals": ["0", "1"],
+        "key": ["Heliport_Identifier", "ICAO_Code", "Pad_Identifier"],
+        "indexes": [],
+        "position": ["Latitude", "Longitude"],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -522,6 +600,9 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 21,
         "cont_rec_vals": ["0", "1"],
+        "key": ["Airport_Identifier", "Localizer_Identifier"],
+        "indexes": [["Localizer_Identifier"]],
+        "position": ["Localizer_Latitude", "Localizer_Longitude"],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -558,6 +639,8 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 38,
         "cont_rec_vals": ["0", "1"],
+        "key": ["Airport_Identifier", "ICAO_Code", "MSA_Center", "Multiple_Code"],
+        "indexes": [],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -605,6 +688,9 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 5,
         "cont_rec_pos": 21,
         "cont_rec_vals": ["0", "1"],
+        "key": ["NDB_Identifier", "ICAO_Code_2", "Airport_Identifier"],
+        "indexes": [],
+        "position": ["NDB_Latitude", "NDB_Longitude"],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -634,6 +720,15 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 26,
         "cont_rec_vals": ["0", "1"],
+        "key": [
+            "Airport_Identifier",
+            "ICAO_Code",
+            "Approach_Identifier",
+            "Runway_or_Helipad_Identifier",
+            "Operations_Type",
+        ],
+        "indexes": [],
+        "position": ["LTP_Latitude", "LTP_Longitude"],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -685,6 +780,14 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 26,
         "cont_rec_vals": ["2"],
+        "key": [
+            "Airport_Identifier",
+            "ICAO_Code",
+            "Approach_Identifier",
+            "Runway_or_Helipad_Identifier",
+            "Operations_Type",
+        ],
+        "indexes": [],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -716,6 +819,14 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 5,
         "cont_rec_pos": 24,
         "cont_rec_vals": ["0", "1"],
+        "key": [
+            "ICAO_Code",
+            "Restriction_Type",
+            "Designation",
+            "Multiple_Code",
+            "Sequence_Number",
+        ],
+        "indexes": [["Designation"]],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -754,6 +865,14 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 5,
         "cont_rec_pos": 24,
         "cont_rec_vals": ["2"],
+        "key": [
+            "ICAO_Code",
+            "Restriction_Type",
+            "Designation",
+            "Multiple_Code",
+            "Sequence_Number",
+        ],
+        "indexes": [["Designation"]],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -789,6 +908,9 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 21,
         "cont_rec_vals": ["0", "1"],
+        "key": ["Airport_Identifier", "ICAO_Code", "Runway_Identifier"],
+        "indexes": [],
+        "position": ["Latitude", "Longitude"],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -832,6 +954,18 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 38,
         "cont_rec_vals": ["0", "1"],
+        "key": [
+            "Airport_Identifier",
+            "ICAO_Code",
+            "Procedure_Identifier",
+            "Route_Type",
+            "Transition_Identifier",
+            "Sequence_Number",
+        ],
+        "indexes": [
+            ["Airport_Identifier", "Procedure_Identifier"],
+            ["Fix_Identifier", "ICAO_Code_2"],
+        ],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -890,6 +1024,18 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 38,
         "cont_rec_vals": ["0", "1"],
+        "key": [
+            "Airport_Identifier",
+            "ICAO_Code",
+            "Procedure_Identifier",
+            "Route_Type",
+            "Transition_Identifier",
+            "Sequence_Number",
+        ],
+        "indexes": [
+            ["Airport_Identifier", "Procedure_Identifier"],
+            ["Fix_Identifier", "ICAO_Code_2"],
+        ],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -948,6 +1094,9 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 5,
         "cont_rec_pos": 21,
         "cont_rec_vals": ["0", "1"],
+        "key": ["Airport_Identifier", "ICAO_Code", "NDB_Identifier", "ICAO_Code_2"],
+        "indexes": [["NDB_Identifier", "ICAO_Code_2"]],
+        "position": ["NDB_Latitude", "NDB_Longitude"],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -977,6 +1126,14 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 12,
         "cont_rec_pos": 21,
         "cont_rec_vals": ["0", "1"],
+        "key": [
+            "Airport_Identifier",
+            "ICAO_Code",
+            "Waypoint_Identifier",
+            "ICAO_Code_2",
+        ],
+        "indexes": [["Waypoint_Identifier", "ICAO_Code_2"]],
+        "position": ["Latitude", "Longitude"],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -1008,6 +1165,9 @@ record_maps = [  # pragma: no cover
         "subsection_pos": 5,
         "cont_rec_pos": 21,
         "cont_rec_vals": ["0", "1"],
+        "key": ["VOR_Identifier", "ICAO_Code_2", "Airport_Identifier"],
+        "indexes": [["DME_Identifier"]],
+        "position": ["VOR_Latitude", "VOR_Longitude"],
         "columns": [
             {"id": 1, "start": 0, "end": 1, "name": "Record_Type"},
             {"id": 2, "start": 1, "end": 4, "name": "Customer_Area_Code"},
@@ -1037,3 +1197,56 @@ record_maps = [  # pragma: no cover
         ],
     },
 ]
+
+# Types of columns decoded when loading with [loader] typed = yes, keyed by
+# column name. Columns not listed here (or given their own "type" key in a
+# record map) are loaded as text. See decoders.py for the available types.
+column_types = {  # pragma: no cover
+    "Latitude": "latitude",
+    "Longitude": "longitude",
+    "Arc_Origin_Latitude": "latitude",
+    "Arc_Origin_Longitude": "longitude",
+    "DME_Latitude": "latitude",
+    "DME_Longitude": "longitude",
+    "FPAP_Latitude": "latitude",
+    "FPAP_Longitude": "longitude",
+    "Glide_Slope_Latitude": "latitude",
+    "Glide_Slope_Longitude": "longitude",
+    "Localizer_Latitude": "latitude",
+    "Localizer_Longitude": "longitude",
+    "LTP_Latitude": "latitude",
+    "LTP_Longitude": "longitude",
+    "NDB_Latitude": "latitude",
+    "NDB_Longitude": "longitude",
+    "Start_Latitude": "latitude",
+    "Start_Longitude": "longitude",
+    "VOR_Latitude": "latitude",
+    "VOR_Longitude": "longitude",
+    "Magnetic_Variation": "magnetic_variation",
+    "Dynamic_Magnetic_Variation": "magnetic_variation",
+    "Station_Declination": "magnetic_variation",
+    "VOR_Frequency": "vhf_frequency",
+    "Localizer_Frequency": "vhf_frequency",
+    "NDB_Frequency": "ndb_frequency",
+    "Altitude_1": "altitude",
+    "Altitude_2": "altitude",
+    "Transition_Altitude": "altitude",
+    "Transition_Level": "altitude",
+    "Speed_Limit_Altitude": "altitude",
+    "Minimum_Altitude_1": "altitude",
+    "Minimum_Altitude_2": "altitude",
+    "Maximum_Altitude": "altitude",
+    # Airspace Lower_Limit and Upper_Limit stay text: besides altitudes they
+    # hold UNLTD, MSL and NOTSP, which have no integer value that could not be
+    # mistaken for a real altitude or a blank field.
+    "Elevation": "integer",
+    "DME_Elevation": "integer",
+    "Glide_Slope_Elevation": "integer",
+    "Landing_Threshold_Elevation": "integer",
+    "Runway_Length": "integer",
+    "Longest_Runway": "integer",
+    "Sequence_Number": "integer",
+    "Speed_Limit": "integer",
+    **{f"MORA_{i}": "integer" for i in range(1, 31)},
+    **{f"Sector_Altitude_{i}": "integer" for i in range(1, 8)},
+}
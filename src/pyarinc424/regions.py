@@ -0,0 +1,109 @@
+from collections.abc import Callable
+from pyarinc424.airways import AIRWAY_FIX_TABLES, AIRWAY_TABLE, text
+
+# Airports and heliports are matched on their identifier alone, which is
+# unique without the ICAO code and is all a localizer record carries.
+PARENT_TABLES = {
+    "airport": ["Airport_Identifier"],
+    "heliport": ["Heliport_Identifier"],
+    **{name: [ident, icao] for name, ident, icao in AIRWAY_FIX_TABLES.values()},
+}
+
+# Tables whose records belong to an airport or heliport.
+DEPENDENT_TABLES = {
+    **dict.fromkeys(
+        [
+            "approach",
+            "approach_cont",
+            "localizer",
+            "msa",
+            "pathpoint",
+            "pathpoint_cont",
+            "runway",
+            "sid",
+            "star",
+            "terminal_navaid",
+            "terminal_waypoint",
+        ],
+        "airport",
+    ),
+    **dict.fromkeys(
+        [
+            "heli_approach",
+            "heli_approach_cont",
+            "heli_msa",
+            "heli_terminal_waypoint",
+        ],
+        "heliport",
+    ),
+}
+
+# A parent is identified by (table, key values).
+Parent = tuple[str, tuple]
+
+
+def key_getter(columns: list[str], names: list[str]) -> Callable[[list], tuple]:
+    indexes = [columns.index(c) for c in names]
+    return lambda values: tuple(text(values[i]) or "" for i in indexes)
+
+
+class RegionFilter:
+    # Extends the bbox filter of records with a position to the records that
+    # belong to one: procedures, runways and the other airport and heliport
+    # records are kept only when their airport or heliport was kept, and
+    # airway fixes only when the waypoint or navaid they name was. Parents
+    # come before their records in the file, so rows must be passed in file
+    # order, with parent tables first among rows that arrive together.
+    # Records whose parent key is blank or whose parent table is not loaded
+    # are kept.
+    def __init__(self, tables: dict[str, list[str]]):
+        self.kept: dict[str, set[tuple]] = {}
+        self.parent_keys: dict[str, Callable[[list], tuple]] = {}
+        for name, names in PARENT_TABLES.items():
+            if name in tables:
+                self.kept[name] = set()
+                self.parent_keys[name] = key_getter(tables[name], names)
+
+        self.parents: dict[str, Callable[[list], Parent | None]] = {}
+        for name, parent in DEPENDENT_TABLES.items():
+            if name in tables and parent in self.kept:
+                self.parents[name] = self.parent_record(parent, tables[name])
+        if AIRWAY_TABLE in tables:
+            self.parents[AIRWAY_TABLE] = self.airway_fix(tables[AIRWAY_TABLE])
+
+    def parent_record(
+        self, parent: str, columns: list[str]
+    ) -> Callable[[list], Parent | None]:
+        get_key = key_getter(columns, PARENT_TABLES[parent][:1])
+        return lambda values: (parent, get_key(values))
+
+    def airway_fix(self, columns: list[str]) -> Callable[[list], Parent | None]:
+        get_table = key_getter(columns, ["Section_Code_2", "Subsection_Code_2"])
+        get_key = key_getter(columns, ["Fix_Identifier", "ICAO_Code"])
+
+        def parent(values: list) -> Parent | None:
+            table = AIRWAY_FIX_TABLES.get(get_table(values))
+            if table is None or table[0] not in self.kept:
+                return None
+            return table[0], get_key(values)
+
+        return parent
+
+    def keep(self, name: str, values: list) -> bool:
+        # Called with each row that passed the bbox filter of its own table.
+        get_parent = self.parents.get(name)
+        if get_parent is not None:
+            parent = get_parent(values)
+            if parent is not None and any(parent[1]):
+                table, key = parent
+                if key not in self.kept[table]:
+                    return False
+        get_key = self.parent_keys.get(name)
+        if get_key is not None:
+            self.kept[name].add(get_key(values))
+        return True
+
+    def filter(self, name: str, rows: list[list]) -> list[list]:
+        if name not in self.parents and name not in self.parent_keys:
+            return rows
+        return [values for values in rows if self.keep(name, values)]
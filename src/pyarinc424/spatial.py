@@ -0,0 +1,113 @@
+from collections.abc import Iterable
+import heapq
+import math
+from typing import Any
+
+EARTH_RADIUS_NM = 3440.065
+
+Point = tuple[float, float, float]
+
+# Nodes of the tree are (point, item, axis, left, right) tuples.
+Node = tuple[Point, object, int, "Node | None", "Node | None"]
+
+
+def unit_vector(latitude: float, longitude: float) -> Point:
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    return (
+        math.cos(lat) * math.cos(lon),
+        math.cos(lat) * math.sin(lon),
+        math.sin(lat),
+    )
+
+
+def chord_to_nm(chord: float) -> float:
+    return 2 * math.asin(min(chord / 2, 1.0)) * EARTH_RADIUS_NM
+
+
+def nm_to_chord(distance: float) -> float:
+    return 2 * math.sin(min(distance / EARTH_RADIUS_NM, math.pi) / 2)
+
+
+class SpatialIndex:
+    # A static k-d tree over points on the unit sphere. Straight-line (chord)
+    # distance between unit vectors grows with great-circle distance, so the
+    # tree answers nearest and radius queries without special cases at the
+    # poles or the antimeridian.
+    def __init__(self, points: Iterable[tuple[float, float, object]]) -> None:
+        nodes = [(unit_vector(lat, lon), item) for lat, lon, item in points]
+        self.size = len(nodes)
+        self.root = self.build(nodes, 0)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @classmethod
+    def build(cls, nodes: list[tuple[Point, object]], depth: int) -> Node | None:
+        if not nodes:
+            return None
+        axis = depth % 3
+        nodes.sort(key=lambda node: node[0][axis])
+        middle = len(nodes) // 2
+        point, item = nodes[middle]
+        return (
+            point,
+            item,
+            axis,
+            cls.build(nodes[:middle], depth + 1),
+            cls.build(nodes[middle + 1 :], depth + 1),
+        )
+
+    def nearest(
+        self, latitude: float, longitude: float, count: int = 1
+    ) -> list[tuple[float, Any]]:
+        # Returns up to `count` (distance in NM, item) pairs, nearest first.
+        if count < 1:
+            return []
+        target = unit_vector(latitude, longitude)
+        best: list[tuple[float, int, object]] = []
+        # Each subtree is paired with a lower bound on its distance, checked
+        # once it is popped so that the nearest side is searched first.
+        stack: list[tuple[Node | None, float]] = [(self.root, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if node is None or (len(best) == count and bound >= -best[0][0]):
+                continue
+            point, item, axis, left, right = node
+            distance = math.dist(point, target)
+            if len(best) < count:
+                heapq.heappush(best, (-distance, id(item), item))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, id(item), item))
+
+            offset = target[axis] - point[axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            stack.append((far, abs(offset)))
+            stack.append((near, bound))
+
+        return [(chord_to_nm(-d), item) for d, _, item in sorted(best, reverse=True)]
+
+    def within(
+        self, latitude: float, longitude: float, radius: float
+    ) -> list[tuple[float, Any]]:
+        # Returns every (distance in NM, item) pair within `radius` NM,
+        # nearest first.
+        target = unit_vector(latitude, longitude)
+        limit = nm_to_chord(radius)
+        found = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            point, item, axis, left, right = node
+            distance = math.dist(point, target)
+            if distance <= limit:
+                found.append((distance, id(item), item))
+
+            offset = target[axis] - point[axis]
+            if offset - limit <= 0:
+                stack.append(left)
+            if offset + limit >= 0:
+                stack.append(right)
+
+        return [(chord_to_nm(d), item) for d, _, item in sorted(found)]
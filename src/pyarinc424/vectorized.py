@@ -0,0 +1,157 @@
+import numpy as np  # type: ignore
+from pyarinc424.decoders import COORDINATE_DIGITS, DECODERS, BBox, decode_coordinate
+
+NEWLINE = ord("\n")
+CARRIAGE_RETURN = ord("\r")
+SPACE = ord(" ")
+ZERO = ord("0")
+HEMISPHERES = [ord(h) for h in "NSEW"]
+NEGATIVE_HEMISPHERES = [ord(h) for h in "SW"]
+
+
+def read_array(file: str) -> np.ndarray:
+    # Every line of an ARINC 424 file has the same length, so the whole file
+    # can be viewed as a (lines, width) array of bytes without copying.
+    data = np.fromfile(file, dtype=np.uint8)
+    if not data.size:
+        return np.empty((0, 0), dtype=np.uint8)
+
+    first = np.flatnonzero(data[:65536] == NEWLINE)
+    stride = int(first[0]) + 1 if first.size else data.size + 1
+    if data[-1] != NEWLINE:
+        # The last line may be missing the line ending used by the others.
+        crlf = stride > 1 and first.size and data[stride - 2] == CARRIAGE_RETURN
+        ending = [CARRIAGE_RETURN, NEWLINE] if crlf else [NEWLINE]
+        data = np.append(data, np.array(ending, dtype=np.uint8))
+    if data.size % stride:
+        raise ValueError("The numpy reader requires lines of equal length")
+    lines = data.reshape(-1, stride)
+    if not (lines[:, -1] == NEWLINE).all():
+        raise ValueError("The numpy reader requires lines of equal length")
+
+    width = stride - 1
+    if width and (lines[:, width - 1] == CARRIAGE_RETURN).all():
+        width -= 1
+    return lines[:, :width]
+
+
+def record_mask(
+    lines: np.ndarray,
+    section_pos: int,
+    subsection_pos: int,
+    section: str,
+    subsection: str,
+    cont_rec_pos: int | None = None,
+    cont_rec_vals: list[str] | None = None,
+) -> np.ndarray:
+    # Selects the lines of one record type with boolean masks over the
+    # section, subsection and continuation columns.
+    width = lines.shape[1]
+    positions = [section_pos, subsection_pos]
+    if cont_rec_pos:
+        positions.append(cont_rec_pos)
+    if max(positions) >= width:
+        return np.zeros(len(lines), dtype=bool)
+
+    mask = lines[:, section_pos] == ord(section)
+    mask &= lines[:, subsection_pos] == ord(subsection)
+    if cont_rec_pos:
+        values = [ord(v) for v in cont_rec_vals or []]
+        mask &= np.isin(lines[:, cont_rec_pos], values)
+    return mask
+
+
+def extract_columns(
+    lines: np.ndarray, slices: list[slice], column_types: list[str] | None = None
+) -> list[list]:
+    # Each column is cut out of every selected line at once as a fixed-width
+    # bytes array and decoded in a single call. With column types, latitudes
+    # and longitudes are decoded in one vectorized pass and the other typed
+    # columns value by value.
+    width = lines.shape[1]
+    columns: list[list] = []
+    for i, column in enumerate(slices):
+        column_type = column_types[i] if column_types else "text"
+        if column_type in COORDINATE_DIGITS:
+            values = coordinates(lines[:, column], COORDINATE_DIGITS[column_type])
+            columns.append([None if v != v else v for v in values.tolist()])
+            continue
+
+        start, stop, _ = column.indices(width)
+        size = stop - start
+        if size <= 0:
+            text = [""] * len(lines)
+        else:
+            block = np.ascontiguousarray(lines[:, start:stop]).view(f"S{size}")
+            text = decode_block(block.ravel(), size)
+        if column_type == "text":
+            columns.append(text)
+        else:
+            decode = DECODERS[column_type]
+            columns.append([decode(value) for value in text])
+    return columns
+
+
+def decode_lines(lines: np.ndarray) -> list[str]:
+    # The whole block is decoded in one call and split into lines of equal
+    # width.
+    width = lines.shape[1]
+    if not width:
+        return [""] * len(lines)
+    text = np.ascontiguousarray(lines).tobytes().decode("latin-1")
+    return [text[i : i + width] for i in range(0, len(text), width)]
+
+
+def decode_block(block: np.ndarray, size: int) -> list[str]:
+    # Casting to a unicode array decodes every value in C. The cast only
+    # accepts ASCII, so files with other characters fall back to decoding
+    # each value as latin-1.
+    try:
+        return block.astype(f"U{size}").tolist()
+    except UnicodeDecodeError:
+        return np.char.decode(block, "latin-1").tolist()
+
+
+def coordinates(block: np.ndarray, degree_digits: int) -> np.ndarray:
+    # Decodes a (lines, width) block of coordinate fields such as N39513881 to
+    # signed decimal degrees, with NaN for blank or undecodable fields. Fields
+    # that are not a hemisphere followed by digits across the whole width are
+    # left to decode_coordinate so both give the same result.
+    count, width = block.shape
+    result = np.full(count, np.nan)
+    if not count or width <= degree_digits:
+        return result
+
+    digits = block[:, 1:].astype(np.int64) - ZERO
+    complete = np.isin(block[:, 0], HEMISPHERES)
+    complete &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+
+    def number(columns: np.ndarray) -> np.ndarray:
+        powers = 10 ** np.arange(columns.shape[1] - 1, -1, -1, dtype=np.int64)
+        return columns @ powers
+
+    degrees = number(digits[:, :degree_digits])
+    minutes = number(digits[:, degree_digits : degree_digits + 2])
+    fraction = digits[:, degree_digits + 2 :]
+    seconds = number(fraction) / 10 ** max(fraction.shape[1] - 2, 0)
+    values = degrees + minutes / 60 + seconds / 3600
+    values[np.isin(block[:, 0], NEGATIVE_HEMISPHERES)] *= -1
+    result[complete] = values[complete]
+
+    blank = (block == SPACE).all(axis=1)
+    for i in np.flatnonzero(~complete & ~blank):
+        value = decode_coordinate(bytes(block[i]).decode("latin-1"), degree_digits)
+        if value is not None:
+            result[i] = value
+    return result
+
+
+def bbox_mask(latitudes: np.ndarray, longitudes: np.ndarray, bbox: BBox) -> np.ndarray:
+    # Vectorized form of decoders.in_bbox; points without a position are kept.
+    west, south, east, north = bbox
+    inside = (latitudes >= south) & (latitudes <= north)
+    if west <= east:
+        inside &= (longitudes >= west) & (longitudes <= east)
+    else:
+        inside &= (longitudes >= west) | (longitudes <= east)
+    return inside | np.isnan(latitudes) | np.isnan(longitudes)
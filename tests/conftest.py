@@ -0,0 +1,30 @@
+import pytest
+
+from pyarinc424 import arinc  # type: ignore
+from pyarinc424.record_maps import record_maps  # type: ignore
+
+MAPS = {record_map["name"]: record_map for record_map in record_maps}
+
+
+@pytest.fixture(autouse=True)
+def full_record_maps(monkeypatch):
+    # Some tests swap in their own record maps for the parser, so every test
+    # starts from the full set.
+    monkeypatch.setattr(arinc, "record_maps", record_maps)
+
+
+def make_line(name: str, cont: str = "1", **values) -> str:
+    # Builds a 132 character line of the record map `name` with the given
+    # column values and every other column blank.
+    record_map = MAPS[name]
+    line = [" "] * 132
+    for column in record_map["columns"]:
+        if column["name"] in values:
+            value = str(values[column["name"]])
+            line[column["start"] : column["end"]] = value.ljust(
+                column["end"] - column["start"]
+            )
+    line[record_map["section_pos"]] = record_map["section_code"]
+    line[record_map["subsection_pos"]] = record_map["subsection_code"]
+    line[record_map["cont_rec_pos"]] = cont
+    return "".join(line)
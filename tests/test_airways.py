@@ -0,0 +1,149 @@
+import sqlite3
+
+import pytest
+
+import pyarinc424  # type: ignore
+from pyarinc424.airways import AirwayGraph, airway_edges  # type: ignore
+from pyarinc424.arinc import ArincParser  # type: ignore
+from pyarinc424.database import SqliteDb  # type: ignore
+
+from conftest import make_line
+
+
+def waypoint(ident: str, latitude: int, longitude: int) -> str:
+    return make_line(
+        "enroute_waypoint",
+        Waypoint_Identifier=ident,
+        ICAO_Code_2="K2",
+        Latitude=f"N{latitude:02}000000",
+        Longitude=f"W{longitude:03}000000",
+    )
+
+
+def airway_fix(route, seq, ident, section="EA", code="", direction="") -> str:
+    return make_line(
+        "enroute_airways",
+        Route_Identifier=route,
+        Sequence_Number=f"{seq:04}",
+        Fix_Identifier=ident,
+        ICAO_Code="K2",
+        Section_Code_2=section[0],
+        Subsection_Code_2=section[1],
+        Waypoint_Description_Code=code,
+        Direction_Restriction=direction,
+    )
+
+
+@pytest.fixture
+def airway_file(tmp_path):
+    lines = [
+        ("X" * 35 + "2301").ljust(132),
+        waypoint("ALPHA", 39, 104),
+        waypoint("BRAVO", 40, 104),
+        waypoint("CHRLI", 41, 104),
+        make_line(
+            "vhf_navaid",
+            VOR_Identifier="DVV",
+            ICAO_Code_2="K2",
+            VOR_Latitude="N40000000",
+            VOR_Longitude="W103000000",
+        ),
+        airway_fix("J1", 10, "ALPHA"),
+        airway_fix("J1", 30, "CHRLI"),
+        airway_fix("J1", 20, "BRAVO"),
+        airway_fix("J2", 10, "BRAVO", direction="F"),
+        airway_fix("J2", 20, "DVV", section="D "),
+        airway_fix("J3", 10, "CHRLI", code=" E"),
+        airway_fix("J3", 20, "DVV", section="D "),
+        airway_fix("J4", 10, "CHRLI"),
+        airway_fix("J4", 20, "MISNG"),
+    ]
+    path = tmp_path / "airways.dat"
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def test_airway_edges():
+    columns = [
+        "Route_Identifier",
+        "Sixth_Character",
+        "Sequence_Number",
+        "Fix_Identifier",
+        "ICAO_Code",
+        "Section_Code_2",
+        "Subsection_Code_2",
+        "Waypoint_Description_Code",
+        "Direction_Restriction",
+    ]
+    rows = [
+        ("V1", "", 20, "B", "K2", "E", "A", "", "B"),
+        ("V1", "", 10, "A", "K2", "E", "A", "", ""),
+        ("V1", "", 30, "C", "K2", "P", "C", "", ""),
+        ("V2", "", 10, "C", "K2", "D", "", "", ""),
+    ]
+
+    assert list(airway_edges(columns, rows)) == [
+        ("V1", ("A", "K2", "enroute_waypoint"), ("B", "K2", "enroute_waypoint"), 10),
+        ("V1", ("B", "K2", "enroute_waypoint"), ("A", "K2", "enroute_waypoint"), 10),
+    ]
+
+
+def test_airway_graph(airway_file):
+    graph = pyarinc424.load(airway_file).airway_graph()
+
+    assert isinstance(graph, AirwayGraph)
+    assert len(graph) == 4
+    assert graph.unresolved == 2
+    assert graph.airways_through("BRAVO") == ["J1", "J2"]
+    assert graph.airways_through("DVV", icao_code="K2") == ["J2"]
+    assert graph.airways_through("NOWHERE") == []
+
+    distance, steps = graph.shortest_path("ALPHA", "DVV")
+    assert distance == pytest.approx(60.0 + 46.0, abs=0.5)
+    assert steps == [
+        (("ALPHA", "K2", "enroute_waypoint"), None),
+        (("BRAVO", "K2", "enroute_waypoint"), "J1"),
+        (("DVV", "K2", "vhf_navaid"), "J2"),
+    ]
+    assert graph.shortest_path("DVV", "ALPHA") is None
+    assert graph.shortest_path("ALPHA", "NOWHERE") is None
+    assert graph.shortest_path("CHRLI", "ALPHA")[1][-1][1] == "J1"
+    assert [airway for _, _, airway in graph.edges(graph.find("BRAVO")[0])] == [
+        "J1",
+        "J1",
+        "J2",
+    ]
+
+
+def test_airway_edge_table(airway_file):
+    dataset = pyarinc424.load(airway_file, airways=True, typed=True)
+
+    edges = dataset["airway_edge"]
+    assert len(edges) == 5
+    first = edges.as_dict(edges.rows[0])
+    assert first["Route_Identifier"] == "J1"
+    assert first["Sequence_Number"] == 10
+    assert (first["From_Identifier"], first["To_Identifier"]) == ("ALPHA", "BRAVO")
+    assert first["From_Latitude"] == 39.0
+    assert first["Distance"] == pytest.approx(60.0, abs=0.1)
+    assert edges.nearest(39.1, -104.0)[0][1].From_Identifier == "ALPHA"
+
+
+def test_airway_edge_table_sqlite(airway_file, tmp_path):
+    class Configs:
+        dbname = str(tmp_path / "cifp.db")
+        fast_load = False
+
+    db = SqliteDb(Configs())
+    with db.connect():
+        parser = ArincParser(db, airway_file, airways=True)
+        parser.parse()
+
+    assert "airways" in parser.metrics.phases
+    connection = sqlite3.connect(Configs.dbname)
+    rows = connection.execute(
+        "SELECT From_Identifier, To_Identifier FROM airway_edge"
+        " WHERE Route_Identifier = 'J2'"
+    ).fetchall()
+    connection.close()
+    assert rows == [("BRAVO", "DVV")]
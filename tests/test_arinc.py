@@ -1,26 +1,75 @@
 import os
 import tempfile
 
+import pytest
+
 from pyarinc424 import arinc  # type: ignore
+from pyarinc424.metrics import LoadMetrics  # type: ignore
+
+from conftest import make_line
 
 
 class MockDbConfig:
     def __init__(self):
         self.schemas_created = []
         self.tables_created = []
+        self.column_types = {}
         self.rows_added = []
+        self.batches_added = []
+        self.loads_finished = []
+        self.indexes_created = []
+        self.spatial_indexes_created = []
+        self.schemas_published = []
 
-    def create_schema(self, schema_name: str) -> None:
+    def create_schema(
+        self, schema_name: str, replace: bool = True, cycle: str | None = None
+    ) -> None:
         self.schemas_created.append(schema_name)
 
     def create_table(
-        self, schema_name: str, table_name: str, columns: list[str]
+        self,
+        schema_name: str,
+        table_name: str,
+        columns: list[str],
+        column_types: list[str] | None = None,
+        replace: bool = True,
     ) -> None:
         self.tables_created.append((schema_name, table_name, columns))
+        self.column_types[table_name] = column_types
 
     def add_row(self, schema_name: str, table_name: str, values: list[str]) -> None:
         self.rows_added.append((schema_name, table_name, values))
 
+    def add_rows(
+        self, schema_name: str, table_name: str, rows: list[list[str]]
+    ) -> None:
+        self.batches_added.append((schema_name, table_name, len(rows)))
+        for values in rows:
+            self.add_row(schema_name, table_name, values)
+
+    def finish_load(self, schema_name: str) -> None:
+        self.loads_finished.append(schema_name)
+
+    def create_index(
+        self, schema_name: str, table_name: str, index_name: str, columns: list[str]
+    ) -> None:
+        self.indexes_created.append((table_name, index_name, columns))
+
+    def create_spatial_index(
+        self,
+        schema_name: str,
+        table_name: str,
+        index_name: str,
+        latitude: str,
+        longitude: str,
+    ) -> None:
+        self.spatial_indexes_created.append(
+            (table_name, index_name, latitude, longitude)
+        )
+
+    def publish(self, schema_name: str) -> None:
+        self.schemas_published.append(schema_name)
+
 
 def test_arinc_parser_parse():
     test_record_map = {
@@ -69,6 +118,41 @@ def test_arinc_parser_parse():
         os.unlink(tmp_file_path)
 
 
+def test_arinc_parser_batches_rows():
+    test_record_map = {
+        "section_code": "A",
+        "subsection_code": "B",
+        "section_pos": 0,
+        "subsection_pos": 1,
+        "name": "test_record_batches",
+        "columns": [{"name": "col1", "start": 3, "end": 5}],
+    }
+    arinc.record_maps = [test_record_map]
+
+    cycle_line = "X" * 35 + "2023\n"
+    file_content = cycle_line + "ABCDEFAB\n" * 5
+
+    with tempfile.NamedTemporaryFile("w+", delete=False) as tmp_file:
+        tmp_file.write(file_content)
+        tmp_file_path = tmp_file.name
+
+    try:
+        mock_db = MockDbConfig()
+        parser = arinc.ArincParser(mock_db, tmp_file_path, batch_size=2)
+        parser.parse()
+
+        assert mock_db.batches_added == [
+            ("cycle2023", "test_record_batches", 2),
+            ("cycle2023", "test_record_batches", 2),
+            ("cycle2023", "test_record_batches", 1),
+        ]
+        assert len(mock_db.rows_added) == 5
+        assert parser.buffers == {}
+        assert mock_db.loads_finished == ["cycle2023"]
+    finally:
+        os.unlink(tmp_file_path)
+
+
 def test_arinc_record():
     record_map = {
         "section_code": 1,
@@ -90,3 +174,623 @@ def test_arinc_record():
     assert record.cont_rec_vals == ["val1", "val2"]
     assert record.name == "test_record"
     assert record.column_names == ["col1", "col2"]
+
+
+def test_arinc_parser_dispatch():
+    records = [
+        arinc.ArincRecord(
+            {
+                "name": "primary",
+                "section_code": "A",
+                "subsection_code": "B",
+                "section_pos": 0,
+                "subsection_pos": 1,
+                "cont_rec_pos": 2,
+                "cont_rec_vals": ["0", "1"],
+                "columns": [{"name": "col1", "start": 3, "end": 5}],
+            }
+        ),
+        arinc.ArincRecord(
+            {
+                "name": "continuation",
+                "section_code": "A",
+                "subsection_code": "B",
+                "section_pos": 0,
+                "subsection_pos": 1,
+                "cont_rec_pos": 2,
+                "cont_rec_vals": ["2"],
+                "columns": [{"name": "col1", "start": 3, "end": 5}],
+            }
+        ),
+        arinc.ArincRecord(
+            {
+                "name": "other_layout",
+                "section_code": "A",
+                "subsection_code": "Z",
+                "section_pos": 0,
+                "subsection_pos": 5,
+                "columns": [{"name": "col1", "start": 3, "end": 5}],
+            }
+        ),
+    ]
+    dispatch = arinc.ArincParser.build_dispatch(records)
+
+    assert set(dispatch) == {(0, 1), (0, 5)}
+
+    def names(line):
+        return [r.name for r in arinc.ArincParser.route_line(dispatch, line)]
+
+    assert names("AB1XXZ") == ["primary", "other_layout"]
+    assert names("AB2XXX") == ["continuation"]
+    assert names("AB9XXX") == []
+    assert names("QQQQQQ") == []
+
+
+def test_arinc_parser_streams_file():
+    cycle_line = "X" * 35 + "2024\n"
+    with tempfile.NamedTemporaryFile("w+", delete=False) as tmp_file:
+        tmp_file.write(cycle_line + "ABCDEFAB\n")
+        tmp_file_path = tmp_file.name
+
+    try:
+        parser = arinc.ArincParser(MockDbConfig(), tmp_file_path)
+        assert parser.cycle == "2024"
+        assert not hasattr(parser, "lines")
+
+        lines = parser.read_file()
+        assert next(lines) == cycle_line
+        assert list(lines) == ["ABCDEFAB\n"]
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def test_arinc_parser_mmap_reader():
+    test_record_map = {
+        "section_code": "A",
+        "subsection_code": "B",
+        "section_pos": 0,
+        "subsection_pos": 1,
+        "cont_rec_pos": 2,
+        "cont_rec_vals": ["C"],
+        "name": "test_record_mmap",
+        "columns": [
+            {"name": "col1", "start": 3, "end": 5},
+            {"name": "col2", "start": 5, "end": 7},
+        ],
+    }
+    arinc.record_maps = [test_record_map]
+
+    cycle_line = "X" * 35 + "2023\n"
+    file_content = cycle_line + "ABCDEFAB\n" + "ABXDEFAB\n" + "ABCGHIJK"
+
+    with tempfile.NamedTemporaryFile("w+", delete=False) as tmp_file:
+        tmp_file.write(file_content)
+        tmp_file_path = tmp_file.name
+
+    try:
+        mock_db = MockDbConfig()
+        parser = arinc.ArincParser(mock_db, tmp_file_path, reader="mmap")
+        parser.parse()
+
+        rows = [row for _, _, row in mock_db.rows_added]
+        assert rows == [["DE", "FA"], ["GH", "IJ"]]
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def test_read_mmap_closes_mapping(tmp_path, monkeypatch):
+    path = tmp_path / "cycle.dat"
+    path.write_text("A\nB\nC\n")
+    mappings = []
+    open_mapping = arinc.mmap.mmap
+
+    def track(*args, **kwargs):
+        mappings.append(open_mapping(*args, **kwargs))
+        return mappings[-1]
+
+    monkeypatch.setattr(arinc.mmap, "mmap", track)
+    parser = arinc.ArincParser(MockDbConfig(), str(path), reader="mmap")
+
+    lines = parser.read_mmap()
+    assert next(lines) == "A"
+    lines.close()
+    assert mappings[0].closed
+
+    assert list(parser.read_mmap()) == ["A", "B", "C"]
+    assert mappings[1].closed
+
+
+def test_arinc_parser_numpy_reader():
+    pytest.importorskip("numpy")
+    test_record_map = {
+        "section_code": "A",
+        "subsection_code": "B",
+        "section_pos": 0,
+        "subsection_pos": 1,
+        "cont_rec_pos": 2,
+        "cont_rec_vals": ["C", "D"],
+        "name": "test_record_numpy",
+        "columns": [
+            {"name": "col1", "start": 3, "end": 5},
+            {"name": "col2", "start": 5, "end": None},
+        ],
+    }
+    arinc.record_maps = [test_record_map]
+
+    lines = ["X" * 35 + "2023", "ABCDEFAB" + " " * 31, "ABXDEFAB" + " " * 31]
+    lines += ["ABDGHIJK" + " " * 31, "ZBCGHIJK" + " " * 31]
+
+    with tempfile.NamedTemporaryFile("w+", delete=False) as tmp_file:
+        tmp_file.write("\r\n".join(lines))
+        tmp_file_path = tmp_file.name
+
+    try:
+        mock_db = MockDbConfig()
+        parser = arinc.ArincParser(mock_db, tmp_file_path, reader="numpy")
+        parser.parse()
+
+        rows = [row for _, _, row in mock_db.rows_added]
+        assert rows == [["DE", "FAB" + " " * 31], ["GH", "IJK" + " " * 31]]
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def test_arinc_parser_numpy_reader_unequal_lines():
+    pytest.importorskip("numpy")
+    arinc.record_maps = []
+
+    with tempfile.NamedTemporaryFile("w+", delete=False) as tmp_file:
+        tmp_file.write("X" * 35 + "2023\n" + "ABCDEFAB\n")
+        tmp_file_path = tmp_file.name
+
+    try:
+        parser = arinc.ArincParser(MockDbConfig(), tmp_file_path, reader="numpy")
+        with pytest.raises(ValueError, match="equal length"):
+            parser.parse()
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def test_arinc_record_extract():
+    record_map = {
+        "name": "test_record_extract",
+        "columns": [
+            {"name": "col1", "start": 0, "end": 2},
+            {"name": "col2", "start": 3, "end": 6},
+        ],
+    }
+    record = arinc.ArincRecord(record_map)
+    assert record.extract("AB CDE") == ["AB", "CDE"]
+    assert record.compile(typed=True)("AB CDE") == ["AB", "CDE"]
+
+    single = arinc.ArincRecord(
+        {"name": "single", "columns": [record_map["columns"][1]]}
+    )
+    assert single.extract("AB CDE") == ["CDE"]
+    assert single.compile(typed=True)("AB CDE") == ["CDE"]
+
+
+def test_arinc_parser_parallel():
+    test_record_map = {
+        "section_code": "A",
+        "subsection_code": "B",
+        "section_pos": 0,
+        "subsection_pos": 1,
+        "cont_rec_pos": 2,
+        "cont_rec_vals": ["C"],
+        "name": "test_record_parallel",
+        "columns": [{"name": "col1", "start": 3, "end": 8}],
+    }
+    arinc.record_maps = [test_record_map]
+
+    cycle_line = "X" * 35 + "2023\n"
+    lines = [f"ABC{i:05}\n" if i % 3 else f"ZZZ{i:05}\n" for i in range(200)]
+
+    with tempfile.NamedTemporaryFile("w+", delete=False) as tmp_file:
+        tmp_file.write(cycle_line + "".join(lines))
+        tmp_file_path = tmp_file.name
+
+    try:
+        parser = arinc.ArincParser(MockDbConfig(), tmp_file_path, workers=2)
+        ranges = parser.split_ranges(8)
+        assert len(ranges) == 8
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == os.path.getsize(tmp_file_path)
+        with open(tmp_file_path, "rb") as file:
+            for start, _ in ranges[1:]:
+                file.seek(start - 1)
+                assert file.read(1) == b"\n"
+
+        mock_db = MockDbConfig()
+        parser = arinc.ArincParser(mock_db, tmp_file_path, workers=2)
+        parser.parse()
+
+        rows = [row for _, _, row in mock_db.rows_added]
+        assert rows == [[f"{i:05}"] for i in range(200) if i % 3]
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def test_arinc_parser_metrics():
+    test_record_map = {
+        "section_code": "A",
+        "subsection_code": "B",
+        "section_pos": 0,
+        "subsection_pos": 1,
+        "cont_rec_pos": 2,
+        "cont_rec_vals": ["C"],
+        "name": "test_record_metrics",
+        "columns": [{"name": "col1", "start": 3, "end": 8}],
+    }
+    arinc.record_maps = [test_record_map]
+
+    cycle_line = "X" * 35 + "2023\n"
+    lines = [f"ABC{i:05}\n" if i % 3 else f"ZZZ{i:05}\n" for i in range(200)]
+
+    with tempfile.NamedTemporaryFile("w+", delete=False) as tmp_file:
+        tmp_file.write(cycle_line + "".join(lines))
+        tmp_file_path = tmp_file.name
+
+    try:
+        for options in [{}, {"reader": "mmap"}, {"workers": 2}]:
+            events = []
+            metrics = LoadMetrics(hooks=[lambda *event: events.append(event)])
+            parser = arinc.ArincParser(
+                MockDbConfig(), tmp_file_path, batch_size=50, metrics=metrics, **options
+            )
+            parser.parse()
+
+            assert metrics.cycle == "2023"
+            assert metrics.lines == 201
+            assert metrics.bytes == os.path.getsize(tmp_file_path)
+            assert metrics.tables["test_record_metrics"] == {
+                "rows_matched": 133,
+                "rows_written": 133,
+                "bytes": 133 * 9,
+                "insert_seconds": metrics.tables["test_record_metrics"][
+                    "insert_seconds"
+                ],
+            }
+            assert {"setup", "parse", "insert", "index", "commit"} <= set(
+                metrics.phases
+            )
+            flushed = [data["rows"] for event, data in events if event == "flush"]
+            assert flushed == [50, 50, 33]
+            assert events[-1][0] == "finish"
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def test_arinc_parser_typed():
+    test_record_map = {
+        "section_code": "A",
+        "subsection_code": "B",
+        "section_pos": 0,
+        "subsection_pos": 1,
+        "name": "test_record_typed",
+        "columns": [
+            {"name": "Latitude", "start": 2, "end": 11},
+            {"name": "Elevation", "start": 11, "end": 16},
+            {"name": "Name", "start": 16, "end": 20},
+        ],
+    }
+    arinc.record_maps = [test_record_map]
+
+    cycle_line = "X" * 35 + "2023\n"
+    line = "ABN39300000     DEN \n"
+
+    with tempfile.NamedTemporaryFile("w+", delete=False) as tmp_file:
+        tmp_file.write(cycle_line + line)
+        tmp_file_path = tmp_file.name
+
+    try:
+        for reader in ["text", "mmap"]:
+            mock_db = MockDbConfig()
+            parser = arinc.ArincParser(
+                mock_db, tmp_file_path, reader=reader, typed=True
+            )
+            parser.parse()
+
+            assert mock_db.column_types["test_record_typed"] == [
+                "real",
+                "integer",
+                "text",
+            ]
+            assert mock_db.rows_added[0][2] == [39.5, None, "DEN"]
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def test_arinc_parser_bbox():
+    test_record_map = {
+        "section_code": "A",
+        "subsection_code": "B",
+        "section_pos": 0,
+        "subsection_pos": 1,
+        "name": "test_record_bbox",
+        "position": ["Latitude", "Longitude"],
+        "columns": [
+            {"name": "Name", "start": 2, "end": 5},
+            {"name": "Latitude", "start": 5, "end": 14},
+            {"name": "Longitude", "start": 14, "end": 24},
+        ],
+    }
+    arinc.record_maps = [test_record_map]
+
+    lines = [
+        "X" * 35 + "2023",
+        "ABDENN39513881W104402315" + " " * 15,
+        "ABLAXN33563300W118243100" + " " * 15,
+        "ABNOP                   " + " " * 15,
+    ]
+
+    with tempfile.NamedTemporaryFile("w+", delete=False) as tmp_file:
+        tmp_file.write("\n".join(lines) + "\n")
+        tmp_file_path = tmp_file.name
+
+    try:
+        readers = ["text", "mmap"]
+        try:
+            import numpy  # noqa: F401
+
+            readers.append("numpy")
+        except ImportError:
+            pass
+
+        for reader in readers:
+            for typed in [False, True]:
+                mock_db = MockDbConfig()
+                parser = arinc.ArincParser(
+                    mock_db,
+                    tmp_file_path,
+                    reader=reader,
+                    typed=typed,
+                    bbox=(-109.0, 37.0, -102.0, 41.0),
+                )
+                parser.parse()
+
+                names = [row[0].rstrip() for _, _, row in mock_db.rows_added]
+                assert names == ["DEN", "NOP"], (reader, typed)
+
+                # Spatial indexes are only built over decoded coordinates.
+                spatial_indexes = [("test_record_bbox", "test_record_bbox_position")]
+                assert [index[:2] for index in mock_db.spatial_indexes_created] == (
+                    spatial_indexes if typed else []
+                )
+    finally:
+        os.unlink(tmp_file_path)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"reader": "text"},
+        {"reader": "mmap"},
+        {"reader": "numpy"},
+        {"workers": 2},
+        {"typed": True},
+    ],
+)
+def test_arinc_parser_bbox_parents(tmp_path, options):
+    # Records that belong to an airport or name a fix follow it in or out of
+    # the box.
+    if options.get("reader") == "numpy":
+        pytest.importorskip("numpy")
+
+    def airport(ident, latitude, longitude):
+        return [
+            make_line(
+                "airport",
+                Airport_Identifier=ident,
+                ICAO_Code="K2",
+                Latitude=latitude,
+                Longitude=longitude,
+            ),
+            make_line("approach", Airport_Identifier=ident, Procedure_Identifier="I16"),
+            make_line("pathpoint_cont", cont="2", Airport_Identifier=ident),
+        ]
+
+    def waypoint(ident, latitude, longitude):
+        return make_line(
+            "enroute_waypoint",
+            Waypoint_Identifier=ident,
+            ICAO_Code_2="K2",
+            Latitude=latitude,
+            Longitude=longitude,
+        )
+
+    def airway_fix(seq, ident):
+        return make_line(
+            "enroute_airways",
+            Route_Identifier="J1",
+            Sequence_Number=f"{seq:04}",
+            Fix_Identifier=ident,
+            ICAO_Code="K2",
+            Section_Code_2="E",
+            Subsection_Code_2="A",
+        )
+
+    lines = [
+        ("X" * 35 + "2301").ljust(132),
+        waypoint("ALPHA", "N39000000", "W104000000"),
+        waypoint("BRAVO", "N34000000", "W118000000"),
+        airway_fix(10, "ALPHA"),
+        airway_fix(20, "BRAVO"),
+        make_line("enroute_airways", Route_Identifier="J2", Sequence_Number="0010"),
+        *airport("KDEN", "N39513881", "W104402315"),
+        *airport("KLAX", "N33563300", "W118243100"),
+        make_line("approach", Airport_Identifier="KDEN", Procedure_Identifier="R34"),
+    ]
+    path = tmp_path / "bbox.dat"
+    path.write_text("\n".join(lines) + "\n")
+
+    mock_db = MockDbConfig()
+    arinc.ArincParser(
+        mock_db, str(path), bbox=(-109.0, 37.0, -102.0, 41.0), **options
+    ).parse()
+
+    tables: dict[str, list[str]] = {}
+    for _, table, row in mock_db.rows_added:
+        tables.setdefault(table, []).append(row)
+
+    def column(table, name):
+        index = arinc.ArincRecord(
+            next(m for m in arinc.record_maps if m["name"] == table)
+        ).column_names.index(name)
+        return [row[index].rstrip() for row in tables.get(table, [])]
+
+    assert column("airport", "Airport_Identifier") == ["KDEN"]
+    assert column("approach", "Procedure_Identifier") == ["I16", "R34"]
+    assert column("pathpoint_cont", "Airport_Identifier") == ["KDEN"]
+    assert column("enroute_waypoint", "Waypoint_Identifier") == ["ALPHA"]
+    # Airway fixes without a fix are kept.
+    assert column("enroute_airways", "Fix_Identifier") == ["ALPHA", ""]
+
+
+def test_arinc_parser_creates_indexes():
+    test_record_map = {
+        "section_code": "A",
+        "subsection_code": "B",
+        "section_pos": 0,
+        "subsection_pos": 1,
+        "name": "test_record_indexes",
+        "key": ["col1", "col2"],
+        "indexes": [["col2"]],
+        "columns": [
+            {"name": "col1", "start": 3, "end": 5},
+            {"name": "col2", "start": 5, "end": 7},
+        ],
+    }
+    arinc.record_maps = [test_record_map]
+
+    cycle_line = "X" * 35 + "2023\n"
+
+    with tempfile.NamedTemporaryFile("w+", delete=False) as tmp_file:
+        tmp_file.write(cycle_line + "ABCDEFAB\n")
+        tmp_file_path = tmp_file.name
+
+    try:
+        mock_db = MockDbConfig()
+        arinc.ArincParser(mock_db, tmp_file_path).parse()
+        assert mock_db.indexes_created == [
+            ("test_record_indexes", "test_record_indexes_key", ["col1", "col2"]),
+            ("test_record_indexes", "test_record_indexes_col2", ["col2"]),
+        ]
+        assert mock_db.schemas_published == ["cycle2023"]
+
+        mock_db = MockDbConfig()
+        arinc.ArincParser(mock_db, tmp_file_path, indexes=False).parse()
+        assert mock_db.indexes_created == []
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def test_arinc_parser_delta(tmp_path):
+    from pyarinc424.database import SqliteDb  # type: ignore
+
+    test_record_map = {
+        "section_code": "A",
+        "subsection_code": "B",
+        "section_pos": 0,
+        "subsection_pos": 1,
+        "name": "test_record_delta",
+        "key": ["ident"],
+        "columns": [
+            {"name": "ident", "start": 2, "end": 4},
+            {"name": "value", "start": 4, "end": 6},
+            {"name": "File_Record_Number", "start": 6, "end": 8},
+        ],
+    }
+    arinc.record_maps = [test_record_map]
+
+    class Configs:
+        dbname = str(tmp_path / "delta.db")
+        fast_load = False
+
+    def load(lines, delta):
+        path = tmp_path / "cycle.dat"
+        path.write_text("X" * 35 + "2023\n" + "".join(f"{line}\n" for line in lines))
+        db = SqliteDb(Configs)
+        with db.connect() as cursor:
+            parser = arinc.ArincParser(db, str(path), delta=delta, schema="navdata")
+            parser.parse()
+            rows = cursor.execute("SELECT * FROM test_record_delta;").fetchall()
+        return parser.delta_report, sorted(rows)
+
+    load(["ABK1v101", "ABK2v202", "ABK3v303"], delta=False)
+    report, rows = load(["ABK1v105", "ABK2vX06", "ABK4v407"], delta=True)
+
+    assert report == {
+        "test_record_delta": {"inserted": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+    }
+    assert rows == [("K1", "v1", "01"), ("K2", "vX", "06"), ("K4", "v4", "07")]
+
+
+def test_arinc_parser_cache(tmp_path, monkeypatch):
+    test_record_map = {
+        "section_code": "A",
+        "subsection_code": "B",
+        "section_pos": 0,
+        "subsection_pos": 1,
+        "name": "test_record_cache",
+        "columns": [{"name": "col1", "start": 3, "end": 5}],
+    }
+    arinc.record_maps = [test_record_map]
+
+    path = tmp_path / "cycle.dat"
+    path.write_text("X" * 35 + "2023\n" + "ABCDEFAB\n" * 5)
+    cache_dir = tmp_path / "cache"
+
+    mock_db = MockDbConfig()
+    arinc.ArincParser(
+        mock_db, str(path), batch_size=2, cache_dir=str(cache_dir)
+    ).parse()
+    assert len(os.listdir(cache_dir)) == 1
+
+    # A hit loads the cached rows without reading any lines of the file.
+    def fail_parse(self, records):
+        raise AssertionError("file was parsed")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(arinc.ArincParser, "parse_file", fail_parse)
+        cached_db = MockDbConfig()
+        arinc.ArincParser(
+            cached_db, str(path), batch_size=3, cache_dir=str(cache_dir)
+        ).parse()
+    assert cached_db.rows_added == mock_db.rows_added
+    assert [n for _, _, n in cached_db.batches_added] == [3, 2]
+    assert cached_db.schemas_published == ["cycle2023"]
+
+    # Changing the file or the record maps misses the cache.
+    path.write_text("X" * 35 + "2023\n" + "ABCDEFAB\n" * 6)
+    arinc.ArincParser(MockDbConfig(), str(path), cache_dir=str(cache_dir)).parse()
+    test_record_map["columns"][0]["end"] = 6
+    arinc.ArincParser(MockDbConfig(), str(path), cache_dir=str(cache_dir)).parse()
+    assert len(os.listdir(cache_dir)) == 3
+
+
+def test_arinc_parser_cache_discarded_on_error(tmp_path):
+    test_record_map = {
+        "section_code": "A",
+        "subsection_code": "B",
+        "section_pos": 0,
+        "subsection_pos": 1,
+        "name": "test_record_cache_error",
+        "columns": [{"name": "col1", "start": 3, "end": 5}],
+    }
+    arinc.record_maps = [test_record_map]
+
+    path = tmp_path / "cycle.dat"
+    path.write_text("X" * 35 + "2023\n" + "ABCDEFAB\n" * 5)
+    cache_dir = tmp_path / "cache"
+
+    class FailingDb(MockDbConfig):
+        def finish_load(self, schema_name: str) -> None:
+            raise RuntimeError("load failed")
+
+    parser = arinc.ArincParser(FailingDb(), str(path), cache_dir=str(cache_dir))
+    try:
+        parser.parse()
+    except RuntimeError:
+        pass
+    assert os.listdir(cache_dir) == []
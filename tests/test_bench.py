@@ -0,0 +1,71 @@
+import json
+
+import pyarinc424  # type: ignore
+from pyarinc424 import bench  # type: ignore
+from pyarinc424.database import MemoryDb  # type: ignore
+from pyarinc424.record_maps import record_maps  # type: ignore
+
+
+def test_generate_file(tmp_path):
+    path = tmp_path / "synthetic.dat"
+    counts = bench.generate_file(str(path), scale=0.001, cycle="2301")
+
+    lines = path.read_text().splitlines()
+    assert lines[0][35:39] == "2301"
+    assert {len(line) for line in lines} == {bench.LINE_LENGTH}
+    assert len(lines) == sum(counts.values()) + 1
+    assert set(counts) == {record_map["name"] for record_map in record_maps}
+    assert counts["approach"] == 135
+    assert counts["heli_msa"] == 1
+
+
+def test_generate_file_resolves_references(tmp_path):
+    path = tmp_path / "synthetic.dat"
+    counts = bench.generate_file(str(path), scale=0.01)
+    dataset = pyarinc424.load(str(path))
+
+    # Airway fixes name generated waypoints, so the airways form a graph.
+    graph = dataset.airway_graph()
+    assert len(graph) > 0
+    assert graph.unresolved == 0
+
+    # Procedure legs share procedure identifiers, so each procedure has
+    # several legs.
+    procedures = dataset.procedures("approach")
+    assert len(procedures) <= counts["approach"] // bench.LEGS_PER_PROCEDURE
+    airport = dataset.tables["airport"]
+    index = airport.columns.index("Airport_Identifier")
+    airports = {row[index] for row in airport.rows}
+    assert {key[0] for key in procedures} <= airports
+
+
+def test_run_loads_every_table(tmp_path):
+    path = tmp_path / "synthetic.dat"
+    counts = bench.generate_file(str(path), scale=0.001)
+
+    report = bench.run(str(path), MemoryDb(), typed=True)
+
+    assert report["lines"] == sum(counts.values()) + 1
+    assert {name: table["rows"] for name, table in report["tables"].items()} == counts
+    assert report["rows"] == sum(counts.values())
+    assert {"read", "parse", "insert", "index", "commit", "total"} <= set(
+        report["phases"]
+    )
+    assert report["lines_per_sec"] > 0
+    assert report["peak_rss_mb"] > 0
+
+
+def test_benchmark_writes_json(tmp_path, capsys):
+    output = tmp_path / "bench.json"
+    report = bench.benchmark(
+        ["--scale", "0.0005", "--backend", "sqlite", "--json", str(output)]
+    )
+
+    assert json.loads(output.read_text())["rows"] == report["rows"]
+    assert "generate" in report["phases"]
+    assert "lines/sec" in capsys.readouterr().out
+
+
+def test_main_returns_none(capsys):
+    assert bench.main(["--scale", "0.0005", "--backend", "memory"]) is None
+    assert "lines/sec" in capsys.readouterr().out
@@ -0,0 +1,40 @@
+from pyarinc424.cache import ParseCache, cache_key  # type: ignore
+
+
+def test_cache_key(tmp_path):
+    path = tmp_path / "cycle.dat"
+    path.write_text("ABC\n")
+
+    key = cache_key(str(path), {"typed": False})
+    assert key == cache_key(str(path), {"typed": False})
+    assert key != cache_key(str(path), {"typed": True})
+
+    path.write_text("ABD\n")
+    assert key != cache_key(str(path), {"typed": False})
+
+
+def test_parse_cache_round_trip(tmp_path):
+    cache = ParseCache(str(tmp_path / "cache"), "key")
+    assert not cache.exists()
+
+    cache.open()
+    cache.write("table1", [["A", 1], ["B", None]])
+    cache.write("table2", [["C", 2.5]])
+    assert not cache.exists()
+    cache.close()
+
+    assert cache.exists()
+    assert list(cache.read()) == [
+        ("table1", [["A", 1], ["B", None]]),
+        ("table2", [["C", 2.5]]),
+    ]
+
+
+def test_parse_cache_discard(tmp_path):
+    cache = ParseCache(str(tmp_path), "key")
+    cache.open()
+    cache.write("table1", [["A"]])
+    cache.close(commit=False)
+
+    assert not cache.exists()
+    assert list(tmp_path.iterdir()) == []
@@ -109,6 +109,126 @@ class TestValidate:
         with pytest.raises(ValueError, match="File location cannot be empty"):
             validate(parser)
 
+    def test_invalid_batch_size(self):
+        """Test validation fails when the loader batch size is not positive."""
+        parser = configparser.ConfigParser()
+        parser["sqlite"] = {"dbname": "test.db"}
+        parser["cifp_file"] = {"file_loc": "/path/to/file"}
+        parser["loader"] = {"batch_size": "0"}
+
+        with pytest.raises(ValueError, match="Batch size must be a positive integer"):
+            validate(parser)
+
+    @pytest.mark.parametrize(
+        "bbox, message",
+        [
+            ("-109, 37, -102", "four numbers"),
+            ("-109, 41, -102, 37", "latitudes"),
+            ("-190, 37, -102, 41", "longitudes"),
+        ],
+    )
+    def test_invalid_bbox(self, bbox, message):
+        """Test validation fails when the loader bbox is malformed."""
+        parser = configparser.ConfigParser()
+        parser["sqlite"] = {"dbname": "test.db"}
+        parser["cifp_file"] = {"file_loc": "/path/to/file"}
+        parser["loader"] = {"bbox": bbox}
+
+        with pytest.raises(ValueError, match=message):
+            validate(parser)
+
+    def test_invalid_load_method(self):
+        """Test validation fails when an unknown PostgreSQL load method is given."""
+        parser = configparser.ConfigParser()
+        parser["postgres"] = {
+            "dbname": "testdb",
+            "user": "testuser",
+            "password": "testpass",
+            "host": "localhost",
+            "port": "5432",
+            "load_method": "bulk",
+        }
+        parser["cifp_file"] = {"file_loc": "/path/to/file"}
+
+        with pytest.raises(ValueError, match="load_method must be one of"):
+            validate(parser)
+
+    def test_parallel_tables_requires_copy(self):
+        """Test validation fails when parallel table loading is used with inserts."""
+        parser = configparser.ConfigParser()
+        parser["postgres"] = {
+            "dbname": "testdb",
+            "user": "testuser",
+            "password": "testpass",
+            "host": "localhost",
+            "port": "5432",
+            "load_method": "insert",
+            "parallel_tables": "4",
+        }
+        parser["cifp_file"] = {"file_loc": "/path/to/file"}
+
+        with pytest.raises(ValueError, match="parallel_tables requires load_method"):
+            validate(parser)
+
+    def test_valid_parquet_config(self):
+        """Test validation with valid Parquet configuration."""
+        parser = configparser.ConfigParser()
+        parser["parquet"] = {"directory": "/path/to/output"}
+        parser["cifp_file"] = {"file_loc": "/path/to/file"}
+
+        # Should not raise any exceptions
+        validate(parser)
+
+    def test_parquet_with_delta(self):
+        """Test validation fails when Parquet output is combined with delta loads."""
+        parser = configparser.ConfigParser()
+        parser["parquet"] = {"directory": "/path/to/output"}
+        parser["cifp_file"] = {"file_loc": "/path/to/file"}
+        parser["loader"] = {"delta": "yes"}
+
+        with pytest.raises(
+            ValueError, match="Parquet output cannot be used with delta"
+        ):
+            validate(parser)
+
+    def test_atomic_swap_with_delta(self):
+        """Test validation fails when an atomic swap is combined with delta loads."""
+        parser = configparser.ConfigParser()
+        parser["postgres"] = {
+            "dbname": "testdb",
+            "user": "testuser",
+            "password": "testpass",
+            "host": "localhost",
+            "port": "5432",
+            "atomic_swap": "yes",
+        }
+        parser["cifp_file"] = {"file_loc": "/path/to/file"}
+        parser["loader"] = {"delta": "yes"}
+
+        with pytest.raises(ValueError, match="atomic_swap cannot be used with delta"):
+            validate(parser)
+
+    def test_postgres_delta_without_schema(self):
+        """Test validation fails when a PostgreSQL delta load has no fixed schema."""
+        parser = configparser.ConfigParser()
+        parser["postgres"] = {
+            "dbname": "testdb",
+            "user": "testuser",
+            "password": "testpass",
+            "host": "localhost",
+            "port": "5432",
+        }
+        parser["cifp_file"] = {"file_loc": "/path/to/file"}
+        parser["loader"] = {"delta": "yes"}
+
+        with pytest.raises(
+            ValueError, match="delta loads require a \\[loader\\] schema"
+        ):
+            validate(parser)
+
+        parser["loader"]["schema"] = "cifp"
+        validate(parser)
+
 
 class TestUserConfigs:
     @mock.patch("configparser.ConfigParser.read")
@@ -136,6 +256,9 @@ class TestUserConfigs:
             assert user_configs.password == "testpass"
             assert user_configs.host == "localhost"
             assert user_configs.port == "5432"
+            assert user_configs.load_method == "copy"
+            assert user_configs.parallel_tables == 1
+            assert user_configs.atomic_swap is False
             assert user_configs.file_loc == "/path/to/file"
 
     @mock.patch("configparser.ConfigParser.read")
@@ -154,6 +277,35 @@ class TestUserConfigs:
             assert user_configs.dbtype == "sqlite"
             assert user_configs.dbname == "test.db"
             assert user_configs.file_loc == "/path/to/file"
+            assert user_configs.batch_size == 5000
+            assert user_configs.procedures is False
+            assert user_configs.airways is False
+
+    @mock.patch("configparser.ConfigParser.read")
+    def test_loader_batch_size(self, mock_read):
+        """Test UserConfigs reads the batch size from the loader section."""
+        mock_config = configparser.ConfigParser()
+        mock_config["sqlite"] = {"dbname": "test.db"}
+        mock_config["cifp_file"] = {"file_loc": "/path/to/file"}
+        mock_config["loader"] = {"batch_size": "250"}
+
+        with mock.patch("configparser.ConfigParser", return_value=mock_config):
+            user_configs = UserConfigs()
+
+            assert user_configs.batch_size == 250
+
+    @mock.patch("configparser.ConfigParser.read")
+    def test_loader_bbox(self, mock_read):
+        """Test UserConfigs reads the bounding box from the loader section."""
+        mock_config = configparser.ConfigParser()
+        mock_config["sqlite"] = {"dbname": "test.db"}
+        mock_config["cifp_file"] = {"file_loc": "/path/to/file"}
+        mock_config["loader"] = {"bbox": "-109.05, 36.99, -102.04, 41.0"}
+
+        with mock.patch("configparser.ConfigParser", return_value=mock_config):
+            user_configs = UserConfigs()
+
+            assert user_configs.bbox == (-109.05, 36.99, -102.04, 41.0)
 
     @mock.patch("configparser.ConfigParser.read")
     def test_missing_config(self, mock_read):
@@ -1,11 +1,29 @@
 import pytest
-from unittest.mock import MagicMock, patch
-from pyarinc424.database import PostgresDb, SqliteDb, get_db  # type: ignore
+from unittest.mock import MagicMock, call, patch
+from pyarinc424.database import (  # type: ignore
+    MemoryDb,
+    ParquetDb,
+    PostgresDb,
+    SqliteDb,
+    copy_value,
+    get_db,
+)
 
 
 class MockConfigs:
     def __init__(
-        self, dbtype, dbname="test.db", user=None, password=None, host=None, port=None
+        self,
+        dbtype,
+        dbname="test.db",
+        user=None,
+        password=None,
+        host=None,
+        port=None,
+        load_method="copy",
+        fast_load=False,
+        parallel_tables=1,
+        atomic_swap=False,
+        directory=None,
     ):
         self.dbtype = dbtype
         self.dbname = dbname
@@ -13,6 +31,11 @@ class MockConfigs:
         self.password = password
         self.host = host
         self.port = port
+        self.load_method = load_method
+        self.fast_load = fast_load
+        self.parallel_tables = parallel_tables
+        self.atomic_swap = atomic_swap
+        self.directory = directory
 
 
 @pytest.fixture
@@ -77,6 +100,7 @@ def test_sqlitedb_connect(mock_connect, mock_sqlite_configs):
 
 
 def test_postgresdb_create_schema(mock_postgres_configs):
+    mock_postgres_configs.load_method = "insert"
     db = PostgresDb(mock_postgres_configs)
     db.cursor = MagicMock()
     db.create_schema("test_schema")
@@ -85,6 +109,30 @@ def test_postgresdb_create_schema(mock_postgres_configs):
     )
 
 
+def test_postgresdb_create_schema_deferred(mock_postgres_configs):
+    db = PostgresDb(mock_postgres_configs)
+    db.cursor = MagicMock()
+    calls = []
+    db.cursor.execute.side_effect = lambda sql: calls.append(sql)
+    db.cursor.copy_expert.side_effect = lambda sql, file: calls.append(sql)
+
+    # With COPY the schema is only replaced once parsing has finished.
+    db.create_schema("test_schema")
+    db.create_table("test_schema", "test_table", ["col1"])
+    db.add_rows("test_schema", "test_table", [["val1"]])
+    assert calls == []
+
+    db.finish_load("test_schema")
+    assert calls == [
+        "DROP SCHEMA IF EXISTS test_schema CASCADE; CREATE SCHEMA test_schema; "
+        "DROP TABLE IF EXISTS test_schema.test_table; "
+        "CREATE TABLE test_schema.test_table (col1 varchar);",
+        "COPY test_schema.test_table FROM STDIN;",
+    ]
+    db.create_index("test_schema", "test_table", "test_index", ["col1"])
+    assert len(calls) == 3
+
+
 def test_postgresdb_create_table(mock_postgres_configs):
     db = PostgresDb(mock_postgres_configs)
     db.cursor = MagicMock()
@@ -94,12 +142,17 @@ def test_postgresdb_create_table(mock_postgres_configs):
     )
 
 
-def test_postgresdb_add_row(mock_postgres_configs):
+@patch("psycopg2.extras.execute_values")
+def test_postgresdb_add_row(mock_execute_values, mock_postgres_configs):
+    mock_postgres_configs.load_method = "insert"
     db = PostgresDb(mock_postgres_configs)
     db.cursor = MagicMock()
-    db.add_row("test_schema", "test_table", ["val1", "val2"])
-    db.cursor.execute.assert_called_once_with(
-        "INSERT INTO test_schema.test_table VALUES ('val1', 'val2');"
+    db.add_row("test_schema", "test_table", ["it's ", 1, None])
+    mock_execute_values.assert_called_once_with(
+        db.cursor,
+        "INSERT INTO test_schema.test_table VALUES %s;",
+        [["it's", 1, None]],
+        page_size=1000,
     )
 
 
@@ -107,15 +160,404 @@ def test_sqlitedb_create_table(mock_sqlite_configs):
     db = SqliteDb(mock_sqlite_configs)
     db.cursor = MagicMock()
     db.create_table(None, "test_table", ["col1", "col2"])
-    db.cursor.executescript.assert_called_once_with(
-        "DROP TABLE IF EXISTS test_table; CREATE TABLE test_table (col1 TEXT, col2 TEXT);"
-    )
+    assert db.cursor.execute.call_args_list == [
+        call("DROP TABLE IF EXISTS test_table;"),
+        call("CREATE TABLE test_table (col1 TEXT, col2 TEXT);"),
+    ]
+
+
+def test_sqlitedb_create_table_keeps_transaction(mock_sqlite_configs):
+    db = SqliteDb(mock_sqlite_configs)
+    with db.connect():
+        db.create_table(None, "test_table", ["col1"])
+        db.add_rows(None, "test_table", [["a"]])
+        assert db.cursor.connection.in_transaction
+        db.create_table(None, "derived_table", ["col1"])
+        assert db.cursor.connection.in_transaction
 
 
 def test_sqlitedb_add_row(mock_sqlite_configs):
     db = SqliteDb(mock_sqlite_configs)
     db.cursor = MagicMock()
-    db.add_row(None, "test_table", ["val1", "val2"])
-    db.cursor.executescript.assert_called_once_with(
-        "INSERT INTO test_table VALUES ('val1', 'val2');"
+    db.add_row(None, "test_table", ["val1 ", 2, None])
+    db.cursor.executemany.assert_called_once_with(
+        "INSERT INTO test_table VALUES (?, ?, ?);", [["val1", 2, None]]
+    )
+
+
+@patch("psycopg2.extras.execute_values")
+def test_postgresdb_add_rows(mock_execute_values, mock_postgres_configs):
+    mock_postgres_configs.load_method = "insert"
+    db = PostgresDb(mock_postgres_configs)
+    db.cursor = MagicMock()
+    db.add_rows("test_schema", "test_table", [["val1 ", "val2"], ["val3", "val4  "]])
+    mock_execute_values.assert_called_once_with(
+        db.cursor,
+        "INSERT INTO test_schema.test_table VALUES %s;",
+        [["val1", "val2"], ["val3", "val4"]],
+        page_size=1000,
+    )
+
+
+def test_sqlitedb_add_rows(mock_sqlite_configs):
+    db = SqliteDb(mock_sqlite_configs)
+    db.cursor = MagicMock()
+    db.add_rows(None, "test_table", [["val1 ", "val2"], ["it's", "val4  "]])
+    db.cursor.executemany.assert_called_once_with(
+        "INSERT INTO test_table VALUES (?, ?);",
+        [["val1", "val2"], ["it's", "val4"]],
+    )
+
+
+def test_postgresdb_add_rows_copy(mock_postgres_configs):
+    db = PostgresDb(mock_postgres_configs)
+    db.cursor = MagicMock()
+    copied = {}
+    db.cursor.copy_expert.side_effect = lambda sql, file: copied.update(
+        {sql: file.read()}
+    )
+
+    db.add_rows("test_schema", "test_table", [["val1 ", "val2"]])
+    db.add_rows("test_schema", "test_table", [["a\\b", "c\td"]])
+    db.add_rows("test_schema", "other_table", [["val3"]])
+    db.cursor.execute.assert_not_called()
+
+    db.finish_load("test_schema")
+
+    assert copied == {
+        "COPY test_schema.test_table FROM STDIN;": "val1\tval2\na\\\\b\tc\\td\n",
+        "COPY test_schema.other_table FROM STDIN;": "val3\n",
+    }
+    assert db.spools == {}
+
+
+@patch("psycopg2.pool.ThreadedConnectionPool")
+def test_postgresdb_parallel_tables(mock_pool_class, mock_postgres_configs):
+    mock_postgres_configs.parallel_tables = 2
+    db = PostgresDb(mock_postgres_configs)
+    db.conn = MagicMock()
+    db.cursor = MagicMock()
+
+    db.create_schema("test_schema")
+    db.cursor.execute.assert_called_once_with(
+        "DROP SCHEMA IF EXISTS test_schema_staging CASCADE; CREATE SCHEMA test_schema_staging;"
+    )
+    db.create_table("test_schema", "test_table", ["col1"])
+    db.add_rows("test_schema", "test_table", [["val1"]])
+    db.add_rows("test_schema", "other_table", [["val2"]])
+
+    pool = mock_pool_class.return_value
+    pool_cursor = pool.getconn.return_value.cursor.return_value.__enter__.return_value
+    db.finish_load("test_schema")
+
+    mock_pool_class.assert_called_once_with(
+        1,
+        2,
+        dbname="test_db",
+        user="test_user",
+        password="test_pass",
+        host="localhost",
+        port=5432,
+    )
+    copied = sorted(c.args[0] for c in pool_cursor.copy_expert.call_args_list)
+    assert copied == [
+        "COPY test_schema_staging.other_table FROM STDIN;",
+        "COPY test_schema_staging.test_table FROM STDIN;",
+    ]
+    assert pool.putconn.call_count == 2
+    pool.closeall.assert_called_once()
+
+    db.publish("test_schema")
+    db.cursor.execute.assert_called_with(
+        "DROP SCHEMA IF EXISTS test_schema CASCADE; "
+        "ALTER SCHEMA test_schema_staging RENAME TO test_schema;"
+    )
+
+
+def test_copy_value():
+    assert copy_value("plain  ") == "plain"
+    assert copy_value("back\\slash") == "back\\\\slash"
+    assert copy_value("tab\there") == "tab\\there"
+    assert copy_value("line\nbreak\rend") == "line\\nbreak\\rend"
+
+
+def test_sqlitedb_fast_load(tmp_path, mock_sqlite_configs):
+    mock_sqlite_configs.dbname = str(tmp_path / "fast.db")
+    mock_sqlite_configs.fast_load = True
+    db = SqliteDb(mock_sqlite_configs)
+
+    with db.connect() as cursor:
+        db.create_schema(None)
+        assert cursor.execute("PRAGMA journal_mode;").fetchone()[0] == "off"
+        assert cursor.execute("PRAGMA synchronous;").fetchone()[0] == 0
+
+        db.create_table(None, "test_table", ["col1", "col2"])
+        db.add_rows(None, "test_table", [["a", "b"]])
+        db.add_rows(None, "test_table", [["c", "d"]])
+        assert cursor.connection.in_transaction
+
+        db.finish_load(None)
+        db.create_index(None, "test_table", "test_table_col1", ["col1"])
+        db.publish(None)
+        assert not cursor.connection.in_transaction
+        assert cursor.execute("PRAGMA journal_mode;").fetchone()[0] == "delete"
+        assert cursor.execute("PRAGMA synchronous;").fetchone()[0] == 2
+        assert cursor.execute("SELECT * FROM test_table;").fetchall() == [
+            ("a", "b"),
+            ("c", "d"),
+        ]
+        indexes = cursor.execute("PRAGMA index_list(test_table);").fetchall()
+        assert [index[1] for index in indexes] == ["test_table_col1"]
+
+
+def test_postgresdb_create_table_typed(mock_postgres_configs):
+    db = PostgresDb(mock_postgres_configs)
+    db.cursor = MagicMock()
+    db.create_table("test_schema", "test_table", ["col1", "col2"], ["real", "integer"])
+    db.cursor.execute.assert_called_once_with(
+        "DROP TABLE IF EXISTS test_schema.test_table; CREATE TABLE test_schema.test_table (col1 double precision, col2 integer);"
+    )
+
+
+def test_sqlitedb_typed_rows(mock_sqlite_configs):
+    db = SqliteDb(mock_sqlite_configs)
+    with db.connect() as cursor:
+        db.create_table(
+            None, "test_table", ["col1", "col2", "col3"], ["real", "integer", "text"]
+        )
+        db.add_rows(None, "test_table", [[39.5, None, "DEN  "]])
+        assert cursor.execute("SELECT * FROM test_table;").fetchall() == [
+            (39.5, None, "DEN")
+        ]
+
+
+def test_copy_value_typed():
+    assert copy_value(None) == "\\N"
+    assert copy_value(39.5) == "39.5"
+    assert copy_value(5434) == "5434"
+
+
+def test_postgresdb_create_index(mock_postgres_configs):
+    db = PostgresDb(mock_postgres_configs)
+    db.cursor = MagicMock()
+    db.create_index("test_schema", "test_table", "test_table_key", ["col1", "col2"])
+    db.cursor.execute.assert_called_once_with(
+        "CREATE INDEX IF NOT EXISTS test_table_key ON test_schema.test_table (col1, col2);"
+    )
+
+
+def test_postgresdb_create_spatial_index(mock_postgres_configs):
+    db = PostgresDb(mock_postgres_configs)
+    db.cursor = MagicMock()
+    db.create_spatial_index(
+        "test_schema", "airport", "airport_position", "Latitude", "Longitude"
+    )
+    db.cursor.execute.assert_called_once_with(
+        "CREATE INDEX IF NOT EXISTS airport_position ON test_schema.airport USING gist (point(Longitude, Latitude));"
+    )
+
+
+def test_sqlitedb_create_spatial_index(mock_sqlite_configs):
+    db = SqliteDb(mock_sqlite_configs)
+    with db.connect() as cursor:
+        db.create_table(
+            None, "airport", ["Name", "Latitude", "Longitude"], ["text", "real", "real"]
+        )
+        db.add_rows(
+            None,
+            "airport",
+            [["KDEN", 39.86, -104.67], ["KLAX", 33.94, -118.41], ["NONE", None, None]],
+        )
+        db.finish_load(None)
+        db.create_spatial_index(
+            None, "airport", "airport_position", "Latitude", "Longitude"
+        )
+        db.publish(None)
+
+        sql = (
+            "SELECT a.Name FROM airport a JOIN airport_position p ON a.rowid = p.id "
+            "WHERE p.min_latitude >= 37 AND p.max_latitude <= 41 "
+            "AND p.min_longitude >= -109 AND p.max_longitude <= -102;"
+        )
+        assert cursor.execute(sql).fetchall() == [("KDEN",)]
+        count = cursor.execute("SELECT count(*) FROM airport_position;").fetchone()
+        assert count == (2,)
+
+
+def test_postgresdb_publish_unstaged(mock_postgres_configs):
+    db = PostgresDb(mock_postgres_configs)
+    db.cursor = MagicMock()
+    db.publish("test_schema")
+    db.cursor.execute.assert_not_called()
+
+
+def test_sqlitedb_create_index(mock_sqlite_configs):
+    db = SqliteDb(mock_sqlite_configs)
+    db.cursor = MagicMock()
+    db.create_index(None, "test_table", "test_table_key", ["col1", "col2"])
+    db.cursor.execute.assert_called_once_with(
+        "CREATE INDEX IF NOT EXISTS test_table_key ON test_table (col1, col2);"
+    )
+
+
+def test_postgresdb_create_schema_keep(mock_postgres_configs):
+    db = PostgresDb(mock_postgres_configs)
+    db.cursor = MagicMock()
+    db.create_schema("test_schema", replace=False)
+    db.cursor.execute.assert_called_once_with(
+        "CREATE SCHEMA IF NOT EXISTS test_schema;"
+    )
+
+
+@patch("psycopg2.extras.execute_values")
+def test_postgresdb_delete_rows(mock_execute_values, mock_postgres_configs):
+    db = PostgresDb(mock_postgres_configs)
+    db.cursor = MagicMock()
+    db.create_table("test_schema", "test_table", ["col1", "col2"], ["text", "integer"])
+    db.delete_rows("test_schema", "test_table", ["col1", "col2"], [("a", None)])
+    mock_execute_values.assert_called_once_with(
+        db.cursor,
+        "DELETE FROM test_schema.test_table AS t USING (VALUES %s) AS k (col1, col2) "
+        "WHERE t.col1 = k.col1 AND t.col2 IS NOT DISTINCT FROM k.col2;",
+        [("a", None)],
+        template="(%s::varchar, %s::integer)",
+        page_size=1000,
+    )
+
+
+def test_sqlitedb_delete_rows(mock_sqlite_configs):
+    db = SqliteDb(mock_sqlite_configs)
+    with db.connect():
+        db.create_table(None, "test_table", ["col1", "col2"], ["text", "integer"])
+        db.add_rows(None, "test_table", [["a", None], ["a", 1], ["b", None]])
+        db.delete_rows(None, "test_table", ["col1", "col2"], [("a", None)])
+        assert db.fetch_rows(None, "test_table", ["col1", "col2"]) == [
+            ("a", 1),
+            ("b", None),
+        ]
+
+
+def test_postgresdb_atomic_swap(mock_postgres_configs):
+    mock_postgres_configs.atomic_swap = True
+    db = PostgresDb(mock_postgres_configs)
+    db.conn = MagicMock()
+    db.cursor = MagicMock()
+
+    db.create_schema("test_schema")
+    db.cursor.execute.assert_called_once_with(
+        "DROP SCHEMA IF EXISTS test_schema_staging CASCADE; CREATE SCHEMA test_schema_staging;"
+    )
+
+    # The replaced schema is kept for rollback.
+    db.cursor.fetchone.return_value = (1,)
+    db.publish("test_schema")
+    db.cursor.execute.assert_called_with(
+        "DROP SCHEMA IF EXISTS test_schema_previous CASCADE; "
+        "ALTER SCHEMA test_schema RENAME TO test_schema_previous; "
+        "ALTER SCHEMA test_schema_staging RENAME TO test_schema;"
+    )
+    db.conn.commit.assert_called_once()
+
+
+def test_postgresdb_atomic_swap_first_load(mock_postgres_configs):
+    mock_postgres_configs.atomic_swap = True
+    db = PostgresDb(mock_postgres_configs)
+    db.conn = MagicMock()
+    db.cursor = MagicMock()
+    db.create_schema("test_schema")
+
+    # A first load has nothing to keep.
+    db.cursor.fetchone.return_value = None
+    db.publish("test_schema")
+    db.cursor.execute.assert_called_with(
+        "ALTER SCHEMA test_schema_staging RENAME TO test_schema;"
+    )
+    db.conn.commit.assert_called_once()
+
+
+def test_postgresdb_rollback(mock_postgres_configs):
+    db = PostgresDb(mock_postgres_configs)
+    db.conn = MagicMock()
+    db.cursor = MagicMock()
+
+    db.cursor.fetchone.return_value = None
+    with pytest.raises(ValueError, match="No previous schema test_schema_previous"):
+        db.rollback("test_schema")
+
+    db.cursor.fetchone.return_value = (1,)
+    db.rollback("test_schema")
+    db.cursor.execute.assert_called_with(
+        "ALTER SCHEMA test_schema RENAME TO test_schema_rollback; "
+        "ALTER SCHEMA test_schema_previous RENAME TO test_schema; "
+        "ALTER SCHEMA test_schema_rollback RENAME TO test_schema_previous;"
     )
+    db.conn.commit.assert_called_once()
+
+
+def test_sqlitedb_rollback(mock_sqlite_configs):
+    db = SqliteDb(mock_sqlite_configs)
+    with pytest.raises(ValueError, match="only supported for PostgreSQL"):
+        db.rollback("test_schema")
+
+
+def test_parquetdb_writes_tables(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    db = get_db(MockConfigs(dbtype="parquet", directory=str(tmp_path)))
+    assert isinstance(db, ParquetDb)
+
+    with db.connect():
+        db.create_schema("cycle2301", cycle="2301")
+        db.create_table("cycle2301", "test_table", ["col1", "col2"])
+        db.create_table(
+            "cycle2301", "typed_table", ["col1", "col2"], ["integer", "real"]
+        )
+        db.add_rows("cycle2301", "test_table", [["a  ", "b"], ["c", "d"]])
+        db.add_rows("cycle2301", "test_table", [["e", "f"]])
+        db.add_rows("cycle2301", "typed_table", [[1, 2.5], [None, None]])
+        assert not (tmp_path / "cycle2301" / "test_table.parquet").exists()
+        db.finish_load("cycle2301")
+
+    table = pq.read_table(tmp_path / "cycle2301" / "test_table.parquet")
+    assert table.to_pydict() == {"col1": ["a", "c", "e"], "col2": ["b", "d", "f"]}
+    assert table.schema.metadata[b"cycle"] == b"2301"
+
+    typed = pq.read_table(tmp_path / "cycle2301" / "typed_table.parquet")
+    assert str(typed.schema.field("col1").type) == "int64"
+    assert typed.to_pydict() == {"col1": [1, None], "col2": [2.5, None]}
+    assert sorted(p.name for p in (tmp_path / "cycle2301").iterdir()) == [
+        "test_table.parquet",
+        "typed_table.parquet",
+    ]
+
+
+def test_parquetdb_discards_unfinished_load(tmp_path):
+    pytest.importorskip("pyarrow")
+    db = ParquetDb(MockConfigs(dbtype="parquet", directory=str(tmp_path)))
+
+    with pytest.raises(RuntimeError):
+        with db.connect():
+            db.create_schema("cycle2301")
+            db.create_table("cycle2301", "test_table", ["col1"])
+            db.add_rows("cycle2301", "test_table", [["a"]])
+            raise RuntimeError("parse failed")
+
+    assert list((tmp_path / "cycle2301").iterdir()) == []
+
+
+def test_memorydb():
+    db = MemoryDb()
+    with db.connect():
+        db.create_schema("cycle2301", cycle="2301")
+        db.create_table("cycle2301", "test_table", ["col1", "col2"])
+        db.add_rows("cycle2301", "test_table", [["a  ", "b"], ["c", "d"]])
+        db.add_row("cycle2301", "test_table", ["e", "f"])
+
+    assert db.cycle == "2301"
+    assert db.tables == {"test_table": [("a", "b"), ("c", "d"), ("e", "f")]}
+    assert db.fetch_rows(None, "test_table", ["col2"]) == [("b",), ("d",), ("f",)]
+
+    db.delete_rows(None, "test_table", ["col1"], [("a",), ("e",)])
+    assert db.tables["test_table"] == [("c", "d")]
+
+    db.create_table("cycle2301", "test_table", ["col1", "col2"], replace=False)
+    assert db.tables["test_table"] == [("c", "d")]
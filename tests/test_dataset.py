@@ -0,0 +1,154 @@
+import pytest
+
+import pyarinc424  # type: ignore
+from pyarinc424 import arinc  # type: ignore
+from pyarinc424.dataset import Dataset, Table  # type: ignore
+
+
+@pytest.fixture
+def cycle_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        arinc,
+        "record_maps",
+        [
+            {
+                "section_code": "P",
+                "subsection_code": "A",
+                "section_pos": 0,
+                "subsection_pos": 1,
+                "name": "airport",
+                "columns": [
+                    {"name": "Airport_Identifier", "start": 2, "end": 6},
+                    {"name": "ICAO_Code", "start": 6, "end": 8},
+                ],
+            },
+            {
+                "section_code": "E",
+                "subsection_code": "A",
+                "section_pos": 0,
+                "subsection_pos": 1,
+                "name": "enroute_waypoint",
+                "columns": [
+                    {"name": "Waypoint_Identifier", "start": 2, "end": 7},
+                    {"name": "ICAO_Code_2", "start": 7, "end": 9},
+                ],
+            },
+        ],
+    )
+    path = tmp_path / "cycle.dat"
+    path.write_text(
+        "X" * 35
+        + "2301\n"
+        + "PAKDENK2\n"
+        + "PAKBDUK2\n"
+        + "EAKDEN K2\n"
+        + "EAABCDEK1\n"
+        + "EAABCDEK2\n"
+    )
+    return str(path)
+
+
+def test_load(cycle_file):
+    dataset = pyarinc424.load(cycle_file)
+
+    assert isinstance(dataset, Dataset)
+    assert dataset.cycle == "2301"
+    assert len(dataset.airport) == 2
+    assert dataset["enroute_waypoint"].columns == ["Waypoint_Identifier", "ICAO_Code_2"]
+    assert list(dataset.enroute_waypoint) == [
+        ("KDEN", "K2"),
+        ("ABCDE", "K1"),
+        ("ABCDE", "K2"),
+    ]
+    with pytest.raises(AttributeError):
+        dataset.missing_table
+
+
+def test_dataset_lookups(cycle_file):
+    dataset = pyarinc424.load(cycle_file)
+
+    assert dataset.airport.get(Airport_Identifier="KDEN") == ("KDEN", "K2")
+    assert dataset.airport.get(Airport_Identifier="KXXX") is None
+    assert dataset.enroute_waypoint.find(Waypoint_Identifier="ABCDE") == [
+        ("ABCDE", "K1"),
+        ("ABCDE", "K2"),
+    ]
+    assert dataset.airport_records("KBDU") == [("KBDU", "K2")]
+
+    assert dataset.fixes("KDEN") == [
+        ("airport", ("KDEN", "K2")),
+        ("enroute_waypoint", ("KDEN", "K2")),
+    ]
+    assert dataset.fixes("ABCDE", icao_code="K1") == [
+        ("enroute_waypoint", ("ABCDE", "K1"))
+    ]
+
+
+def test_dataset_spatial_queries(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        arinc,
+        "record_maps",
+        [
+            {
+                "section_code": "E",
+                "subsection_code": "A",
+                "section_pos": 0,
+                "subsection_pos": 1,
+                "name": "enroute_waypoint",
+                "position": ["Latitude", "Longitude"],
+                "columns": [
+                    {"name": "Waypoint_Identifier", "start": 2, "end": 7},
+                    {"name": "Latitude", "start": 7, "end": 16},
+                    {"name": "Longitude", "start": 16, "end": 26},
+                ],
+            },
+        ],
+    )
+    path = tmp_path / "cycle.dat"
+    path.write_text(
+        "X" * 35
+        + "2301\n"
+        + "EAAAAAAN39500000W104400000\n"
+        + "EABBBBBN40000000W105000000\n"
+        + "EACCCCCN33560000W118240000\n"
+    )
+
+    dataset = pyarinc424.load(str(path), typed=True)
+    nearest = dataset.nearest_fixes(39.86, -104.67, count=2)
+    assert [(name, row.Waypoint_Identifier) for _, name, row in nearest] == [
+        ("enroute_waypoint", "AAAAA"),
+        ("enroute_waypoint", "BBBBB"),
+    ]
+    assert nearest[0][0] < nearest[1][0]
+
+    within = dataset.fixes_within(39.86, -104.67, radius=50)
+    assert [row.Waypoint_Identifier for _, _, row in within] == ["AAAAA", "BBBBB"]
+    assert dataset.enroute_waypoint.within(39.86, -104.67, radius=1) == []
+
+    with pytest.raises(ValueError, match="typed=True"):
+        pyarinc424.load(str(path)).nearest_fixes(39.86, -104.67)
+
+
+def test_table_rows():
+    table = Table("airport", ["Airport_Identifier", "ICAO_Code"], [("KDEN", "K2")])
+
+    row = table.get(ICAO_Code="K2")
+    assert table.value(row, "Airport_Identifier") == "KDEN"
+    assert table.as_dict(row) == {"Airport_Identifier": "KDEN", "ICAO_Code": "K2"}
+    assert list(table.lookups) == [("ICAO_Code",)]
+
+
+def test_record_types(cycle_file):
+    dataset = pyarinc424.load(cycle_file)
+    other = pyarinc424.load(cycle_file)
+
+    row = dataset.enroute_waypoint.get(Waypoint_Identifier="KDEN")
+    assert type(row).__name__ == "EnrouteWaypoint"
+    assert isinstance(row, dataset.enroute_waypoint.record_type)
+    assert row.Waypoint_Identifier == "KDEN"
+    assert row.ICAO_Code_2 == "K2"
+    assert not hasattr(row, "__dict__")
+
+    other_row = other.enroute_waypoint.get(Waypoint_Identifier="KDEN")
+    assert type(other_row) is type(row)
+    assert other_row.Waypoint_Identifier is row.Waypoint_Identifier
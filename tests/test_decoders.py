@@ -0,0 +1,98 @@
+import pytest
+from pyarinc424 import decoders  # type: ignore
+from pyarinc424.arinc import ArincRecord  # type: ignore
+from pyarinc424.record_maps import record_maps  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("N39513881", 39 + 51 / 60 + 38.81 / 3600),
+        ("S33565100", -(33 + 56 / 60 + 51.0 / 3600)),
+        ("N394917500", 39 + 49 / 60 + 17.5 / 3600),
+        ("N39", 39.0),
+        ("         ", None),
+        ("X39513881", None),
+    ],
+)
+def test_decode_latitude(value, expected):
+    assert decoders.decode_latitude(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("W104402315", -(104 + 40 / 60 + 23.15 / 3600)),
+        ("E151103400", 151 + 10 / 60 + 34.0 / 3600),
+        ("W105", -105.0),
+        ("          ", None),
+    ],
+)
+def test_decode_longitude(value, expected):
+    assert decoders.decode_longitude(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("05434", 5434), ("-0012", -12), ("     ", None), ("UNK", None)],
+)
+def test_decode_integer(value, expected):
+    assert decoders.decode_integer(value) == expected
+
+
+def test_decode_real():
+    assert decoders.decode_real("12.5") == 12.5
+    assert decoders.decode_real("    ") is None
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("05000", 5000),
+        ("FL180", 18000),
+        ("GND  ", 0),
+        ("UNLTD", None),
+        ("     ", None),
+    ],
+)
+def test_decode_altitude(value, expected):
+    assert decoders.decode_altitude(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("E0080", 8.0), ("W0125", -12.5), ("T0000", 0.0), ("     ", None)],
+)
+def test_decode_magnetic_variation(value, expected):
+    assert decoders.decode_magnetic_variation(value) == expected
+
+
+def test_decode_frequencies():
+    assert decoders.decode_vhf_frequency("11630") == pytest.approx(116.3)
+    assert decoders.decode_ndb_frequency("03620") == pytest.approx(362.0)
+    assert decoders.decode_vhf_frequency("     ") is None
+
+
+def test_airspace_limits_stay_text():
+    # UNLTD, MSL and NOTSP would all decode to None as altitudes.
+    for name in ["controlled_airspace", "restrictive_airspace"]:
+        record_map = next(m for m in record_maps if m["name"] == name)
+        record = ArincRecord(record_map)
+        types = dict(zip(record.column_names, record.column_types))
+        assert types["Lower_Limit"] == types["Upper_Limit"] == "text"
+
+
+def test_decoders_have_storage_types():
+    assert set(decoders.DECODERS) == set(decoders.STORAGE_TYPES)
+
+
+def test_in_bbox():
+    bbox = (-109.0, 37.0, -102.0, 41.0)
+    assert decoders.in_bbox(bbox, 39.86, -104.67)
+    assert not decoders.in_bbox(bbox, 33.94, -118.41)
+    assert decoders.in_bbox(bbox, None, None)
+
+    antimeridian = (170.0, -50.0, -170.0, -30.0)
+    assert decoders.in_bbox(antimeridian, -40.0, 175.0)
+    assert decoders.in_bbox(antimeridian, -40.0, -175.0)
+    assert not decoders.in_bbox(antimeridian, -40.0, 0.0)
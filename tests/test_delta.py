@@ -0,0 +1,51 @@
+from pyarinc424 import delta  # type: ignore
+
+COLUMNS = ["ident", "value", "File_Record_Number"]
+
+
+def test_diff_rows_by_key():
+    old_rows = [("A", "1", "00001"), ("B", "2", "00002"), ("C", "3", "00003")]
+    new_rows = [["A ", "1", "00009"], ["B", "9", "00010"], ["D", "4", "00011"]]
+
+    result = delta.diff_rows(COLUMNS, ["ident"], old_rows, new_rows)
+
+    assert result.summary() == {
+        "inserted": 1,
+        "updated": 1,
+        "deleted": 1,
+        "unchanged": 1,
+    }
+    assert sorted(result.deletes) == [("B",), ("C",)]
+    assert result.inserts == [["B", "9", "00010"], ["D", "4", "00011"]]
+
+
+def test_diff_rows_duplicate_keys_replaced_together():
+    old_rows = [("A", "1", "1"), ("A", "2", "2")]
+    new_rows = [["A", "2", "3"], ["A", "1", "4"]]
+    assert delta.diff_rows(COLUMNS, ["ident"], old_rows, new_rows).updated == 0
+
+    new_rows = [["A", "1", "3"], ["A", "3", "4"]]
+    result = delta.diff_rows(COLUMNS, ["ident"], old_rows, new_rows)
+    assert result.updated == 2
+    assert result.deletes == [("A",)]
+    assert result.inserts == new_rows
+
+
+def test_diff_rows_without_key():
+    old_rows = [("A", "1", "1")]
+    new_rows = [["A", "1", "2"], ["A", "2", "3"]]
+    result = delta.diff_rows(COLUMNS, [], old_rows, new_rows)
+
+    assert delta.identity_columns(COLUMNS, []) == ["ident", "value"]
+    assert result.summary() == {
+        "inserted": 1,
+        "updated": 0,
+        "deleted": 0,
+        "unchanged": 1,
+    }
+
+
+def test_write_report(tmp_path):
+    path = tmp_path / "report.json"
+    delta.write_report({"airport": {"inserted": 1}}, str(path))
+    assert path.read_text() == '{\n  "airport": {\n    "inserted": 1\n  }\n}'
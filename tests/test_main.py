@@ -4,6 +4,8 @@ import pytest
 
 def test_main_success():
     dummy_config = MagicMock(name="dummy_config")
+    dummy_config.metrics_file = None
+    dummy_config.delta = False
     dummy_config.file_loc = "dummy_location"
 
     dummy_db = MagicMock(name="dummy_db")
@@ -18,13 +20,14 @@ def test_main_success():
         patch("main.UserConfigs", return_value=dummy_config) as mock_configs,
         patch("main.get_db", return_value=dummy_db) as mock_get_db,
         patch("main.ArincParser", return_value=dummy_parser) as mock_parser_class,
+        patch("sys.argv", ["main.py", "my_config.ini"]),
     ):
 
         import main  # type: ignore
 
         main.main()
 
-        mock_configs.assert_called_once()
+        mock_configs.assert_called_once_with(config_file="my_config.ini")
 
         mock_get_db.assert_called_once_with(dummy_config)
 
@@ -32,13 +35,30 @@ def test_main_success():
         dummy_context.__enter__.assert_called_once()
         dummy_context.__exit__.assert_called_once()
 
-        mock_parser_class.assert_called_once_with(dummy_db, dummy_config.file_loc)
+        mock_parser_class.assert_called_once_with(
+            dummy_db,
+            dummy_config.file_loc,
+            batch_size=dummy_config.batch_size,
+            reader=dummy_config.reader,
+            workers=dummy_config.workers,
+            typed=dummy_config.typed,
+            indexes=dummy_config.indexes,
+            delta=dummy_config.delta,
+            schema=dummy_config.schema,
+            cache_dir=dummy_config.cache_dir,
+            bbox=dummy_config.bbox,
+            procedures=dummy_config.procedures,
+            airways=dummy_config.airways,
+            progress=None,
+        )
 
         dummy_parser.parse.assert_called_once()
 
 
 def test_main_success_config_arg():
     dummy_config = MagicMock(name="dummy_config")
+    dummy_config.metrics_file = None
+    dummy_config.delta = False
 
     dummy_db = MagicMock(name="dummy_db")
     dummy_context = MagicMock(name="dummy_context")
@@ -60,3 +80,125 @@ def test_main_success_config_arg():
         main.main()
 
         mock_configs.assert_called_once_with()
+
+
+def test_main_quiet_arg():
+    dummy_config = MagicMock(name="dummy_config")
+    dummy_config.metrics_file = None
+    dummy_config.delta = False
+
+    with (
+        patch("main.UserConfigs", return_value=dummy_config),
+        patch("main.get_db"),
+        patch("main.ArincParser") as mock_parser_class,
+        patch("sys.argv", ["main.py", "--quiet"]),
+    ):
+
+        import main  # type: ignore
+
+        main.main()
+
+        assert mock_parser_class.call_args.kwargs["progress"] is False
+
+
+def test_main_workers_arg():
+    dummy_config = MagicMock(name="dummy_config")
+    dummy_config.metrics_file = None
+    dummy_config.delta = False
+    dummy_config.workers = 1
+
+    with (
+        patch("main.UserConfigs", return_value=dummy_config),
+        patch("main.get_db"),
+        patch("main.ArincParser") as mock_parser_class,
+        patch("sys.argv", ["main.py", "--workers", "8"]),
+    ):
+
+        import main  # type: ignore
+
+        main.main()
+
+        assert mock_parser_class.call_args.kwargs["workers"] == 8
+
+
+def test_main_invalid_workers_arg():
+    with patch("sys.argv", ["main.py", "--workers", "0"]):
+
+        import main  # type: ignore
+
+        with pytest.raises(SystemExit):
+            main.main()
+
+
+def test_main_delta_report(tmp_path):
+    dummy_config = MagicMock(name="dummy_config")
+    dummy_config.metrics_file = None
+    dummy_config.delta = True
+    dummy_config.delta_report = str(tmp_path / "report.json")
+
+    dummy_parser = MagicMock(name="dummy_parser")
+    dummy_parser.delta_report = {"airport": {"inserted": 1}}
+
+    with (
+        patch("main.UserConfigs", return_value=dummy_config),
+        patch("main.get_db"),
+        patch("main.ArincParser", return_value=dummy_parser),
+        patch("main.print_report") as mock_print_report,
+        patch("sys.argv", ["main.py"]),
+    ):
+
+        import main  # type: ignore
+
+        main.main()
+
+        mock_print_report.assert_called_once_with(dummy_parser.delta_report)
+        assert (tmp_path / "report.json").read_text().startswith("{")
+
+
+def test_main_metrics(tmp_path):
+    from pyarinc424.metrics import LoadMetrics  # type: ignore
+
+    dummy_config = MagicMock(name="dummy_config")
+    dummy_config.delta = False
+    dummy_config.metrics_file = str(tmp_path / "pyarinc424.prom")
+    dummy_config.metrics_format = "prometheus"
+
+    dummy_parser = MagicMock(name="dummy_parser")
+    dummy_parser.metrics = LoadMetrics()
+    dummy_parser.metrics.cycle = "2301"
+
+    with (
+        patch("main.UserConfigs", return_value=dummy_config),
+        patch("main.get_db"),
+        patch("main.ArincParser", return_value=dummy_parser),
+        patch("sys.argv", ["main.py"]),
+    ):
+
+        import main  # type: ignore
+
+        main.main()
+
+        text = (tmp_path / "pyarinc424.prom").read_text()
+        assert 'pyarinc424_lines_scanned{cycle="2301"} 0' in text
+
+
+def test_main_rollback():
+    dummy_config = MagicMock(name="dummy_config")
+    dummy_config.dbtype = "postgres"
+
+    dummy_parser = MagicMock(name="dummy_parser")
+    dummy_parser.schema = "cycle2301"
+
+    with (
+        patch("main.UserConfigs", return_value=dummy_config),
+        patch("main.get_db") as mock_get_db,
+        patch("main.ArincParser", return_value=dummy_parser),
+        patch("sys.argv", ["main.py", "--rollback"]),
+    ):
+
+        import main  # type: ignore
+
+        main.main()
+
+        mock_get_db.return_value.rollback.assert_called_once_with("cycle2301")
+        dummy_parser.parse.assert_not_called()
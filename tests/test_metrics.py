@@ -0,0 +1,51 @@
+import json
+import time
+
+from pyarinc424.metrics import LoadMetrics, prometheus_text, write_metrics  # type: ignore
+
+
+def test_nested_phases_only_count_their_own_time():
+    metrics = LoadMetrics()
+    with metrics.phase("parse"):
+        time.sleep(0.01)
+        with metrics.phase("insert"):
+            time.sleep(0.02)
+
+    assert 0.01 <= metrics.phases["parse"] < 0.02
+    assert metrics.phases["insert"] >= 0.02
+
+
+def test_hooks_and_table_counters():
+    events = []
+    metrics = LoadMetrics(hooks=[lambda event, data: events.append((event, data))])
+    metrics.scanned(3, 400)
+    metrics.matched("airport", 2, 266)
+    with metrics.writing("airport", 2):
+        pass
+    metrics.finish()
+
+    assert metrics.tables["airport"]["rows_matched"] == 2
+    assert metrics.tables["airport"]["rows_written"] == 2
+    assert metrics.tables["airport"]["bytes"] == 266
+    assert events[0] == ("flush", {"table": "airport", "rows": 2})
+    assert events[1][0] == "finish"
+    assert events[1][1]["lines"] == 3
+    assert "insert" in events[1][1]["phases"]
+
+
+def test_write_metrics(tmp_path):
+    metrics = LoadMetrics()
+    metrics.cycle = "2301"
+    metrics.matched("airport", 2, 266)
+
+    write_metrics(metrics, str(tmp_path / "metrics.json"))
+    data = json.loads((tmp_path / "metrics.json").read_text())
+    assert data["cycle"] == "2301"
+    assert data["tables"]["airport"]["rows_matched"] == 2
+
+    text = prometheus_text(metrics)
+    assert "# TYPE pyarinc424_table_rows_matched gauge" in text
+    assert 'pyarinc424_table_rows_matched{cycle="2301",table="airport"} 2' in text
+    write_metrics(metrics, str(tmp_path / "metrics.prom"), "prometheus")
+    assert (tmp_path / "metrics.prom").read_text() == text
+    assert not (tmp_path / "metrics.prom.tmp").exists()
@@ -0,0 +1,183 @@
+import sqlite3
+
+import pytest
+
+import pyarinc424  # type: ignore
+from pyarinc424.arinc import ArincParser  # type: ignore
+from pyarinc424.database import SqliteDb  # type: ignore
+from pyarinc424.procedures import assemble, procedure_tables  # type: ignore
+
+from conftest import make_line
+
+
+def leg(name: str, procedure: str, route_type: str, transition: str, seq: int, fix):
+    return make_line(
+        name,
+        Airport_Identifier="KDEN",
+        ICAO_Code="K2",
+        Procedure_Identifier=procedure,
+        Route_Type=route_type,
+        Transition_Identifier=transition,
+        Sequence_Number=f"{seq:03}",
+        Fix_Identifier=fix,
+        Cycle="2301",
+    )
+
+
+@pytest.fixture
+def procedure_file(tmp_path):
+    lines = [
+        ("X" * 35 + "2301").ljust(132),
+        leg("sid", "BAYLR6", "1", "RW08", 20, "DEPOT"),
+        leg("sid", "BAYLR6", "1", "RW08", 10, "RW08"),
+        leg("sid", "BAYLR6", "2", "", 10, "BAYLR"),
+        leg("sid", "BAYLR6", "3", "HBU", 10, "BAYLR"),
+        leg("sid", "BAYLR6", "3", "HBU", 20, "HBU"),
+        leg("approach", "I16R", "A", "DVV", 10, "DVV"),
+        leg("approach", "I16R", "I", "", 10, "CRUSR"),
+        make_line(
+            "approach_cont",
+            cont="2",
+            Airport_Identifier="KDEN",
+            ICAO_Code="K2",
+            Procedure_Identifier="I16R",
+            Route_Type="I",
+            Sequence_Number="010",
+            Application_Type="W",
+            LNAV="Y",
+        ),
+        leg("approach", "I16R", "I", "", 20, "RW16R"),
+    ]
+    path = tmp_path / "procedures.dat"
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def test_assemble():
+    columns = [
+        "Airport_Identifier",
+        "ICAO_Code",
+        "Procedure_Identifier",
+        "Route_Type",
+        "Transition_Identifier",
+        "Sequence_Number",
+        "Fix_Identifier",
+    ]
+    rows = [
+        ("KDEN", "K2", "BAYLR6", "1", "RW08", 20, "DEPOT"),
+        ("KDEN", "K2", "BAYLR6", "1", "RW08", 10, "RW08"),
+        ("KDEN", "K2", "BAYLR6", "2", "", None, "BAYLR"),
+        ("KDEN", "K2", "BAYLR6", "2", "", 10, "LIMIT"),
+        ("KBDU", "K2", "BAYLR6", "1", "RW08", 10, "RW08"),
+    ]
+
+    procedures = assemble("sid", columns, rows)
+
+    assert list(procedures) == [("KDEN", "K2", "BAYLR6"), ("KBDU", "K2", "BAYLR6")]
+    procedure = procedures[("KDEN", "K2", "BAYLR6")]
+    assert [(t.route_type, t.identifier) for t in procedure.transitions] == [
+        ("1", "RW08"),
+        ("2", ""),
+    ]
+    assert [leg.row[6] for leg in procedure.legs] == ["RW08", "DEPOT", "LIMIT", "BAYLR"]
+    assert procedure.transition("RW08") is procedure.transitions[0]
+    assert procedure.transition("RW08", route_type="4") is None
+    assert all(leg.continuation is None for leg in procedure.legs)
+
+
+def test_assemble_untyped_blank_sequence():
+    columns = [
+        "Airport_Identifier",
+        "ICAO_Code",
+        "Procedure_Identifier",
+        "Route_Type",
+        "Transition_Identifier",
+        "Sequence_Number",
+    ]
+    rows = [
+        ("KDEN", "K2", "BAYLR6", "1", "RW08", "   "),
+        ("KDEN", "K2", "BAYLR6", "1", "RW08", "010"),
+    ]
+
+    procedures = assemble("sid", columns, rows)
+
+    legs = procedures[("KDEN", "K2", "BAYLR6")].legs
+    assert [leg.row[5] for leg in legs] == ["010", "   "]
+
+
+def test_procedure_tables_without_procedures():
+    assert procedure_tables({"airport": (["Airport_Identifier"], ["text"], [])}) == []
+
+
+def test_dataset_procedures(procedure_file):
+    dataset = pyarinc424.load(procedure_file)
+
+    sid = dataset.procedure("KDEN", "BAYLR6", kind="sid")
+    assert [t.identifier for t in sid.transitions] == ["RW08", "", "HBU"]
+    assert [leg.row.Fix_Identifier for leg in sid.transition("RW08").legs] == [
+        "RW08",
+        "DEPOT",
+    ]
+    assert dataset.procedure("KDEN", "MISSING", kind="sid") is None
+    assert list(dataset.airport_procedures("KDEN")) == ["I16R"]
+
+    approach = dataset.procedure("KDEN", "I16R")
+    final = approach.transition("", route_type="I")
+    assert final.legs[0].continuation.LNAV == "Y"
+    assert final.legs[1].continuation is None
+    assert dataset.procedures("approach") is dataset.procedures("approach")
+
+    with pytest.raises(ValueError):
+        dataset.procedures("airport")
+
+
+def test_procedure_tables_loaded(procedure_file):
+    dataset = pyarinc424.load(procedure_file, procedures=True, typed=True)
+
+    assert dataset["procedure"].as_dict(dataset["procedure"].rows[0]) == {
+        "Procedure_Type": "sid",
+        "Airport_Identifier": "KDEN",
+        "ICAO_Code": "K2",
+        "Procedure_Identifier": "BAYLR6",
+        "Transition_Count": 3,
+        "Leg_Count": 5,
+        "Cycle": "2301",
+    }
+    legs = dataset.procedure_leg
+    assert len(legs) == 8
+    assert [
+        (row.Procedure_Identifier, row.Transition_Identifier, row.Leg_Number)
+        for row in legs
+    ][:3] == [("BAYLR6", "RW08", 1), ("BAYLR6", "RW08", 2), ("BAYLR6", "", 1)]
+    assert [row.Fix_Identifier for row in legs][:2] == ["RW08", "DEPOT"]
+    assert [row.LNAV for row in legs][-2:] == ["Y", None]
+    assert "Record_Type" not in legs.columns
+
+
+def test_procedure_tables_sqlite(procedure_file, tmp_path):
+    class Configs:
+        dbname = str(tmp_path / "cifp.db")
+        fast_load = False
+
+    db = SqliteDb(Configs())
+    with db.connect():
+        parser = ArincParser(db, procedure_file, procedures=True)
+        parser.parse()
+
+    assert {"procedures", "index"} <= set(parser.metrics.phases)
+    connection = sqlite3.connect(Configs.dbname)
+    rows = connection.execute(
+        "SELECT Procedure_Identifier, Leg_Number, Fix_Identifier FROM procedure_leg"
+        " WHERE Procedure_Type = 'approach'"
+    ).fetchall()
+    indexes = connection.execute(
+        "SELECT name FROM sqlite_master WHERE tbl_name = 'procedure_leg'"
+        " AND type = 'index'"
+    ).fetchall()
+    connection.close()
+    assert rows == [
+        ("I16R", "1", "DVV"),
+        ("I16R", "1", "CRUSR"),
+        ("I16R", "2", "RW16R"),
+    ]
+    assert ("procedure_leg_key",) in indexes
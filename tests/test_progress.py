@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+from pyarinc424.progress import ProgressReporter  # type: ignore
+
+
+def test_progress_disabled():
+    reporter = ProgressReporter(False)
+    with reporter.task("parsing", 10) as advance:
+        advance(5)
+    assert not reporter.enabled
+
+
+def test_progress_defaults_to_terminal(monkeypatch):
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: False)
+    assert not ProgressReporter().enabled
+
+
+def test_progress_enabled(capsys):
+    reporter = ProgressReporter(True)
+    with reporter.task("parsing", 10) as advance:
+        advance(10)
+    assert "parsing" in capsys.readouterr().out
+
+
+def test_headless_import_skips_rich():
+    code = "import sys, pyarinc424.main; print('rich' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    assert result.stdout.strip() == "False"
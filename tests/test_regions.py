@@ -0,0 +1,21 @@
+from pyarinc424.regions import RegionFilter  # type: ignore
+
+
+def test_region_filter():
+    region = RegionFilter(
+        {
+            "heliport": ["Heliport_Identifier", "ICAO_Code"],
+            "heli_msa": ["Heliport_Identifier", "MSA_Center"],
+            "localizer": ["Airport_Identifier", "Localizer_Identifier"],
+            "grid_mora": ["Starting_Latitude"],
+        }
+    )
+    assert region.keep("heliport", ["H1  ", "K2"])
+    assert region.keep("heli_msa", ["H1  ", "ABC"])
+    assert not region.keep("heli_msa", ["H2  ", "ABC"])
+    # Records with a blank parent key are kept.
+    assert region.keep("heli_msa", ["    ", "ABC"])
+    # Localizers belong to an airport, but no airport table is loaded.
+    assert region.keep("localizer", ["KDEN", "IDEN"])
+    assert region.filter("grid_mora", [["N39"], ["N40"]]) == [["N39"], ["N40"]]
+    assert region.filter("heli_msa", [["H1", "A"], ["H3", "B"]]) == [["H1", "A"]]
@@ -0,0 +1,54 @@
+import math
+import random
+
+import pytest
+
+from pyarinc424.spatial import SpatialIndex  # type: ignore
+
+
+def great_circle_nm(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * math.asin(math.sqrt(a)) * 3440.065
+
+
+@pytest.fixture
+def points():
+    rng = random.Random(424)
+    return [(rng.uniform(-90, 90), rng.uniform(-180, 180), i) for i in range(500)]
+
+
+def test_nearest_matches_full_scan(points):
+    index = SpatialIndex(points)
+    assert len(index) == 500
+
+    for latitude, longitude in [(39.86, -104.67), (-89.5, 10.0), (0.0, 179.9)]:
+        expected = sorted(
+            (great_circle_nm(latitude, longitude, lat, lon), item)
+            for lat, lon, item in points
+        )
+        result = index.nearest(latitude, longitude, count=5)
+        assert [item for _, item in result] == [item for _, item in expected[:5]]
+        assert [d for d, _ in result] == pytest.approx([d for d, _ in expected[:5]])
+
+
+def test_within_matches_full_scan(points):
+    index = SpatialIndex(points)
+
+    expected = [
+        item
+        for distance, item in sorted(
+            (great_circle_nm(10.0, -179.0, lat, lon), item) for lat, lon, item in points
+        )
+        if distance <= 900
+    ]
+    assert [item for _, item in index.within(10.0, -179.0, 900)] == expected
+
+
+def test_empty_index():
+    index = SpatialIndex([])
+    assert index.nearest(0.0, 0.0, count=3) == []
+    assert index.within(0.0, 0.0, 100) == []
@@ -0,0 +1,57 @@
+import pytest
+
+from pyarinc424 import decoders  # type: ignore
+
+np = pytest.importorskip("numpy")
+vectorized = pytest.importorskip("pyarinc424.vectorized")
+
+
+def block(values):
+    return np.array([list(v.encode("latin-1")) for v in values], dtype=np.uint8)
+
+
+def test_coordinates_match_decoders():
+    latitudes = ["N39513881", "S33563300", "         ", "N39      ", "X39513881"]
+    longitudes = ["W104402315", "E151100000", "          ", "W104 4023 ", "W10440231A"]
+
+    for values, digits, decode in [
+        (latitudes, 2, decoders.decode_latitude),
+        (longitudes, 3, decoders.decode_longitude),
+    ]:
+        result = vectorized.coordinates(block(values), digits).tolist()
+        expected = [decode(v) for v in values]
+        assert [None if r != r else r for r in result] == expected
+
+
+def test_extract_columns_typed():
+    lines = block(["N39513881 05000", "S33563300 FL180"])
+    columns = vectorized.extract_columns(
+        lines, [slice(0, 9), slice(10, 15)], ["latitude", "altitude"]
+    )
+    assert columns == [
+        [decoders.decode_latitude("N39513881"), decoders.decode_latitude("S33563300")],
+        [5000, 18000],
+    ]
+
+
+def test_decode_lines_and_columns():
+    lines = block(["KDEN K2", "KBD\xe9 K2"])
+    assert vectorized.decode_lines(lines) == ["KDEN K2", "KBD\xe9 K2"]
+    assert vectorized.extract_columns(lines, [slice(0, 4), slice(5, 7)]) == [
+        ["KDEN", "KBD\xe9"],
+        ["K2", "K2"],
+    ]
+
+
+def test_bbox_mask():
+    latitudes = np.array([39.86, 33.94, np.nan])
+    longitudes = np.array([-104.67, -118.41, np.nan])
+    mask = vectorized.bbox_mask(latitudes, longitudes, (-109.0, 37.0, -102.0, 41.0))
+    assert mask.tolist() == [True, False, True]
+
+
+def test_read_array_unequal_lines(tmp_path):
+    path = tmp_path / "ragged.dat"
+    path.write_bytes(b"ABC\nABCD\n")
+    with pytest.raises(ValueError, match="equal length"):
+        vectorized.read_array(str(path))